@@ -0,0 +1,170 @@
+"""
+Deterministic synthetic data shared by the Mongo stand-in and the HTTP fakes.
+
+Full scale is 1k accounts, 100k chats and long message arrays. Fan IDs (and so
+chat IDs) repeat across accounts, as the same fan can chat with several creators,
+and each fan's conversation is generated once and shared by every account's chat
+document so that 100k documents fit in memory. The stand-ins copy on read and on
+write, so the sharing is invisible to callers.
+"""
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+WORDS = ("hey babe love that pic when are you online next can i get a custom video "
+         "tip sent for you tonight weekend miss you so much what are you wearing "
+         "thank you so sweet good morning birthday coming up any discount on the bundle").split()
+
+@dataclass
+class DatasetConfig:
+    """Volumes for the synthetic dataset."""
+    accounts: int = 1000
+    chats_per_account: int = 100
+    users: int = 50
+    accounts_per_user: int = 20
+    min_messages: int = 50
+    max_messages: int = 3000
+    seed: int = 1234
+
+SCALES = {
+    'small': DatasetConfig(accounts=50, chats_per_account=40, users=10, accounts_per_user=5, max_messages=500),
+    'full': DatasetConfig(),
+}
+
+class Dataset:
+    """Generates users, accounts, chats and conversations on demand."""
+
+    CREATOR_ID = '1000'
+
+    def __init__(self, config: DatasetConfig):
+        self.config = config
+        self._random = random.Random(config.seed)
+        self._start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self._conversations = [self._make_conversation(index) for index in range(config.chats_per_account)]
+        self._api_chats: Dict[str, List[Dict[str, Any]]] = {}
+        self._api_messages: Dict[str, List[Dict[str, Any]]] = {}
+
+    # Identifiers ----------------------------------------------------------------
+
+    def account_id(self, index: int) -> str:
+        return f"acct_{index:05d}"
+
+    def chat_id(self, chat_index: int) -> str:
+        return str(100000 + chat_index)
+
+    def user_email(self, index: int) -> str:
+        return f"operator{index}@example.com"
+
+    def account_index(self, account_id: str) -> int:
+        return int(account_id.split('_')[1])
+
+    # Conversations --------------------------------------------------------------
+
+    def _make_conversation(self, index: int) -> List[Dict[str, Any]]:
+        """Build the conversation of the index-th fan in stored (content/timestamp/sender) shape, oldest first."""
+        fan_id = self.chat_id(index)
+        length = int(self._random.uniform(self.config.min_messages, self.config.max_messages))
+        messages = []
+        timestamp = self._start
+        for position in range(length):
+            timestamp += timedelta(minutes=self._random.randint(1, 600))
+            from_fan = self._random.random() < 0.55
+            text = ' '.join(self._random.choices(WORDS, k=self._random.randint(3, 25)))
+            messages.append({
+                'id': index * 100000 + position + 1,
+                'content': f"<p>{text}</p>",
+                'timestamp': timestamp.isoformat().replace('+00:00', 'Z'),
+                'sender': fan_id if from_fan else self.CREATOR_ID
+            })
+        return messages
+
+    def conversation_for(self, chat_id: str) -> List[Dict[str, Any]]:
+        """Get the shared stored-shape conversation of a fan."""
+        return self._conversations[int(chat_id) - 100000]
+
+    def api_messages(self, chat_id: str) -> List[Dict[str, Any]]:
+        """Conversation in OnlyFans API shape, newest first."""
+        if chat_id in self._api_messages:
+            return self._api_messages[chat_id]
+        self._api_messages[chat_id] = [{
+            'id': message['id'],
+            'text': message['content'],
+            'createdAt': message['timestamp'],
+            'fromUser': {'id': int(message['sender'])},
+            'mediaCount': 0,
+            'media': [],
+            'previews': [],
+            'isTip': False,
+        } for message in reversed(self.conversation_for(chat_id))]
+        return self._api_messages[chat_id]
+
+    # API chat lists ---------------------------------------------------------------
+
+    def api_chats(self, account_id: str) -> List[Dict[str, Any]]:
+        """Chat list for an account in OnlyFans API shape."""
+        if account_id not in self._api_chats:
+            account_index = self.account_index(account_id)
+            rng = random.Random(self.config.seed + account_index)
+            chats = []
+            for chat_index in range(self.config.chats_per_account):
+                chat_id = self.chat_id(chat_index)
+                last = self.conversation_for(chat_id)[-1]
+                chats.append({
+                    'fan': {
+                        'id': int(chat_id),
+                        'name': f"Fan {chat_id}",
+                        'username': f"u{chat_id}",
+                        'displayName': f"Fan {chat_id}" if rng.random() < 0.8 else '',
+                        'avatar': f"https://cdn.example.com/avatars/{chat_id}.jpg",
+                        'canChat': True,
+                    },
+                    'canSendMessage': True,
+                    'unreadMessagesCount': rng.choice([0, 0, 0, 1, 2, 5]),
+                    'hasUnreadTips': rng.random() < 0.05,
+                    'lastMessage': {
+                        'id': last['id'],
+                        'text': last['content'],
+                        'createdAt': last['timestamp'],
+                        'fromUser': {'id': int(chat_id)},
+                        'media': [],
+                        'previews': [],
+                    },
+                    'lastReadMessageId': last['id'] - 1,
+                })
+            self._api_chats[account_id] = chats
+        return self._api_chats[account_id]
+
+    # Mongo seeding ----------------------------------------------------------------
+
+    def seed_mongo(self, client) -> None:
+        """Populate a FakeMongoClient with users, accounts and chat documents."""
+        users = client['aurachat']['users']
+        accounts = client['onlyfans']['accounts']
+        chats = client['onlyfans']['chats']
+
+        for user_index in range(self.config.users):
+            first = (user_index * self.config.accounts_per_user) % self.config.accounts
+            users.insert_one({
+                'email': self.user_email(user_index),
+                'onlyfans_account_ids': [self.account_id((first + offset) % self.config.accounts)
+                                         for offset in range(self.config.accounts_per_user)]
+            })
+
+        for account_index in range(self.config.accounts):
+            account_id = self.account_id(account_index)
+            accounts.insert_one({'account': account_id, 'name': f"Creator {account_index}"})
+
+        for account_index in range(self.config.accounts):
+            account_id = self.account_id(account_index)
+            documents = []
+            for chat_index in range(self.config.chats_per_account):
+                chat_id = self.chat_id(chat_index)
+                conversation = self.conversation_for(chat_id)
+                documents.append({
+                    'account': account_id,
+                    'chat_id': chat_id,
+                    'messages': conversation,
+                    'last_message_id': conversation[-1]['id']
+                })
+            chats.insert_many(documents)
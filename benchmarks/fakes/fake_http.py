@@ -0,0 +1,150 @@
+"""
+Local HTTP stand-ins for the OnlyFans API and the AuraChat web portal.
+
+Each fake runs a threaded stdlib HTTP server on an ephemeral localhost port and
+answers the routes the app's clients call with data from a Dataset. Latency and
+error rates are configurable so the same fakes serve benchmarks and load tests.
+"""
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+from .dataset import Dataset
+
+Route = Tuple[str, 're.Pattern', Callable[..., Tuple[int, Any]]]
+
+class FakeServer:
+    """Threaded HTTP server dispatching to regex routes."""
+
+    def __init__(self, latency_ms: float = 0.0, error_rate: float = 0.0, max_concurrency: int = 0):
+        """
+        Args:
+            latency_ms: Time each request spends "on the server" before responding
+            error_rate: Fraction of requests answered with HTTP 503
+            max_concurrency: Requests processed at once (0 for unlimited); the rest queue
+        """
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self._capacity = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self.hits: Counter = Counter()
+        self._routes: List[Route] = []
+        self._random = random.Random(7)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def route(self, method: str, pattern: str, handler: Callable[..., Tuple[int, Any]]) -> None:
+        self._routes.append((method, re.compile(pattern + r'/?$'), handler))
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeServer':
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Like production servers (tcp_nodelay); otherwise keep-alive responses
+            # written in two sends stall on delayed ACKs
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                fake._dispatch(self, 'GET')
+
+            def do_POST(self):
+                fake._dispatch(self, 'POST')
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def _dispatch(self, request: BaseHTTPRequestHandler, method: str) -> None:
+        length = int(request.headers.get('Content-Length') or 0)
+        if length:
+            request.rfile.read(length)
+        parsed = urlparse(request.path)
+        params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+
+        status, body = 404, {'error': 'not found'}
+        for route_method, pattern, handler in self._routes:
+            match = pattern.match(parsed.path)
+            if route_method == method and match:
+                with self._lock:
+                    self.hits[handler.__name__] += 1
+                    failed = self.error_rate and self._random.random() < self.error_rate
+                if self._capacity:
+                    self._capacity.acquire()
+                try:
+                    if self.latency_ms:
+                        time.sleep(self.latency_ms / 1000.0)
+                    status, body = (503, {'error': 'unavailable'}) if failed else handler(params, *match.groups())
+                finally:
+                    if self._capacity:
+                        self._capacity.release()
+                break
+
+        payload = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+        request.send_response(status)
+        request.send_header('Content-Type', 'application/octet-stream' if isinstance(body, bytes) else 'application/json')
+        request.send_header('Content-Length', str(len(payload)))
+        request.end_headers()
+        request.wfile.write(payload)
+
+class FakeOnlyFansAPI(FakeServer):
+    """Serves /api/{account}/chats and /api/{account}/chats/{chat}/messages."""
+
+    def __init__(self, dataset: Dataset, **kwargs):
+        super().__init__(**kwargs)
+        self.dataset = dataset
+        self.route('GET', r'/api/([^/]+)/chats', self.get_chats)
+        self.route('GET', r'/api/([^/]+)/chats/([^/]+)/messages', self.get_chat_messages)
+
+    @property
+    def base_url(self) -> str:
+        return super().base_url + '/api'
+
+    def get_chats(self, params: Dict[str, str], account_id: str):
+        return 200, {'data': self.dataset.api_chats(account_id)}
+
+    def get_chat_messages(self, params: Dict[str, str], account_id: str, chat_id: str):
+        messages = self.dataset.api_messages(chat_id)
+        limit = int(params.get('limit', 10))
+        start = 0
+        if 'id' in params:
+            before_id = int(params['id'])
+            start = next((index for index, message in enumerate(messages) if message['id'] < before_id), len(messages))
+        page = messages[start:start + limit]
+        return 200, {'data': {'list': page, 'hasMore': start + limit < len(messages)}}
+
+class FakeWebPortal(FakeServer):
+    """Serves the portal's sync-messages and generate-response endpoints."""
+
+    def __init__(self, dataset: Dataset, **kwargs):
+        super().__init__(**kwargs)
+        self.dataset = dataset
+        self.route('POST', r'/api/sync-messages/([^/]+)/([^/]+)', self.sync_messages)
+        self.route('POST', r'/api/generate-response/([^/]+)/([^/]+)', self.generate_response)
+
+    def sync_messages(self, params: Dict[str, str], account_id: str, chat_id: str):
+        return 200, {'success': True, 'messages': len(self.dataset.conversation_for(chat_id))}
+
+    def generate_response(self, params: Dict[str, str], account_id: str, chat_id: str):
+        last = self.dataset.conversation_for(chat_id)[-1]['content']
+        return 200, {'text': f"<p>Thanks babe, replying to: {last[3:40]}</p>"}
@@ -0,0 +1,335 @@
+"""
+In-process stand-in for the subset of pymongo the app uses.
+
+Documents are kept in memory with hash indexes on equality lookups, results are
+copied on the way out (roughly what BSON decoding costs the real driver) and an
+optional per-operation latency emulates the network round trip to the cluster.
+"""
+import itertools
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+_ids = itertools.count(1)
+
+def _copy_value(value: Any) -> Any:
+    """Copy a stored value one level deep so callers cannot mutate the store."""
+    if isinstance(value, list):
+        return [dict(item) if isinstance(item, dict) else item for item in value]
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+def _lookup(document: Dict[str, Any], key: str) -> List[Any]:
+    """Values at a dotted path; a path through an array of documents yields each element's value."""
+    values = [document]
+    for part in key.split('.'):
+        found = []
+        for value in values:
+            if isinstance(value, dict):
+                if part in value:
+                    found.append(value[part])
+            elif isinstance(value, list):
+                found.extend(item[part] for item in value if isinstance(item, dict) and part in item)
+        values = found
+    return values
+
+def _matches(document: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    """Evaluate a simple Mongo filter (equality, comparison, $or, $not and $elemMatch)."""
+    for key, condition in query.items():
+        if key == '$or':
+            if not any(_matches(document, clause) for clause in condition):
+                return False
+        elif not _field_matches(_lookup(document, key), condition):
+            return False
+    return True
+
+def _field_matches(values: List[Any], condition: Any) -> bool:
+    """Evaluate one field's condition against its values (none when the field is missing)."""
+    if not (isinstance(condition, dict) and condition and all(op.startswith('$') for op in condition)):
+        # Equality to None also matches a missing field
+        return any(value == condition for value in values) or (condition is None and not values)
+    candidates = values or [None]
+    for op, operand in condition.items():
+        if op == '$lt' and not any(value is not None and value < operand for value in candidates):
+            return False
+        if op == '$lte' and not any(value is not None and value <= operand for value in candidates):
+            return False
+        if op == '$gt' and not any(value is not None and value > operand for value in candidates):
+            return False
+        if op == '$gte' and not any(value is not None and value >= operand for value in candidates):
+            return False
+        if op == '$ne' and any(value == operand for value in values):
+            return False
+        if op == '$in' and not any(value in operand for value in candidates):
+            return False
+        if op == '$exists' and bool(values) != bool(operand):
+            return False
+        if op == '$not' and _field_matches(values, operand):
+            return False
+        if op == '$elemMatch' and not any(isinstance(item, dict) and _matches(item, operand)
+                                          for value in values if isinstance(value, list) for item in value):
+            return False
+    return True
+
+def _project(document: Dict[str, Any], projection: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply an inclusion projection and $slice operators, copying the result."""
+    if not projection:
+        return {key: _copy_value(value) for key, value in document.items()}
+
+    included = [key for key, spec in projection.items() if spec is True or spec == 1]
+    slices = {key: spec['$slice'] for key, spec in projection.items() if isinstance(spec, dict) and '$slice' in spec}
+    keys = (['_id'] + included + list(slices)) if included else list(document)
+
+    result = {}
+    for key in keys:
+        if key not in document or projection.get(key) in (0, False):
+            continue
+        value = document[key]
+        if key in slices and isinstance(value, list):
+            count = slices[key]
+            value = value[count:] if count < 0 else value[:count]
+        result[key] = _copy_value(value)
+    return result
+
+class FakeCursor:
+    """Cursor supporting sort, limit and iteration."""
+
+    def __init__(self, collection: 'FakeCollection', documents: List[Dict[str, Any]], projection):
+        self._collection = collection
+        self._documents = documents
+        self._projection = projection
+        self._sort: Optional[Tuple[str, int]] = None
+        self._limit = 0
+
+    def sort(self, key: str, direction: int = 1) -> 'FakeCursor':
+        self._sort = (key, direction)
+        return self
+
+    def limit(self, count: int) -> 'FakeCursor':
+        self._limit = count
+        return self
+
+    def __iter__(self):
+        documents = self._documents
+        if self._sort:
+            key, direction = self._sort
+            documents = sorted(documents, key=lambda doc: doc.get(key), reverse=direction < 0)
+        if self._limit:
+            documents = documents[:self._limit]
+        self._collection._client._simulate_latency()
+        for document in documents:
+            yield _project(document, self._projection)
+
+    def close(self) -> None:
+        pass
+
+class FakeCollection:
+    """A collection with lazily built hash indexes for equality filters."""
+
+    def __init__(self, client: 'FakeMongoClient', name: str):
+        self._client = client
+        self.name = name
+        self._documents: List[Dict[str, Any]] = []
+        self._indexes: Dict[Tuple[str, ...], Dict[Tuple[Any, ...], List[Dict[str, Any]]]] = {}
+        self._lock = threading.RLock()
+
+    # Indexing -----------------------------------------------------------------
+
+    def _index_for(self, keys: Tuple[str, ...]) -> Dict[Tuple[Any, ...], List[Dict[str, Any]]]:
+        index = self._indexes.get(keys)
+        if index is None:
+            index = {}
+            for document in self._documents:
+                index.setdefault(tuple(document.get(key) for key in keys), []).append(document)
+            self._indexes[keys] = index
+        return index
+
+    def _add_to_indexes(self, document: Dict[str, Any]) -> None:
+        for keys, index in self._indexes.items():
+            index.setdefault(tuple(document.get(key) for key in keys), []).append(document)
+
+    def _candidates(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        equality = tuple(sorted(key for key, value in query.items()
+                                if not isinstance(value, dict) and not key.startswith('$') and '.' not in key))
+        if not equality:
+            return self._documents
+        index = self._index_for(equality)
+        return index.get(tuple(query[key] for key in equality), [])
+
+    def _find(self, query: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        query = query or {}
+        return [document for document in self._candidates(query) if _matches(document, query)]
+
+    # Reads --------------------------------------------------------------------
+
+    def find_one(self, query: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, Any]] = None):
+        self._client._simulate_latency()
+        with self._lock:
+            documents = self._find(query)
+            return _project(documents[0], projection) if documents else None
+
+    def find(self, query: Optional[Dict[str, Any]] = None, projection: Optional[Dict[str, Any]] = None, **kwargs):
+        with self._lock:
+            return FakeCursor(self, self._find(query), projection)
+
+    def count_documents(self, query: Optional[Dict[str, Any]] = None) -> int:
+        with self._lock:
+            return len(self._find(query))
+
+    # Writes -------------------------------------------------------------------
+
+    def insert_one(self, document: Dict[str, Any]):
+        self._client._simulate_latency()
+        with self._lock:
+            self._insert(document)
+
+    def insert_many(self, documents: List[Dict[str, Any]], ordered: bool = True):
+        self._client._simulate_latency()
+        with self._lock:
+            for document in documents:
+                self._insert(document)
+
+    def _insert(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        document = dict(document)
+        document.setdefault('_id', next(_ids))
+        self._documents.append(document)
+        self._add_to_indexes(document)
+        return document
+
+    def update_one(self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool = False):
+        self._client._simulate_latency()
+        with self._lock:
+            documents = self._find(query)
+            if documents:
+                self._apply_update(documents[0], update)
+            elif upsert:
+                seed = {key: value for key, value in query.items() if not isinstance(value, dict)}
+                seed.update(update.get('$setOnInsert', {}))
+                document = self._insert(seed)
+                self._apply_update(document, update)
+
+    def replace_one(self, query: Dict[str, Any], replacement: Dict[str, Any], upsert: bool = False):
+        self._client._simulate_latency()
+        with self._lock:
+            self._replace(query, replacement, upsert)
+
+    def _replace(self, query, replacement, upsert):
+        documents = self._find(query)
+        if documents:
+            target = documents[0]
+            document_id = target['_id']
+            target.clear()
+            target.update(replacement)
+            target['_id'] = document_id
+            self._indexes.clear()
+        elif upsert:
+            self._insert(replacement)
+
+    def _apply_update(self, document: Dict[str, Any], update: Dict[str, Any]) -> None:
+        for key, value in update.get('$set', {}).items():
+            document[key] = value
+        for key, value in update.get('$inc', {}).items():
+            document[key] = document.get(key, 0) + value
+        for key, value in update.get('$max', {}).items():
+            if document.get(key) is None or value > document[key]:
+                document[key] = value
+        for key, value in update.get('$push', {}).items():
+            items = value['$each'] if isinstance(value, dict) and '$each' in value else [value]
+            # Copy on write: seeded documents may share message arrays
+            document[key] = list(document.get(key) or []) + list(items)
+        if set(update.get('$set', {})) & {key for keys in self._indexes for key in keys}:
+            self._indexes.clear()
+
+    def delete_many(self, query: Dict[str, Any]):
+        with self._lock:
+            remaining = [document for document in self._documents if not _matches(document, query)]
+            self._documents = remaining
+            self._indexes.clear()
+
+    def bulk_write(self, requests: List[Any], ordered: bool = True):
+        """Apply pymongo ReplaceOne / UpdateOne / InsertOne request objects."""
+        self._client._simulate_latency()
+        modified = 0
+        with self._lock:
+            for request in requests:
+                kind = type(request).__name__
+                if kind == 'ReplaceOne':
+                    self._replace(request._filter, request._doc, request._upsert)
+                elif kind == 'UpdateOne':
+                    documents = self._find(request._filter)
+                    if documents:
+                        self._apply_update(documents[0], request._doc)
+                        modified += 1
+                elif kind == 'InsertOne':
+                    self._insert(request._doc)
+        return SimpleNamespace(modified_count=modified)
+
+    def create_index(self, keys, unique: bool = False, **kwargs) -> str:
+        names = tuple(sorted(key for key, _ in keys)) if isinstance(keys, list) else (keys,)
+        with self._lock:
+            self._index_for(names)
+        return '_'.join(names)
+
+class FakeDatabase:
+    """A database handing out collections by name."""
+
+    def __init__(self, client: 'FakeMongoClient', name: str):
+        self._client = client
+        self.name = name
+        self._collections: Dict[str, FakeCollection] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, name: str) -> FakeCollection:
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = FakeCollection(self._client, name)
+            return self._collections[name]
+
+    def get_collection(self, name: str, **kwargs) -> FakeCollection:
+        return self[name]
+
+    def command(self, name: str, *args, **kwargs) -> Dict[str, Any]:
+        self._client._simulate_latency()
+        return {'ok': 1.0}
+
+class FakeMongoClient:
+    """Drop-in replacement for pymongo.MongoClient backed by memory."""
+
+    def __init__(self, latency_ms: float = 0.0, max_concurrency: int = 0):
+        """
+        Args:
+            latency_ms: Simulated round-trip time added to every operation
+            max_concurrency: Operations the "server" works on at once (0 for unlimited);
+                further operations queue, which is how saturation shows up under load
+        """
+        self.latency_ms = latency_ms
+        self.max_concurrency = max_concurrency
+        self._capacity = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self.operations = 0
+        self._databases: Dict[str, FakeDatabase] = {}
+        self._lock = threading.Lock()
+        self.admin = self['admin']
+
+    def __getitem__(self, name: str) -> FakeDatabase:
+        with self._lock:
+            if name not in self._databases:
+                self._databases[name] = FakeDatabase(self, name)
+            return self._databases[name]
+
+    def get_database(self, name: str, **kwargs) -> FakeDatabase:
+        return self[name]
+
+    def _simulate_latency(self) -> None:
+        self.operations += 1
+        if not self.latency_ms:
+            return
+        if self._capacity:
+            with self._capacity:
+                time.sleep(self.latency_ms / 1000.0)
+        else:
+            time.sleep(self.latency_ms / 1000.0)
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,83 @@
+"""
+Wires the app to local stand-ins: a seeded in-memory Mongo and fake HTTP backends.
+
+Environment variables are set before any aurachat_helper_app module is imported,
+because db/db_client.py connects at import time; the app configuration is then
+reloaded so clients built afterwards pick up the stand-ins' base URLs. HOME points
+at a temporary directory, so drafts, queues and caches never touch the real ones.
+"""
+import contextlib
+import os
+import sys
+import tempfile
+import time
+from typing import Iterator, Optional
+from .fakes.dataset import Dataset, DatasetConfig
+from .fakes.fake_http import FakeOnlyFansAPI, FakeWebPortal
+from .fakes.fake_mongo import FakeMongoClient
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, 'src')
+if SRC not in sys.path:
+    sys.path.insert(0, SRC)
+
+@contextlib.contextmanager
+def quiet_app_output() -> Iterator[None]:
+    """Discard the app's prints (it prints on most calls) without buffering them in memory."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+class BenchmarkEnvironment:
+    """Starts the stand-ins and points the app at them for the lifetime of a `with` block."""
+
+    def __init__(self, config: DatasetConfig, mongo_latency_ms: float = 0.0, api_latency_ms: float = 0.0,
+                 portal_latency_ms: float = 0.0, error_rate: float = 0.0, backend_concurrency: int = 0):
+        self.config = config
+        self.backend_concurrency = backend_concurrency
+        self.mongo_latency_ms = mongo_latency_ms
+        self.api_latency_ms = api_latency_ms
+        self.portal_latency_ms = portal_latency_ms
+        self.error_rate = error_rate
+        self.dataset: Optional[Dataset] = None
+        self.mongo: Optional[FakeMongoClient] = None
+        self.api: Optional[FakeOnlyFansAPI] = None
+        self.portal: Optional[FakeWebPortal] = None
+
+    def __enter__(self) -> 'BenchmarkEnvironment':
+        started = time.perf_counter()
+        self.dataset = Dataset(self.config)
+        self.mongo = FakeMongoClient(max_concurrency=self.backend_concurrency)
+        self.dataset.seed_mongo(self.mongo)
+        self.mongo.latency_ms = self.mongo_latency_ms
+
+        self.api = FakeOnlyFansAPI(self.dataset, latency_ms=self.api_latency_ms, error_rate=self.error_rate,
+                                   max_concurrency=self.backend_concurrency).start()
+        self.portal = FakeWebPortal(self.dataset, latency_ms=self.portal_latency_ms, error_rate=self.error_rate,
+                                    max_concurrency=self.backend_concurrency).start()
+
+        os.environ['HOME'] = tempfile.mkdtemp(prefix='aurachat-benchmark-')
+        os.environ['MONGODB_URI'] = 'mongodb://127.0.0.1:1/?connect=false'
+        os.environ['ONLYFANSAPI_KEY'] = 'benchmark-key'
+        os.environ['ONLYFANSAPI_BASE_URL'] = self.api.base_url
+        os.environ['AURACHAT_PORTAL_URL'] = self.portal.base_url
+
+        from aurachat_helper_app.app_config import reload_config
+        reload_config()
+        from aurachat_helper_app.db.db_client import db_client
+        self._real_mongo = db_client.client
+        db_client.client = self.mongo
+        print(f"Stand-ins ready in {time.perf_counter() - started:.1f}s: "
+              f"{self.config.accounts} accounts, {self.config.accounts * self.config.chats_per_account} chats, "
+              f"API {self.api.base_url}, portal {self.portal.base_url}")
+        return self
+
+    def __exit__(self, *exc) -> None:
+        from aurachat_helper_app.db.db_client import db_client
+        db_client.client = self._real_mongo
+        self.api.stop()
+        self.portal.stop()
+
+    def account_ids(self, user_index: int):
+        """Account IDs assigned to a seeded user."""
+        user = self.mongo['aurachat']['users'].find_one({'email': self.dataset.user_email(user_index)})
+        return user['onlyfans_account_ids']
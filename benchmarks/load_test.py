@@ -0,0 +1,300 @@
+"""
+Multi-operator load test against local stand-ins.
+
+Simulates N concurrent headless operators, each following the controller flow
+(sign in, load accounts, open an account, click or triage through chats, sync,
+generate) through the app's own services, scheduler and outbound queue, with
+randomised think times. Operator counts are stepped up and, for every step, each
+backend call reports throughput, latency percentiles and error rate, which shows
+where adding operators starts to saturate Mongo, the OnlyFans API or the portal.
+
+Usage (from the repository root, with requirements installed):
+    python -m benchmarks.load_test --operators 1,5,10,25,50 --step-seconds 20
+    python -m benchmarks.load_test --operators 10,50,100 --think-ms 500 \\
+        --mongo-latency-ms 2 --api-latency-ms 80 --portal-latency-ms 400 --backend-concurrency 32
+"""
+import argparse
+import functools
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+from .fakes.dataset import SCALES
+from .harness import BenchmarkEnvironment, quiet_app_output
+from .stats import Measurement, percentile
+
+# Backend calls instrumented at class level: (module, class, method, backend label)
+INSTRUMENTED = [
+    ('aurachat_helper_app.db.db_client', 'MongoDBClient', 'get_user_by_email', 'mongo'),
+    ('aurachat_helper_app.db.db_client', 'MongoDBClient', 'get_account_by_id', 'mongo'),
+    ('aurachat_helper_app.db.db_client', 'MongoDBClient', 'get_chat_messages', 'mongo'),
+    ('aurachat_helper_app.db.db_client', 'MongoDBClient', 'get_recent_chat_messages', 'mongo'),
+    ('aurachat_helper_app.db.db_client', 'MongoDBClient', 'get_last_fan_message', 'mongo'),
+    ('aurachat_helper_app.db.db_client', 'MongoDBClient', 'get_chat_sync_state', 'mongo'),
+    ('aurachat_helper_app.db.db_client', 'MongoDBClient', 'append_chat_messages', 'mongo'),
+    ('aurachat_helper_app.api.onlyfansapi_client', 'OnlyFansAPIClient', 'get_chats', 'onlyfans'),
+    ('aurachat_helper_app.api.onlyfansapi_client', 'OnlyFansAPIClient', 'get_chat_messages', 'onlyfans'),
+    ('aurachat_helper_app.api.aurachat_webportal_client', 'AuraChatWebPortalClient', 'sync_messages', 'portal'),
+    ('aurachat_helper_app.api.aurachat_webportal_client', 'AuraChatWebPortalClient', 'generate_response', 'portal'),
+]
+
+class CallRecorder:
+    """Thread-safe per-call latency and error collection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: Dict[str, Measurement] = defaultdict(lambda: Measurement(''))
+
+    def record(self, name: str, elapsed_ms: float, failed: bool) -> None:
+        with self._lock:
+            measurement = self.calls[name]
+            measurement.name = name
+            measurement.latencies_ms.append(elapsed_ms)
+            if failed:
+                measurement.errors += 1
+
+    def reset(self) -> Dict[str, Measurement]:
+        with self._lock:
+            calls, self.calls = self.calls, defaultdict(lambda: Measurement(''))
+            return dict(calls)
+
+def instrument(recorder: CallRecorder) -> Callable[[], None]:
+    """Wrap backend client methods so every call is timed; returns an undo function."""
+    import importlib
+    originals = []
+    for module_name, class_name, method_name, backend in INSTRUMENTED:
+        cls = getattr(importlib.import_module(module_name), class_name)
+        original = getattr(cls, method_name)
+        label = f"{backend}.{method_name}"
+
+        def wrapper(*args, __original=original, __label=label, **kwargs):
+            started = time.perf_counter()
+            failed = False
+            try:
+                result = __original(*args, **kwargs)
+                # The HTTP clients swallow request errors and return None
+                failed = result is None and not __label.startswith('mongo.')
+                return result
+            except Exception:
+                failed = True
+                raise
+            finally:
+                recorder.record(__label, (time.perf_counter() - started) * 1000.0, failed)
+
+        setattr(cls, method_name, functools.wraps(original)(wrapper))
+        originals.append((cls, method_name, original))
+
+    def undo():
+        for cls, method_name, original in originals:
+            setattr(cls, method_name, original)
+    return undo
+
+class Operator(threading.Thread):
+    """One headless operator repeating the UI flow until told to stop."""
+
+    def __init__(self, index: int, env: BenchmarkEnvironment, stop: threading.Event, think_ms: float,
+                 chats_per_account: int, errors: List[str]):
+        super().__init__(daemon=True, name=f"operator-{index}")
+        self.index = index
+        self.env = env
+        self.stop_event = stop
+        self.think_ms = think_ms
+        self.chats_per_account = chats_per_account
+        self.errors = errors
+        self.rng = random.Random(index)
+
+    def think(self) -> bool:
+        """Pause like an operator reading the screen; returns False once stopping."""
+        if self.think_ms:
+            self.stop_event.wait(self.rng.expovariate(1.0 / self.think_ms) / 1000.0)
+        return not self.stop_event.is_set()
+
+    def run(self) -> None:
+        from aurachat_helper_app.managers.user_manager import UserManager
+        from aurachat_helper_app.managers.onlyfans_account_manager import OnlyFansAccountManager
+        from aurachat_helper_app.managers.triage_queue import TriageQueue
+        from aurachat_helper_app.services.chat_prefetcher import ChatPrefetcher
+        from aurachat_helper_app.services.outbound_queue import OP_GENERATE, OP_SYNC, OutboundQueue
+        from aurachat_helper_app.services.service_container import ServiceContainer
+        from aurachat_helper_app.utils.work_scheduler import WORK_INTERACTIVE
+
+        dataset = self.env.dataset
+        data_dir = tempfile.mkdtemp(prefix=f"{self.name}-")
+        while not self.stop_event.is_set():
+            # One container per signed-in session, as RootController builds it; the queue
+            # file is per operator so concurrent operators do not share it
+            services = ServiceContainer()
+            scheduler = services.work_scheduler
+            queue = OutboundQueue(services.webportal_client, services.generate_message_service,
+                                  path=os.path.join(data_dir, 'outbound_queue.json'), scheduler=scheduler)
+            prefetcher = ChatPrefetcher(services.db_client, services.message_sync_service, services.message_service,
+                                        services.search_service, services.generate_message_service, queue, scheduler)
+            finished = OutboundWaiter(queue)
+            queue.start()
+            try:
+                # SignInController.handle_signin
+                user_manager = UserManager()
+                user_manager.sign_in(dataset.user_email(self.rng.randrange(dataset.config.users)))
+                user = user_manager.get_current_user()
+                if not self.think():
+                    return
+
+                # OnlyFansAccountsController.__init__
+                account_manager = OnlyFansAccountManager()
+                account_manager.load_accounts_from_ids(user.onlyfans_account_ids)
+                accounts = account_manager.get_accounts()
+                if not accounts or not self.think():
+                    continue
+
+                # handle_account_click -> ChatsController.pack -> fetch_and_display_chats
+                account_id = self.rng.choice(accounts).account_id
+                chats = scheduler.submit(WORK_INTERACTIVE, services.chat_service.get_chats_for_account,
+                                         account_id, account_id=account_id, group='chats').result()
+                if not chats:
+                    continue
+
+                # Half the visits walk the triage queue, prefetching ahead; the rest click around
+                triage = None
+                if self.rng.random() < 0.5:
+                    triage = TriageQueue()
+                    triage.load(chats)
+                    visits = triage.upcoming(self.chats_per_account)
+                else:
+                    visits = self.rng.sample(chats, min(len(chats), self.chats_per_account))
+
+                for chat in visits:
+                    if not self.think():
+                        return
+                    chat_id = str(chat.fan.id)
+                    # handle_chat_click -> _fetch_messages (or the prefetched chat)
+                    if triage:
+                        triage.next()
+                        prefetcher.prefetch(account_id, triage.upcoming(3))
+                    loaded = prefetcher.take(account_id, chat) or scheduler.submit(
+                        WORK_INTERACTIVE, prefetcher.load, account_id, chat, account_id=account_id,
+                        group='chats').result()
+                    fan_message = loaded.last_fan_message
+                    fan_message_id = fan_message.id if fan_message else None
+
+                    # handle_sync, then the refresh once it has gone through
+                    if self.rng.random() < 0.3:
+                        queue.enqueue(OP_SYNC, account_id, chat_id)
+                        if finished.wait(OP_SYNC, account_id, chat_id):
+                            scheduler.submit(WORK_INTERACTIVE, prefetcher.load, account_id, chat,
+                                             account_id=account_id, group='chats').result()
+                            scheduler.submit(WORK_INTERACTIVE, services.chat_service.get_chats_for_account,
+                                             account_id, account_id=account_id, group='chats').result()
+
+                    # handle_generate: the cached draft, or a queued generate request
+                    if self.think() and not (fan_message_id is not None and
+                                             services.generate_message_service.draft_history(
+                                                 account_id, chat_id, fan_message_id)):
+                        queue.enqueue(OP_GENERATE, account_id, chat_id, fan_message_id)
+                        finished.wait(OP_GENERATE, account_id, chat_id)
+            except Exception as e:
+                self.errors.append(f"{self.name}: {e!r}")
+            finally:
+                # Signing out drops whatever is still queued
+                queue.clear()
+                queue.shutdown()
+                services.shutdown()
+
+class OutboundWaiter:
+    """Lets an operator wait, like the UI does, for its queued requests to finish."""
+
+    def __init__(self, queue):
+        from aurachat_helper_app.services.outbound_queue import STATUS_DONE, STATUS_FAILED
+        self._finished_statuses = (STATUS_DONE, STATUS_FAILED)
+        self._done = STATUS_DONE
+        self._results: Dict[tuple, str] = {}
+        self._condition = threading.Condition()
+        queue.add_listener(self._on_update)
+
+    def _on_update(self, request, result) -> None:
+        if request.status in self._finished_statuses:
+            with self._condition:
+                self._results[request.key] = request.status
+                self._condition.notify_all()
+
+    def wait(self, kind: str, account_id: str, chat_id: str, timeout: float = 60.0) -> bool:
+        """Wait for a request to finish; True if it succeeded."""
+        key = (kind, account_id, chat_id)
+        with self._condition:
+            self._condition.wait_for(lambda: key in self._results, timeout)
+            return self._results.pop(key, None) == self._done
+
+def run_step(env: BenchmarkEnvironment, recorder: CallRecorder, operators: int, seconds: float,
+             think_ms: float, chats_per_account: int, errors: List[str]) -> Dict[str, Dict[str, float]]:
+    """Run one load level and summarise every backend call; flow exceptions are appended to errors."""
+    stop = threading.Event()
+    recorder.reset()
+    threads = [Operator(index, env, stop, think_ms, chats_per_account, errors) for index in range(operators)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    stop.wait(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=30)
+    elapsed = time.perf_counter() - started
+
+    summary = {}
+    for name, measurement in sorted(recorder.reset().items()):
+        latencies = measurement.latencies_ms
+        summary[name] = {
+            'calls': len(latencies),
+            'throughput': len(latencies) / elapsed,
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+            'error_rate': measurement.errors / len(latencies) if latencies else 0.0,
+        }
+    return summary
+
+def format_step(operators: int, summary: Dict[str, Dict[str, float]]) -> str:
+    header = f"{'operators=' + str(operators):<16}{'call':<36}{'calls':>8}{'req/s':>9}{'p50_ms':>9}{'p95_ms':>9}{'p99_ms':>9}{'err%':>7}"
+    lines = [header, '-' * len(header)]
+    for name, row in summary.items():
+        lines.append(f"{'':<16}{name:<36}{row['calls']:>8}{row['throughput']:>9.1f}{row['p50_ms']:>9.2f}"
+                     f"{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}{row['error_rate'] * 100:>7.1f}")
+    return '\n'.join(lines)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Load test the AuraChat helper backends with concurrent operators")
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    parser.add_argument('--operators', default='1,5,10,25', help="Comma-separated operator counts to step through")
+    parser.add_argument('--step-seconds', type=float, default=15.0)
+    parser.add_argument('--think-ms', type=float, default=200.0, help="Mean think time between actions")
+    parser.add_argument('--chats-per-account', type=int, default=5, help="Chats each operator opens per account")
+    parser.add_argument('--mongo-latency-ms', type=float, default=1.0)
+    parser.add_argument('--api-latency-ms', type=float, default=50.0)
+    parser.add_argument('--portal-latency-ms', type=float, default=300.0)
+    parser.add_argument('--backend-concurrency', type=int, default=0,
+                        help="Requests each stand-in serves at once (0 for unlimited)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of HTTP requests failing with 503")
+    args = parser.parse_args(argv)
+
+    with BenchmarkEnvironment(SCALES[args.scale], mongo_latency_ms=args.mongo_latency_ms,
+                              api_latency_ms=args.api_latency_ms, portal_latency_ms=args.portal_latency_ms,
+                              error_rate=args.error_rate, backend_concurrency=args.backend_concurrency) as env:
+        recorder = CallRecorder()
+        undo = instrument(recorder)
+        try:
+            for operators in [int(count) for count in args.operators.split(',')]:
+                errors: List[str] = []
+                # The app prints on every call; keep the load generator's own output readable
+                with quiet_app_output():
+                    summary = run_step(env, recorder, operators, args.step_seconds, args.think_ms,
+                                       args.chats_per_account, errors)
+                print(format_step(operators, summary))
+                if errors:
+                    print(f"{len(errors)} operator flow errors, first: {errors[0]}")
+                print()
+        finally:
+            undo()
+
+if __name__ == '__main__':
+    main()
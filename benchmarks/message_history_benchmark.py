@@ -0,0 +1,135 @@
+"""
+Memory and throughput of a chat's messages as Message dataclasses versus a MessageHistory.
+
+A synthetic chat (100k messages by default, in the stored content/timestamp/sender
+shape) is converted both ways: the list of Message objects that
+db_client.get_chat_messages returns, and the column-wise MessageHistory. Retained
+memory is measured with tracemalloc; the timed scenarios are the operations the
+app performs on a chat's messages.
+
+Usage (from the repository root, with requirements installed):
+    python -m benchmarks.message_history_benchmark
+    python -m benchmarks.message_history_benchmark --messages 200000 --iterations 20
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import time
+import tracemalloc
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Tuple
+from .fakes.dataset import WORDS
+from .harness import SRC  # noqa: F401  (puts src on sys.path)
+from .stats import Measurement, format_report
+
+FAN_ID = '100001'
+CREATOR_ID = '1000'
+RECENT = 200
+
+def make_chat(count: int, seed: int = 1234) -> List[Dict[str, Any]]:
+    """Stored-shape messages of one long chat, oldest first; about 1 in 50 has an attachment."""
+    rng = random.Random(seed)
+    timestamp = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    messages = []
+    for position in range(count):
+        timestamp += timedelta(minutes=rng.randint(1, 120))
+        message = {
+            'id': position + 1,
+            'content': f"<p>{' '.join(rng.choices(WORDS, k=rng.randint(3, 25)))}</p>",
+            'timestamp': timestamp.isoformat().replace('+00:00', 'Z'),
+            'sender': FAN_ID if rng.random() < 0.55 else CREATOR_ID
+        }
+        if rng.random() < 0.02:
+            message['media'] = [{'id': position, 'type': 'photo', 'canView': True,
+                                 'files': {'thumb': {'url': f"https://cdn.example.com/{position}.jpg"}}}]
+        messages.append(message)
+    return messages
+
+def retained_kib(build: Callable[[], Any]) -> Tuple[Any, float]:
+    """Build a structure and measure the memory it keeps alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        result = build()
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, (after - before) / 1024
+
+def time_scenario(name: str, call: Callable[[], Any], iterations: int) -> Measurement:
+    measurement = Measurement(name)
+    for _ in range(iterations):
+        started = time.perf_counter()
+        call()
+        measurement.latencies_ms.append((time.perf_counter() - started) * 1000)
+    return measurement
+
+def parse_time(value: Any) -> float:
+    """How display code parses a stored timestamp string each time it is shown."""
+    return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Message lists against MessageHistory")
+    parser.add_argument('--messages', type=int, default=100_000)
+    parser.add_argument('--iterations', type=int, default=10)
+    args = parser.parse_args()
+
+    os.environ.setdefault('MONGODB_URI', 'mongodb://127.0.0.1:1/?connect=false')
+    from aurachat_helper_app.db.db_client import db_client
+    from aurachat_helper_app.models.message_history import MessageHistory
+
+    stored = make_chat(args.messages)
+    # Decode fresh dicts for each build, as pymongo would, so neither side shares strings with `stored`
+    raw = json.dumps(stored)
+    as_list, list_kib = retained_kib(lambda: [db_client._to_message(msg) for msg in json.loads(raw)])
+    history, history_kib = retained_kib(lambda: MessageHistory.from_dicts(json.loads(raw)))
+    assert len(history) == len(as_list)
+    assert history.last_message_from(FAN_ID).id == next(m for m in reversed(as_list) if m.sender == FAN_ID).id
+
+    # A one-day window in the middle of the chat
+    middle = parse_time(as_list[len(as_list) // 2].timestamp)
+    window = (middle, middle + 86400)
+    window_ms = (int(window[0] * 1000), int(window[1] * 1000))
+
+    def last_fan_list():
+        for message in reversed(as_list):
+            if message.sender == FAN_ID:
+                return message
+
+    def window_list():
+        return sum(1 for message in as_list if window[0] <= parse_time(message.timestamp) < window[1])
+
+    def window_history():
+        timestamps = history.timestamps_ms()
+        return bisect_left(timestamps, window_ms[1]) - bisect_left(timestamps, window_ms[0])
+
+    assert window_list() == window_history()
+    scenarios = [
+        ('build.message_list', lambda: [db_client._to_message(msg) for msg in stored]),
+        ('build.history', lambda: MessageHistory.from_dicts(stored)),
+        ('last_fan_message.message_list', last_fan_list),
+        ('last_fan_message.history', lambda: history.last_message_from(FAN_ID)),
+        ('recent_slice.message_list', lambda: as_list[-RECENT:]),
+        ('recent_slice.history', lambda: history[-RECENT:]),
+        ('recent_times.message_list', lambda: [parse_time(m.timestamp) for m in as_list[-RECENT:]]),
+        ('recent_times.history', lambda: list(history[-RECENT:].timestamps_ms())),
+        ('iterate_content.message_list', lambda: sum(len(m.content) for m in as_list)),
+        ('iterate_content.history', lambda: sum(len(content) for content in history.contents())),
+        ('day_window.message_list', window_list),
+        ('day_window.history', window_history),
+    ]
+    summaries: Dict[str, Dict[str, float]] = {}
+    for name, call in scenarios:
+        summaries[name] = time_scenario(name, call, args.iterations).summary()
+
+    print(f"{args.messages} messages retained: Message list {list_kib / 1024:.1f} MiB, "
+          f"MessageHistory {history_kib / 1024:.1f} MiB ({list_kib / max(history_kib, 1):.1f}x smaller)")
+    print(format_report(summaries))
+
+if __name__ == '__main__':
+    main()
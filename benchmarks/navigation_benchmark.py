@@ -0,0 +1,126 @@
+"""
+Startup and per-navigation cost of building the app's clients and services.
+
+Startup is measured in fresh interpreters: importing the controllers (which loads
+the configuration and creates the Mongo client) and building the shared services.
+Navigation compares opening an account the way controllers used to, constructing
+new API clients and services each time, with taking them from one ServiceContainer;
+both then load the account's chats and one chat's messages from the local stand-ins.
+
+Usage (from the repository root, with requirements installed):
+    python -m benchmarks.navigation_benchmark --scale small
+    python -m benchmarks.navigation_benchmark --startup-runs 10 --iterations 300 --api-latency-ms 20
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+from .fakes.dataset import SCALES
+from .harness import SRC, BenchmarkEnvironment
+from .run_benchmarks import run_scenario
+from .stats import Measurement, format_report
+
+STARTUP_SCRIPT = r'''
+import json, time
+started = time.perf_counter()
+from aurachat_helper_app.controllers.root_controller import RootController
+from aurachat_helper_app.services.service_container import ServiceContainer
+imported = time.perf_counter()
+services = ServiceContainer()
+for name in ('chat_service', 'message_service', 'message_sync_service', 'generate_message_service'):
+    getattr(services, name)
+built = time.perf_counter()
+services.shutdown()
+print(json.dumps({'import_ms': (imported - started) * 1000, 'services_ms': (built - imported) * 1000}))
+'''
+
+def measure_startup(runs: int) -> Dict[str, Measurement]:
+    """Run the startup script in fresh interpreters, without a real database or API."""
+    env = dict(os.environ, PYTHONPATH=SRC, MONGODB_URI='mongodb://127.0.0.1:1/?connect=false',
+               ONLYFANSAPI_KEY='benchmark-key')
+    measurements = {name: Measurement(name) for name in
+                    ('startup.import_controllers', 'startup.build_services', 'startup.process_total')}
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT], env=env, capture_output=True, text=True)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if result.returncode != 0:
+            for measurement in measurements.values():
+                measurement.errors += 1
+            print(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "startup script failed")
+            continue
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        measurements['startup.import_controllers'].latencies_ms.append(timings['import_ms'])
+        measurements['startup.build_services'].latencies_ms.append(timings['services_ms'])
+        measurements['startup.process_total'].latencies_ms.append(elapsed_ms)
+    return measurements
+
+def build_navigation_scenarios(env: BenchmarkEnvironment) -> List[Tuple[str, Callable[[random.Random], object]]]:
+    """Opening an account with per-controller clients versus a shared container."""
+    from aurachat_helper_app.services.chat_service import ChatService
+    from aurachat_helper_app.services.message_service import MessageService
+    from aurachat_helper_app.services.message_sync_service import MessageSyncService
+    from aurachat_helper_app.services.generate_message_service import GenerateMessageService
+    from aurachat_helper_app.services.search_service import SearchService
+    from aurachat_helper_app.services.service_container import ServiceContainer
+    from aurachat_helper_app.api.aurachat_webportal_client import AuraChatWebPortalClient
+    from aurachat_helper_app.db.db_client import db_client
+
+    config = env.config
+    dataset = env.dataset
+    services = ServiceContainer()
+
+    def fresh_services():
+        # What a ChatsController built for itself before the container existed
+        message_service = MessageService()
+        return (ChatService(), message_service, GenerateMessageService(),
+                MessageSyncService(message_service.api_client), SearchService(), AuraChatWebPortalClient())
+
+    def shared_services():
+        return (services.chat_service, services.message_service, services.generate_message_service,
+                services.message_sync_service, services.search_service, services.webportal_client)
+
+    def navigate(build):
+        def call(rng: random.Random):
+            chat_service = build()[0]
+            account_id = dataset.account_id(rng.randrange(config.accounts))
+            chats = chat_service.get_chats_for_account(account_id)
+            db_client.get_recent_chat_messages(account_id, dataset.chat_id(rng.randrange(config.chats_per_account)))
+            return chats
+        return call
+
+    return [
+        ('build_services.fresh', lambda rng: fresh_services()),
+        ('build_services.shared', lambda rng: shared_services()),
+        ('navigate_account.fresh', navigate(fresh_services)),
+        ('navigate_account.shared', navigate(shared_services)),
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark startup and per-navigation service construction")
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    parser.add_argument('--startup-runs', type=int, default=5)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--alloc-iterations', type=int, default=20)
+    parser.add_argument('--api-latency-ms', type=float, default=0.0, help="Simulated OnlyFans API server time")
+    args = parser.parse_args()
+
+    summaries: Dict[str, Dict[str, float]] = {}
+    if args.startup_runs:
+        for name, measurement in measure_startup(args.startup_runs).items():
+            summaries[name] = measurement.summary()
+
+    with BenchmarkEnvironment(SCALES[args.scale], api_latency_ms=args.api_latency_ms) as env:
+        for name, call in build_navigation_scenarios(env):
+            measurement = run_scenario(name, call, args.iterations, args.warmup, args.alloc_iterations)
+            summaries[name] = measurement.summary()
+
+    print(format_report(summaries))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Record/replay of the API traffic behind opening accounts and generating drafts.
+
+The flow (open a random account's chat list, then generate a draft for one of its
+chats) first runs live against the local stand-ins while the shared session records
+it. The stand-ins are then stopped and the same seeded flow is replayed from the
+recording, instantly and at the recorded latencies; replayed results must match
+the live ones exactly.
+
+Usage (from the repository root, with requirements installed):
+    python -m benchmarks.replay_benchmark --scale small
+    python -m benchmarks.replay_benchmark --iterations 100 --api-latency-ms 20 --portal-latency-ms 200
+    python -m benchmarks.replay_benchmark --keep recording.jsonl.gz
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Tuple
+from .fakes.dataset import SCALES
+from .harness import BenchmarkEnvironment, quiet_app_output
+from .stats import Measurement, format_report
+
+def build_flow(env: BenchmarkEnvironment, services) -> Callable[[random.Random], object]:
+    """One pass of the flow through a container's services."""
+    config = env.config
+    dataset = env.dataset
+
+    def call(rng: random.Random):
+        account_id = dataset.account_id(rng.randrange(config.accounts))
+        chats = services.chat_service.get_chats_for_account(account_id)
+        chat_id = dataset.chat_id(rng.randrange(config.chats_per_account))
+        draft = services.generate_message_service.generate_response(account_id, chat_id)
+        return [chat.fan.id for chat in chats], draft
+    return call
+
+def run_flow(name: str, mode: str, env: BenchmarkEnvironment, path: str, latency_scale: float,
+             iterations: int) -> Tuple[List[object], Measurement]:
+    """Run the seeded flow with a fresh container in a transport mode, timing each pass."""
+    from aurachat_helper_app.app_config import reload_config
+    from aurachat_helper_app.services.service_container import ServiceContainer
+    os.environ['AURACHAT_TRANSPORT'] = mode
+    os.environ['AURACHAT_TRANSPORT_FILE'] = path
+    os.environ['AURACHAT_REPLAY_LATENCY'] = str(latency_scale)
+    services = ServiceContainer(config=reload_config())
+    measurement = Measurement(name)
+    results = []
+    try:
+        call = build_flow(env, services)
+        rng = random.Random(7)
+        # The app prints liberally; keep the formatting cost but drop the output
+        with quiet_app_output():
+            for _ in range(iterations):
+                started = time.perf_counter()
+                try:
+                    results.append(call(rng))
+                except Exception:
+                    measurement.errors += 1
+                    results.append(None)
+                measurement.latencies_ms.append((time.perf_counter() - started) * 1000.0)
+    finally:
+        services.shutdown()
+    return results, measurement
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark live versus replayed API traffic")
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--api-latency-ms', type=float, default=10.0, help="Simulated OnlyFans API server time")
+    parser.add_argument('--portal-latency-ms', type=float, default=50.0, help="Simulated portal generation time")
+    parser.add_argument('--keep', help="Write the recording here instead of a temporary file")
+    args = parser.parse_args()
+
+    path = args.keep or os.path.join(tempfile.mkdtemp(), 'recording.jsonl.gz')
+    if os.path.exists(path):
+        os.remove(path)
+    summaries: Dict[str, Dict[str, float]] = {}
+    mismatches = 0
+    with BenchmarkEnvironment(SCALES[args.scale], api_latency_ms=args.api_latency_ms,
+                              portal_latency_ms=args.portal_latency_ms) as env:
+        live, measurement = run_flow('flow.live_recording', 'record', env, path, 0.0, args.iterations)
+        summaries[measurement.name] = measurement.summary()
+        # Replays must not need the network
+        env.api.stop()
+        env.portal.stop()
+        for name, scale in (('flow.replay_instant', 0.0), ('flow.replay_recorded', 1.0)):
+            replayed, measurement = run_flow(name, 'replay', env, path, scale, args.iterations)
+            summaries[name] = measurement.summary()
+            mismatches += sum(1 for a, b in zip(live, replayed) if a != b)
+
+        from aurachat_helper_app.app_config import reload_config
+        for variable in ('AURACHAT_TRANSPORT', 'AURACHAT_TRANSPORT_FILE', 'AURACHAT_REPLAY_LATENCY'):
+            os.environ.pop(variable, None)
+        reload_config()
+
+    print(f"Recording: {os.path.getsize(path) / 1024:.1f} KiB for {args.iterations} passes, "
+          f"replay mismatches: {mismatches}")
+    print(format_report(summaries))
+    if not args.keep:
+        os.remove(path)
+    sys.exit(1 if mismatches else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+End-to-end benchmarks of the app's backend paths against local stand-ins.
+
+Usage (from the repository root, with requirements installed):
+    python -m benchmarks.run_benchmarks --scale small
+    python -m benchmarks.run_benchmarks --scale full --save benchmarks/baseline.json
+    python -m benchmarks.run_benchmarks --scale full --baseline benchmarks/baseline.json --fail-over 20
+"""
+import argparse
+import os
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+from .fakes.dataset import SCALES
+from .harness import BenchmarkEnvironment, quiet_app_output
+from .stats import Measurement, format_report, load_results, regressions, save_results
+
+def build_scenarios(env: BenchmarkEnvironment) -> List[Tuple[str, Callable[[random.Random], object]]]:
+    """Create the benchmarked calls; service objects are built once, as a controller would."""
+    from aurachat_helper_app.managers.user_manager import UserManager
+    from aurachat_helper_app.managers.onlyfans_account_manager import OnlyFansAccountManager
+    from aurachat_helper_app.services.chat_service import ChatService
+    from aurachat_helper_app.services.generate_message_service import GenerateMessageService
+    from aurachat_helper_app.db.db_client import db_client
+
+    config = env.config
+    dataset = env.dataset
+    user_manager = UserManager()
+    chat_service = ChatService()
+    generate_service = GenerateMessageService()
+
+    def random_chat(rng: random.Random) -> Tuple[str, str]:
+        return (dataset.account_id(rng.randrange(config.accounts)),
+                dataset.chat_id(rng.randrange(config.chats_per_account)))
+
+    def sign_in(rng):
+        return user_manager.sign_in(dataset.user_email(rng.randrange(config.users)))
+
+    def load_accounts(rng):
+        manager = OnlyFansAccountManager()
+        manager.load_accounts_from_ids(env.account_ids(rng.randrange(config.users)))
+        return manager.get_accounts()
+
+    def get_chats(rng):
+        return chat_service.get_chats_for_account(dataset.account_id(rng.randrange(config.accounts)))
+
+    def get_chat_messages(rng):
+        return db_client.get_chat_messages(*random_chat(rng))
+
+    def get_recent_chat_messages(rng):
+        return db_client.get_recent_chat_messages(*random_chat(rng))
+
+    def generate_response(rng):
+        return generate_service.generate_response(*random_chat(rng))
+
+    return [
+        ('UserManager.sign_in', sign_in),
+        ('AccountManager.load_accounts', load_accounts),
+        ('ChatService.get_chats', get_chats),
+        ('MongoDB.get_chat_messages', get_chat_messages),
+        ('MongoDB.get_recent_messages', get_recent_chat_messages),
+        ('GenerateMessage.generate', generate_response),
+    ]
+
+def run_scenario(name: str, call: Callable[[random.Random], object], iterations: int, warmup: int,
+                 alloc_iterations: int) -> Measurement:
+    """Time a scenario, then measure its allocations in a separate traced pass."""
+    measurement = Measurement(name)
+    rng = random.Random(42)
+    # The app prints liberally; keep the formatting cost but drop the output
+    with quiet_app_output():
+        for _ in range(warmup):
+            call(rng)
+        for _ in range(iterations):
+            started = time.perf_counter()
+            try:
+                call(rng)
+            except Exception:
+                measurement.errors += 1
+            measurement.latencies_ms.append((time.perf_counter() - started) * 1000.0)
+
+        tracemalloc.start()
+        try:
+            for _ in range(alloc_iterations):
+                tracemalloc.reset_peak()
+                before_size, _ = tracemalloc.get_traced_memory()
+                before_blocks = len(tracemalloc.take_snapshot().traces)
+                result = call(rng)
+                _, peak = tracemalloc.get_traced_memory()
+                measurement.alloc_peak_kb.append((peak - before_size) / 1024.0)
+                measurement.alloc_blocks.append(len(tracemalloc.take_snapshot().traces) - before_blocks)
+                del result
+        finally:
+            tracemalloc.stop()
+    return measurement
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AuraChat helper backend paths against local stand-ins")
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--alloc-iterations', type=int, default=20)
+    parser.add_argument('--mongo-latency-ms', type=float, default=0.0, help="Simulated Mongo round trip")
+    parser.add_argument('--api-latency-ms', type=float, default=0.0, help="Simulated OnlyFans API server time")
+    parser.add_argument('--portal-latency-ms', type=float, default=0.0, help="Simulated portal server time")
+    parser.add_argument('--only', action='append', help="Run only scenarios containing this text")
+    parser.add_argument('--save', help="Write results to this JSON file")
+    parser.add_argument('--baseline', help="Compare against results saved with --save")
+    parser.add_argument('--fail-over', type=float, help="Exit non-zero if a p50 regresses by more than this percent")
+    args = parser.parse_args()
+
+    with BenchmarkEnvironment(SCALES[args.scale], mongo_latency_ms=args.mongo_latency_ms,
+                              api_latency_ms=args.api_latency_ms, portal_latency_ms=args.portal_latency_ms) as env:
+        summaries: Dict[str, Dict[str, float]] = {}
+        for name, call in build_scenarios(env):
+            if args.only and not any(text in name for text in args.only):
+                continue
+            measurement = run_scenario(name, call, args.iterations, args.warmup, args.alloc_iterations)
+            summaries[name] = measurement.summary()
+
+    baseline = load_results(args.baseline) if args.baseline and os.path.exists(args.baseline) else None
+    print(format_report(summaries, baseline))
+
+    if args.save:
+        save_results(args.save, summaries, {'scale': args.scale, 'iterations': args.iterations,
+                                            'mongo_latency_ms': args.mongo_latency_ms,
+                                            'api_latency_ms': args.api_latency_ms,
+                                            'portal_latency_ms': args.portal_latency_ms})
+        print(f"Saved results to {args.save}")
+
+    if baseline and args.fail_over is not None:
+        failed = regressions(summaries, baseline, args.fail_over)
+        if failed:
+            print("Regressions:\n  " + "\n  ".join(failed))
+            raise SystemExit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Latency of the operator's draft requests while account syncs flood the portal.
+
+Each scenario starts full syncs of several accounts (hundreds of background portal
+requests) and then times interactive generate requests sent through the outbound
+queue, from enqueue to the draft arriving. The work scheduler is compared with the
+same pool run as a single queue, where the drafts wait behind the syncs, and with
+an idle portal. The stand-in portal serves a limited number of requests at once,
+like the real one.
+
+Usage (from the repository root, with requirements installed):
+    python -m benchmarks.scheduler_benchmark --scale small
+    python -m benchmarks.scheduler_benchmark --accounts 10 --requests 30 --portal-latency-ms 100
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from .fakes.dataset import SCALES
+from .harness import BenchmarkEnvironment, quiet_app_output
+from .stats import Measurement, format_report
+
+def single_queue_scheduler():
+    """A WorkScheduler of the same size that runs everything as one class, first come first served."""
+    from aurachat_helper_app.utils.work_scheduler import WORK_BACKGROUND, WorkScheduler
+
+    class SingleQueueScheduler(WorkScheduler):
+        RESERVED_INTERACTIVE = 0
+
+        def submit(self, work_class, fn, *args, **kwargs):
+            return super().submit(WORK_BACKGROUND, fn, *args, **kwargs)
+
+    return SingleQueueScheduler(caps={WORK_BACKGROUND: WorkScheduler.MAX_WORKERS})
+
+def run_scenario(name: str, env: BenchmarkEnvironment, scheduler, sync_accounts: int, requests: int) -> Measurement:
+    """Time generate requests while the given number of accounts is being synced."""
+    from aurachat_helper_app.services.account_sync_service import AccountSyncService
+    from aurachat_helper_app.services.outbound_queue import OP_GENERATE, STATUS_DONE, STATUS_FAILED, OutboundQueue
+    from aurachat_helper_app.services.service_container import ServiceContainer
+    services = ServiceContainer()
+    measurement = Measurement(name)
+    queue = OutboundQueue(services.webportal_client, services.generate_message_service,
+                          path=os.path.join(tempfile.mkdtemp(), 'outbound_queue.json'), scheduler=scheduler)
+    sync_service = AccountSyncService(services.webportal_client, scheduler)
+    finished = {}
+    done = threading.Event()
+
+    def listener(request, result):
+        if request.status in (STATUS_DONE, STATUS_FAILED):
+            finished[request.chat_id] = (request.status, time.perf_counter())
+            done.set()
+
+    queue.add_listener(listener)
+    queue.start()
+    rng = random.Random(11)
+    jobs = []
+    try:
+        with quiet_app_output():
+            for index in range(sync_accounts):
+                account_id = env.dataset.account_id(index)
+                chats = services.chat_service.get_chats_for_account(account_id)
+                jobs.append(sync_service.start(account_id, chats, False, lambda job, progress: None,
+                                               lambda job, progress: None))
+            time.sleep(0.2)
+            for _ in range(requests):
+                account_id = env.dataset.account_id(rng.randrange(env.config.accounts))
+                chat_id = env.dataset.chat_id(rng.randrange(env.config.chats_per_account))
+                done.clear()
+                finished.pop(chat_id, None)
+                started = time.perf_counter()
+                queue.enqueue(OP_GENERATE, account_id, chat_id, 1)
+                while chat_id not in finished and done.wait(30):
+                    done.clear()
+                status, ended = finished.get(chat_id, (STATUS_FAILED, time.perf_counter()))
+                if status != STATUS_DONE:
+                    measurement.errors += 1
+                measurement.latencies_ms.append((ended - started) * 1000.0)
+    finally:
+        for job in jobs:
+            job.cancel()
+        queue.shutdown()
+        sync_service.shutdown()
+        scheduler.shutdown()
+        services.shutdown()
+    print(f"{name}: {scheduler.summary()}")
+    return measurement
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark interactive portal latency under background syncs")
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    parser.add_argument('--accounts', type=int, default=5, help="Accounts whose chats are synced meanwhile")
+    parser.add_argument('--requests', type=int, default=20, help="Generate requests timed per scenario")
+    parser.add_argument('--portal-latency-ms', type=float, default=50.0, help="Simulated portal server time")
+    parser.add_argument('--backend-concurrency', type=int, default=4, help="Requests the stand-ins serve at once")
+    args = parser.parse_args()
+
+    with BenchmarkEnvironment(SCALES[args.scale], portal_latency_ms=args.portal_latency_ms,
+                              backend_concurrency=args.backend_concurrency) as env:
+        from aurachat_helper_app.utils.work_scheduler import WorkScheduler
+        measurements = [
+            run_scenario('generate.idle', env, WorkScheduler(), 0, args.requests),
+            run_scenario('generate.syncing.scheduler', env, WorkScheduler(), args.accounts, args.requests),
+            run_scenario('generate.syncing.single_queue', env, single_queue_scheduler(), args.accounts, args.requests),
+        ]
+    print(format_report({measurement.name: measurement.summary() for measurement in measurements}))
+
+if __name__ == '__main__':
+    main()
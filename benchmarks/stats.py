@@ -0,0 +1,76 @@
+"""Latency/allocation summaries, report formatting and baseline comparison."""
+import json
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+@dataclass
+class Measurement:
+    """Raw samples collected for one benchmark scenario."""
+    name: str
+    latencies_ms: List[float] = field(default_factory=list)
+    alloc_peak_kb: List[float] = field(default_factory=list)
+    alloc_blocks: List[int] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self) -> Dict[str, float]:
+        lat = self.latencies_ms
+        return {
+            'count': len(lat),
+            'errors': self.errors,
+            'mean_ms': sum(lat) / len(lat) if lat else 0.0,
+            'p50_ms': percentile(lat, 50),
+            'p90_ms': percentile(lat, 90),
+            'p99_ms': percentile(lat, 99),
+            'max_ms': max(lat) if lat else 0.0,
+            'alloc_peak_kb': percentile(self.alloc_peak_kb, 50),
+            'alloc_blocks': percentile(self.alloc_blocks, 50),
+        }
+
+def save_results(path: str, summaries: Dict[str, Dict[str, float]], metadata: Dict[str, object]) -> None:
+    """Write summaries to a JSON baseline file."""
+    with open(path, 'w') as f:
+        json.dump({'metadata': metadata, 'results': summaries}, f, indent=2, sort_keys=True)
+
+def load_results(path: str) -> Dict[str, Dict[str, float]]:
+    """Read summaries from a JSON baseline file."""
+    with open(path) as f:
+        return json.load(f)['results']
+
+def _delta(current: float, previous: Optional[float]) -> str:
+    if not previous:
+        return ''
+    return f"{(current - previous) / previous * 100:+.0f}%"
+
+def format_report(summaries: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Dict[str, float]]] = None) -> str:
+    """Render summaries as a fixed-width table, with deltas against a baseline if given."""
+    columns = ['p50_ms', 'p90_ms', 'p99_ms', 'max_ms', 'alloc_peak_kb', 'alloc_blocks']
+    header = f"{'scenario':<28}{'n':>6}{'err':>5}" + ''.join(f"{column:>16}" for column in columns)
+    lines = [header, '-' * len(header)]
+    for name, summary in summaries.items():
+        previous = (baseline or {}).get(name, {})
+        cells = []
+        for column in columns:
+            value = f"{summary[column]:.2f}" if column.endswith('_ms') else f"{summary[column]:.0f}"
+            delta = _delta(summary[column], previous.get(column))
+            cells.append(f"{value + (' ' + delta if delta else ''):>16}")
+        lines.append(f"{name:<28}{summary['count']:>6}{summary['errors']:>5}" + ''.join(cells))
+    return '\n'.join(lines)
+
+def regressions(summaries: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+                threshold_pct: float, column: str = 'p50_ms') -> List[str]:
+    """List scenarios whose metric grew by more than threshold_pct over the baseline."""
+    failed = []
+    for name, summary in summaries.items():
+        previous = baseline.get(name, {}).get(column)
+        if previous and (summary[column] - previous) / previous * 100 > threshold_pct:
+            failed.append(f"{name}: {column} {previous:.2f} -> {summary[column]:.2f}")
+    return failed
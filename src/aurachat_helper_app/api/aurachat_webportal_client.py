@@ -1,50 +1,70 @@
 """Client for interacting with the AuraChat web portal API."""
 import requests
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+from ..app_config import get_config
 
 class AuraChatWebPortalClient:
     """Client for interacting with the AuraChat web portal API."""
     
-    def __init__(self, base_url: str = "https://aurachat-webportal.vercel.app"):
-        """Initialize the web portal client."""
-        self.base_url = base_url
+    def __init__(self, base_url: Optional[str] = None, session: Optional[requests.Session] = None,
+                 timeout: Optional[Tuple[float, float]] = None):
+        """
+        Initialize the web portal client, using AURACHAT_PORTAL_URL to override the default portal.
+        
+        Args:
+            base_url: The portal's base URL
+            session: HTTP session to send requests with
+            timeout: (connect, read) timeout in seconds; defaults to the configured portal timeouts
+        """
+        config = get_config()
+        self.base_url = base_url or config.portal_url
+        self.session = session or requests.Session()
+        self.timeout = timeout or (config.portal_connect_timeout, config.portal_read_timeout)
         
-    def sync_messages(self, account_id: str, chat_id: str) -> Optional[dict]:
+    def sync_messages(self, account_id: str, chat_id: str, raise_errors: bool = False) -> Optional[dict]:
         """
         Sync messages for a specific chat.
         
         Args:
             account_id: The account ID
             chat_id: The chat ID
+            raise_errors: Raise request errors instead of returning None, e.g. to retry them later
             
         Returns:
             Response data from the API or None if the request failed
         """
         try:
-            response = requests.post(
-                f"{self.base_url}/api/sync-messages/{account_id}/{chat_id}"
+            response = self.session.post(
+                f"{self.base_url}/api/sync-messages/{account_id}/{chat_id}",
+                timeout=self.timeout
             )
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
             print(f"Error syncing messages: {e}")
-            return None 
+            if raise_errors:
+                raise
+            return None
 
-    def generate_response(self, account_id: str, chat_id: str) -> Optional[Dict[str, Any]]:
+    def generate_response(self, account_id: str, chat_id: str, raise_errors: bool = False) -> Optional[Dict[str, Any]]:
         """
         Generate a response for a chat.
         
         Args:
             account_id: The ID of the OnlyFans account
             chat_id: The ID of the chat
+            raise_errors: Raise request errors instead of returning None, e.g. to retry them later
             
         Returns:
             The JSON response from the server, or None if the request fails
         """
         try:
-            response = requests.post(f"{self.base_url}/api/generate-response/{account_id}/{chat_id}")
+            response = self.session.post(f"{self.base_url}/api/generate-response/{account_id}/{chat_id}",
+                                         timeout=self.timeout)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
             print(f"Error generating response: {e}")
-            return None 
\ No newline at end of file
+            if raise_errors:
+                raise
+            return None
\ No newline at end of file
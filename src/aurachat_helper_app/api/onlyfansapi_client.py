@@ -1,26 +1,33 @@
 import requests
-import os
 from typing import Dict, Any, Optional, List
-from dotenv import load_dotenv
+from ..app_config import AppConfig, get_config
 from ..utils.logger import get_logger
-from ..env_config import ONLYFANSAPI_KEY as CONFIG_KEY
 
 logger = get_logger(__name__)
 
 class OnlyFansAPIClient:
     """Client for interacting with the OnlyFans API."""
     
-    def __init__(self):
-        """Initialize the client with an API token from environment variables."""
-        load_dotenv()  # Load environment variables from .env file
-        # Try config value first, then environment variable
-        token = CONFIG_KEY or os.getenv('ONLYFANSAPI_KEY')
+    def __init__(self, config: Optional[AppConfig] = None, session: Optional[requests.Session] = None):
+        """
+        Initialize the client with the API token from the app configuration.
+        
+        Args:
+            config: App configuration, by default the process-wide one
+            session: HTTP session to reuse connections across requests, by default a new one
+        """
+        config = config or get_config()
+        token = config.onlyfansapi_key
         if not token:
             logger.error("ONLYFANSAPI_KEY not found in configuration or environment variables")
             raise ValueError("ONLYFANSAPI_KEY not found in configuration or environment variables. Please add it to your .env file.")
             
         self.token = token
-        self.base_url = "https://app.onlyfansapi.com/api"
+        self.base_url = config.onlyfansapi_base_url
+        self.session = session or requests.Session()
+        # (connect, read) seconds; these calls run on the shared worker pool, which a hung
+        # request would hold on to
+        self.timeout = (config.onlyfansapi_connect_timeout, config.onlyfansapi_read_timeout)
         self.headers = {"Authorization": f"Bearer {token}"}
         logger.debug("OnlyFansAPI client initialized successfully")
         
@@ -38,10 +45,11 @@ class OnlyFansAPIClient:
         try:
             url = f"{self.base_url}/{account_id}/chats/"
             print(f"Fetching chats from: {url}")
-            response = requests.get(
+            response = self.session.get(
                 url,
                 params={'order': order},
-                headers=self.headers
+                headers=self.headers,
+                timeout=self.timeout
             )
             response.raise_for_status()
             data = response.json()
@@ -50,21 +58,32 @@ class OnlyFansAPIClient:
             print(f"Error getting chats: {e}")
             return []
             
-    def get_chat_messages(self, account_id: str, chat_id: str) -> Optional[Dict[str, Any]]:
+    def get_chat_messages(self, account_id: str, chat_id: str, limit: Optional[int] = None,
+                          before_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """
         Fetch messages for a specific chat.
         
+        Messages are returned newest first. Passing ``before_id`` returns the page of
+        messages older than that message ID, which is how callers page through history.
+        
         Args:
             account_id: The ID of the OnlyFans account
             chat_id: The ID of the chat
+            limit: Maximum number of messages to return, or None for the API default
+            before_id: Only return messages older than this message ID
             
         Returns:
             Dict containing the messages data or None if the request failed
         """
         try:
             url = f"{self.base_url}/{account_id}/chats/{chat_id}/messages"
-            print("URL:", url)
-            response = requests.get(url, headers=self.headers)
+            params = {}
+            if limit is not None:
+                params['limit'] = limit
+            if before_id is not None:
+                params['id'] = before_id
+            print("URL:", url, params)
+            response = self.session.get(url, params=params, headers=self.headers, timeout=self.timeout)
             response.raise_for_status()  # Raise exception for bad status codes
             response_data = response.json()
             return response_data
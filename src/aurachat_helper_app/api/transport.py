@@ -0,0 +1,211 @@
+"""
+Record/replay transports for the API clients.
+
+Both are requests transport adapters, mounted on the shared HTTP session for the
+OnlyFans API and portal base URLs, so the clients are unchanged. Recording writes
+each request/response pair with its timing to a gzip-compressed JSONL file;
+replaying serves the recorded responses without a network, optionally sleeping
+for the recorded latencies.
+"""
+import base64
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from aurachat_helper_app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TRANSPORT_LIVE = 'live'
+TRANSPORT_RECORD = 'record'
+TRANSPORT_REPLAY = 'replay'
+
+RECORDING_VERSION = 1
+
+# Response headers worth keeping; auth and cookie headers are never recorded
+RECORDED_HEADERS = ('Content-Type', 'Content-Encoding', 'Retry-After')
+
+class ReplayMissError(requests.ConnectionError):
+    """Raised when a replayed session makes a request that was not recorded."""
+
+def body_digest(body: Any) -> Optional[str]:
+    """Short digest identifying a request body; None for requests without one."""
+    if not body:
+        return None
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    return hashlib.sha1(body).hexdigest()[:16]
+
+def request_key(request: requests.PreparedRequest) -> Tuple[str, str, Optional[str]]:
+    """What a replayed request is matched on: method, full URL and body."""
+    return request.method, request.url, body_digest(request.body)
+
+class RecordingTransport(BaseAdapter):
+    """Sends requests through another adapter and records each exchange."""
+    
+    def __init__(self, adapter: BaseAdapter, path: str):
+        """
+        Initialize the recording transport.
+        
+        Args:
+            adapter: The adapter that actually sends requests
+            path: Recording file; exchanges are appended to it
+        """
+        super().__init__()
+        self.adapter = adapter
+        self.path = path
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._file = gzip.open(path, 'at', encoding='utf-8')
+        self._write({'version': RECORDING_VERSION, 'recorded_at': datetime.now(timezone.utc).isoformat()})
+        logger.info(f"Recording API traffic to {path}")
+    
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        started = time.perf_counter()
+        response = self.adapter.send(request, **kwargs)
+        # Read the body now so the exchange can be recorded; API responses are small
+        content = response.content
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        method, url, digest = request_key(request)
+        exchange = {
+            'method': method,
+            'url': url,
+            'body': digest,
+            'offset_ms': round((started - self._started) * 1000, 1),
+            'elapsed_ms': round(elapsed_ms, 1),
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers}
+        }
+        try:
+            exchange['text'] = content.decode('utf-8')
+        except UnicodeDecodeError:
+            exchange['base64'] = base64.b64encode(content).decode('ascii')
+        self._write(exchange)
+        return response
+    
+    def _write(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(json.dumps(entry, separators=(',', ':')) + '\n')
+            # Keep the file readable up to here if the app is killed
+            self._file.flush()
+    
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+        self.adapter.close()
+
+class ReplayTransport(BaseAdapter):
+    """
+    Serves recorded responses instead of sending requests.
+    
+    Identical requests get their recorded responses in order, and the last one
+    again once those run out, so a replay is deterministic however often a screen
+    reloads. Unrecorded requests fail with ReplayMissError.
+    """
+    
+    def __init__(self, exchanges: Iterable[Dict[str, Any]], latency_scale: float = 0.0):
+        """
+        Initialize the replay transport.
+        
+        Args:
+            exchanges: Recorded exchanges, as read by load_recording
+            latency_scale: Multiplier for the recorded latencies; 0 answers immediately
+        """
+        super().__init__()
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._exchanges: Dict[Tuple[str, str, Optional[str]], Deque[Dict[str, Any]]] = {}
+        for exchange in exchanges:
+            key = (exchange['method'], exchange['url'], exchange.get('body'))
+            self._exchanges.setdefault(key, deque()).append(exchange)
+        self.misses = 0
+    
+    @classmethod
+    def from_file(cls, path: str, latency_scale: float = 0.0) -> 'ReplayTransport':
+        exchanges = load_recording(path)
+        logger.info(f"Replaying {len(exchanges)} recorded API exchanges from {path}")
+        return cls(exchanges, latency_scale)
+    
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        key = request_key(request)
+        with self._lock:
+            queue = self._exchanges.get(key)
+            if not queue:
+                self.misses += 1
+                raise ReplayMissError(f"No recorded response for {request.method} {request.url}", request=request)
+            exchange = queue.popleft() if len(queue) > 1 else queue[0]
+        if self.latency_scale > 0:
+            time.sleep(exchange['elapsed_ms'] * self.latency_scale / 1000)
+        return self._build_response(request, exchange)
+    
+    def _build_response(self, request: requests.PreparedRequest, exchange: Dict[str, Any]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = exchange['status']
+        response.reason = exchange.get('reason')
+        response.headers = CaseInsensitiveDict(exchange.get('headers') or {})
+        # Content is stored decoded, whatever the original transfer encoding
+        response.headers.pop('Content-Encoding', None)
+        if 'base64' in exchange:
+            response._content = base64.b64decode(exchange['base64'])
+        else:
+            response._content = exchange.get('text', '').encode('utf-8')
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        return response
+    
+    def close(self) -> None:
+        pass
+
+def load_recording(path: str) -> List[Dict[str, Any]]:
+    """Read the exchanges from a recording, ignoring a tail cut short by a crash."""
+    exchanges = []
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as recording:
+            for line in recording:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if 'method' in entry:
+                    exchanges.append(entry)
+    except (EOFError, gzip.BadGzipFile) as e:
+        logger.warning(f"Recording {path} is truncated, using the first {len(exchanges)} exchanges: {e}")
+    return exchanges
+
+def install_transport(session: requests.Session, mode: str, path: Optional[str], prefixes: Iterable[str],
+                      latency_scale: float = 0.0) -> None:
+    """
+    Mount a record or replay transport on a session for the given URL prefixes.
+    
+    Args:
+        session: The shared HTTP session
+        mode: TRANSPORT_LIVE, TRANSPORT_RECORD or TRANSPORT_REPLAY
+        path: Recording file
+        prefixes: Base URLs whose traffic is recorded or replayed
+        latency_scale: When replaying, multiplier for the recorded latencies
+    """
+    if mode == TRANSPORT_LIVE:
+        return
+    if not path:
+        raise ValueError(f"A recording file is needed for {mode} mode")
+    prefixes = [prefix.rstrip('/') + '/' for prefix in prefixes]
+    if mode == TRANSPORT_RECORD:
+        # Every prefix shares one file and the adapter already mounted for its scheme
+        transport = RecordingTransport(session.get_adapter(prefixes[0]), path)
+    elif mode == TRANSPORT_REPLAY:
+        transport = ReplayTransport.from_file(path, latency_scale)
+    else:
+        raise ValueError(f"Unknown transport mode: {mode}")
+    for prefix in prefixes:
+        session.mount(prefix, transport)
\ No newline at end of file
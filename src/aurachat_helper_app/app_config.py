@@ -0,0 +1,79 @@
+"""Application configuration, read once per process from env_config, .env and the environment."""
+import os
+from dataclasses import dataclass
+from typing import Optional
+from dotenv import load_dotenv
+from . import env_config
+
+DEFAULT_ONLYFANSAPI_BASE_URL = "https://app.onlyfansapi.com/api"
+DEFAULT_PORTAL_URL = "https://aurachat-webportal.vercel.app"
+
+@dataclass(frozen=True)
+class AppConfig:
+    """Settings shared by the clients and services; build-time env_config values win over the environment."""
+    mongodb_uri: Optional[str]
+    onlyfansapi_key: Optional[str]
+    onlyfansapi_base_url: str
+    portal_url: str
+    chat_storage_layout: str
+    environment: str
+    diagnostics: bool = False
+    stall_threshold_ms: int = 500
+    mongo_min_pool_size: int = 2
+    mongo_max_pool_size: int = 50
+    mongo_read_preference: str = "primary"
+    transport_mode: str = "live"
+    transport_file: Optional[str] = None
+    replay_latency_scale: float = 0.0
+    portal_connect_timeout: float = 5.0
+    portal_read_timeout: float = 120.0
+    onlyfansapi_connect_timeout: float = 5.0
+    onlyfansapi_read_timeout: float = 30.0
+    session_ttl_days: int = 7
+    
+    @classmethod
+    def from_env(cls) -> 'AppConfig':
+        """Load .env (for development) and read the settings."""
+        load_dotenv()
+        return cls(
+            mongodb_uri=env_config.MONGODB_URI or os.getenv("MONGODB_URI"),
+            onlyfansapi_key=env_config.ONLYFANSAPI_KEY or os.getenv("ONLYFANSAPI_KEY"),
+            # ONLYFANSAPI_BASE_URL lets benchmarks point the client at a local stand-in
+            onlyfansapi_base_url=os.getenv("ONLYFANSAPI_BASE_URL", DEFAULT_ONLYFANSAPI_BASE_URL),
+            portal_url=os.getenv("AURACHAT_PORTAL_URL", DEFAULT_PORTAL_URL),
+            chat_storage_layout=os.getenv("CHAT_STORAGE_LAYOUT", "embedded"),
+            environment=env_config.ENVIRONMENT or os.getenv("ENVIRONMENT", "development"),
+            diagnostics=os.getenv("AURACHAT_DIAGNOSTICS", "").lower() in ("1", "true", "yes"),
+            # 0 turns the UI stall watchdog off
+            stall_threshold_ms=int(os.getenv("AURACHAT_STALL_THRESHOLD_MS", "500")),
+            mongo_min_pool_size=int(os.getenv("MONGODB_MIN_POOL_SIZE", "2")),
+            mongo_max_pool_size=int(os.getenv("MONGODB_MAX_POOL_SIZE", "50")),
+            # For account lookups; e.g. secondaryPreferred to serve them from secondaries
+            mongo_read_preference=os.getenv("MONGODB_READ_PREFERENCE", "primary"),
+            # record or replay API traffic (see api/transport.py); 1.0 replays at recorded speed
+            transport_mode=os.getenv("AURACHAT_TRANSPORT", "live").lower(),
+            transport_file=os.getenv("AURACHAT_TRANSPORT_FILE"),
+            replay_latency_scale=float(os.getenv("AURACHAT_REPLAY_LATENCY", "0")),
+            # Seconds; generating a response can take a while, so the read timeout is generous
+            portal_connect_timeout=float(os.getenv("AURACHAT_PORTAL_CONNECT_TIMEOUT", "5")),
+            portal_read_timeout=float(os.getenv("AURACHAT_PORTAL_READ_TIMEOUT", "120")),
+            onlyfansapi_connect_timeout=float(os.getenv("ONLYFANSAPI_CONNECT_TIMEOUT", "5")),
+            onlyfansapi_read_timeout=float(os.getenv("ONLYFANSAPI_READ_TIMEOUT", "30")),
+            # How long a persisted sign-in is restored without asking again
+            session_ttl_days=int(os.getenv("SESSION_TTL_DAYS", "7"))
+        )
+
+_config: Optional[AppConfig] = None
+
+def get_config() -> AppConfig:
+    """Get the process-wide configuration, loading it on first use."""
+    global _config
+    if _config is None:
+        _config = AppConfig.from_env()
+    return _config
+
+def reload_config() -> AppConfig:
+    """Re-read the configuration, e.g. after a benchmark has changed the environment."""
+    global _config
+    _config = AppConfig.from_env()
+    return _config
\ No newline at end of file
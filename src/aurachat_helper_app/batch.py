@@ -0,0 +1,229 @@
+"""
+Headless batch mode: draft replies for every chat with unread fan messages.
+
+Signs in by email, lists the chats of each of the user's accounts and generates a
+reply for every chat with unread fan messages, a bounded number at a time and
+within per-host request rates. Results are appended to a JSONL file as they
+finish. Re-running with the same output file resumes where an interrupted run
+stopped, and chats whose last fan message already has a cached draft are not
+generated again.
+
+Usage:
+    python -m aurachat_helper_app.batch --email operator@example.com --output drafts.jsonl
+    python -m aurachat_helper_app.batch --email operator@example.com --output drafts.jsonl \\
+        --concurrency 8 --portal-rps 2 --account 12345
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+from aurachat_helper_app.app_config import get_config
+from aurachat_helper_app.managers.draft_cache import DraftCache, draft_cache
+from aurachat_helper_app.managers.user_manager import UserManager
+from aurachat_helper_app.models.chat import Chat
+from aurachat_helper_app.services.chat_display_service import get_display_name
+from aurachat_helper_app.services.generate_message_service import GENERATE_ERROR
+from aurachat_helper_app.services.onlyfans_account_service import OnlyFansAccountService
+from aurachat_helper_app.services.service_container import ServiceContainer
+from aurachat_helper_app.utils.logger import setup_logger, get_logger
+from aurachat_helper_app.utils.rate_limiter import HostRateLimiter
+
+logger = get_logger(__name__)
+
+STATUS_OK = 'ok'
+STATUS_CACHED = 'cached'
+STATUS_ERROR = 'error'
+
+@dataclass
+class DraftJob:
+    """A chat that needs a reply drafted."""
+    account_id: str
+    chat_id: str
+    fan_name: str
+    fan_message_id: Any
+    unread_count: int
+
+class BatchRunner:
+    """Generates drafts for unread chats and streams the results to a JSONL file."""
+    
+    def __init__(self, services: ServiceContainer, output_path: str, concurrency: int = 4,
+                 drafts: Optional[DraftCache] = None):
+        """
+        Initialize the batch runner.
+        
+        Args:
+            services: Clients and services, normally rate limited per host
+            output_path: JSONL file results are appended to
+            concurrency: Maximum number of chats processed at once
+            drafts: Draft cache consulted before and filled after generating
+        """
+        self.services = services
+        self.output_path = output_path
+        self.concurrency = concurrency
+        self.drafts = drafts or draft_cache
+        self.stopping = threading.Event()
+        self.counts: Dict[str, int] = {}
+        self._write_lock = threading.Lock()
+    
+    def completed(self) -> Set[Tuple[str, str, Any]]:
+        """Chats already answered in the output file by an earlier run."""
+        done = set()
+        try:
+            with open(self.output_path, 'r', encoding='utf-8') as output:
+                for line in output:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Cut short when the previous run was killed
+                        continue
+                    if record.get('status') in (STATUS_OK, STATUS_CACHED):
+                        done.add((record['account_id'], record['chat_id'], record['fan_message_id']))
+        except FileNotFoundError:
+            pass
+        return done
+    
+    def find_jobs(self, account_id: str) -> List[DraftJob]:
+        """List an account's chats with unread fan messages (worker thread)."""
+        jobs = []
+        for chat in self.services.chat_service.get_chats_for_account(account_id):
+            if chat.unread_messages_count > 0:
+                jobs.append(DraftJob(account_id, str(chat.fan.id), get_display_name(chat.fan),
+                                     self._fan_message_id(account_id, chat), chat.unread_messages_count))
+        return jobs
+    
+    def _fan_message_id(self, account_id: str, chat: Chat) -> Any:
+        """ID of the fan message a reply would answer."""
+        if chat.last_message.from_user.get('id') == chat.fan.id:
+            return chat.last_message.id
+        message = self.services.db_client.get_last_fan_message(account_id, str(chat.fan.id))
+        return message.id if message else chat.last_message.id
+    
+    def draft(self, job: DraftJob) -> Dict[str, Any]:
+        """Generate (or reuse) the draft for a chat (worker thread)."""
+        started = time.perf_counter()
+        record = {
+            'account_id': job.account_id,
+            'chat_id': job.chat_id,
+            'fan_name': job.fan_name,
+            'fan_message_id': job.fan_message_id,
+            'unread_count': job.unread_count
+        }
+        text = self.drafts.get(job.account_id, job.chat_id, job.fan_message_id)
+        if text is not None:
+            record.update(status=STATUS_CACHED, draft=text)
+        else:
+            text = self.services.generate_message_service.generate_response(job.account_id, job.chat_id)
+            if text == GENERATE_ERROR:
+                record.update(status=STATUS_ERROR, draft=None)
+            else:
+                self.drafts.put(job.account_id, job.chat_id, job.fan_message_id, text)
+                record.update(status=STATUS_OK, draft=text)
+        record['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        record['finished_at'] = datetime.now(timezone.utc).isoformat()
+        return record
+    
+    def _write(self, output, record: Dict[str, Any]) -> None:
+        with self._write_lock:
+            output.write(json.dumps(record) + '\n')
+            output.flush()
+            self.counts[record['status']] = self.counts.get(record['status'], 0) + 1
+    
+    def run(self, account_ids: List[str]) -> Dict[str, int]:
+        """
+        Draft replies for all unread chats of the accounts.
+        
+        Returns:
+            Number of results per status
+        """
+        done = self.completed()
+        if done:
+            logger.info(f"Resuming: {len(done)} chats already answered in {self.output_path}")
+        
+        def process(job: DraftJob):
+            if self.stopping.is_set():
+                return None
+            return self.draft(job)
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='batch') as executor, \
+                open(self.output_path, 'a', encoding='utf-8') as output:
+            try:
+                pending = set()
+                for listing in as_completed([executor.submit(self.find_jobs, account_id) for account_id in account_ids]):
+                    try:
+                        jobs = listing.result()
+                    except Exception as e:
+                        logger.error(f"Error listing chats: {e}")
+                        continue
+                    for job in jobs:
+                        if (job.account_id, job.chat_id, job.fan_message_id) not in done:
+                            pending.add(executor.submit(process, job))
+                logger.info(f"Drafting replies for {len(pending)} unread chats")
+                
+                for future in as_completed(pending):
+                    try:
+                        record = future.result()
+                    except Exception as e:
+                        logger.error(f"Error drafting reply: {e}")
+                        continue
+                    if record:
+                        self._write(output, record)
+            except KeyboardInterrupt:
+                # Finished records are already on disk; the next run picks up the rest
+                logger.warning("Interrupted; stopping after the chats in progress")
+                self.stopping.set()
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise
+        return self.counts
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Draft replies for all unread chats without opening the app window")
+    parser.add_argument('--email', required=True, help="Email of the user to sign in as")
+    parser.add_argument('--output', required=True, help="JSONL file results are appended to; reused to resume")
+    parser.add_argument('--account', action='append', help="Only process this account ID (repeatable)")
+    parser.add_argument('--concurrency', type=int, default=4, help="Chats processed at once")
+    parser.add_argument('--portal-rps', type=float, default=1.0, help="Request rate limit for the AuraChat portal")
+    parser.add_argument('--api-rps', type=float, default=4.0, help="Request rate limit for the OnlyFans API")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point for headless batch mode."""
+    args = parse_args(argv)
+    setup_logger()
+    
+    user_manager = UserManager()
+    if not user_manager.sign_in(args.email):
+        logger.error(f"No user found with email {args.email}")
+        return 2
+    user = user_manager.get_current_user()
+    account_ids = [account.account_id for account in
+                   OnlyFansAccountService().get_accounts_by_ids(user.onlyfans_account_ids)]
+    if args.account:
+        account_ids = [account_id for account_id in account_ids if account_id in args.account]
+    logger.info(f"Batch mode for {user.email}: {len(account_ids)} accounts")
+    
+    config = get_config()
+    limiter = HostRateLimiter({
+        urlsplit(config.portal_url).netloc: args.portal_rps,
+        urlsplit(config.onlyfansapi_base_url).netloc: args.api_rps
+    })
+    services = ServiceContainer(config=config, rate_limiter=limiter)
+    runner = BatchRunner(services, args.output, concurrency=args.concurrency)
+    started = time.perf_counter()
+    try:
+        counts = runner.run(account_ids)
+    except KeyboardInterrupt:
+        logger.info(f"Stopped; results so far: {runner.counts}")
+        return 130
+    finally:
+        services.shutdown()
+    logger.info(f"Batch finished in {time.perf_counter() - started:.1f}s: {counts}")
+    return 0 if not counts.get(STATUS_ERROR) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -1,17 +1,28 @@
 from aurachat_helper_app.views.chats_view import ChatsView
 from aurachat_helper_app.views.components.chat_cell_view import ChatCellView
 from aurachat_helper_app.views.components.selected_chat_cell_view import SelectedChatCellView
-from aurachat_helper_app.services.chat_service import ChatService
-from aurachat_helper_app.services.message_service import MessageService
-from aurachat_helper_app.services.generate_message_service import GenerateMessageService
+from aurachat_helper_app.services.service_container import ServiceContainer
+from aurachat_helper_app.services.outbound_queue import (OP_GENERATE, OP_SYNC, PRIORITY_PREFETCH, STATUS_DONE,
+                                                          STATUS_FAILED, STATUS_SENDING, STATUS_WAITING,
+                                                          OutboundRequest)
+from aurachat_helper_app.models.media_item import MediaItem
+from aurachat_helper_app.services.chat_display_service import ChatDisplayService, format_time, get_display_name
+from aurachat_helper_app.services.chat_prefetcher import LoadedChat
+from aurachat_helper_app.managers.chat_store import ChatStore
+from aurachat_helper_app.managers.triage_queue import TriageQueue
+from aurachat_helper_app.managers.session_manager import session_manager
+from aurachat_helper_app.models.chat_row import ChatRow
 from aurachat_helper_app.models.chat import Chat
-from aurachat_helper_app.api.aurachat_webportal_client import AuraChatWebPortalClient
-from aurachat_helper_app.db.db_client import db_client
+from aurachat_helper_app.utils.diagnostics import diagnostics
 from aurachat_helper_app.utils.logger import get_logger
+from aurachat_helper_app.utils.render_scheduler import RenderScheduler
+from aurachat_helper_app.utils.work_scheduler import WORK_INTERACTIVE
 import tkinter as tk
 import tkinter.messagebox as messagebox
-from datetime import datetime
-from typing import List
+import webbrowser
+from pathlib import Path
+from concurrent.futures import Future
+from typing import Dict, List, Optional
 import asyncio
 import threading
 
@@ -31,8 +42,19 @@ def get_event_loop():
 class ChatsController:
     """Controller class for managing chats."""
     
-    def __init__(self, parent, accounts_controller, account_id: str):
-        """Initialize the chats controller."""
+    # Chats ahead of the current one whose messages and drafts are prefetched in triage mode
+    TRIAGE_PREFETCH_COUNT = 3
+    
+    def __init__(self, parent, accounts_controller, account_id: str, services: ServiceContainer):
+        """
+        Initialize the chats controller.
+        
+        Args:
+            parent: The parent widget
+            accounts_controller: The accounts controller to return to
+            account_id: The OnlyFans account whose chats are shown
+            services: Clients and services shared by the session's controllers
+        """
         try:
             logger.info(f"Initializing chats controller for account: {account_id}")
             self.parent = parent
@@ -42,20 +64,63 @@ class ChatsController:
             logger.debug("Creating ChatsView")
             self.view = ChatsView(parent)
             self.chats: List[Chat] = []
+            self.chat_store = ChatStore()
             self.selected_chat = None
+            self.fan_message_id = None
+            self.draft_history: List[str] = []
+            self.draft_index = 0
+            self.triage = TriageQueue()
+            self.triage_enabled = False
             
             logger.debug("Initializing services")
-            self.chat_service = ChatService()
-            self.message_service = MessageService()
-            self.generate_message_service = GenerateMessageService()
-            self.webportal_client = AuraChatWebPortalClient()
-            self.db_client = db_client
+            self.services = services
+            self.chat_service = services.chat_service
+            self.message_service = services.message_service
+            self.generate_message_service = services.generate_message_service
+            self.message_sync_service = services.message_sync_service
+            self.search_service = services.search_service
+            self.chat_display_service = ChatDisplayService()
+            self.dispatcher = services.dispatcher
+            self.render_scheduler = RenderScheduler(self.view.chats_frame)
+            self.image_service = services.image_service
+            self.media_service = services.media_service
+            self.media_session = None
+            self.account_sync_service = services.account_sync_service
+            self.account_sync_job = None
+            self.outbound_queue = services.outbound_queue
+            self.chat_prefetcher = services.chat_prefetcher
+            self.work_scheduler = services.work_scheduler
+            # Latest chat list and message loads; older ones finishing late are ignored
+            self.chats_future: Optional[Future] = None
+            self.messages_future: Optional[Future] = None
+            self.pending_chat_id: Optional[str] = None  # Chat to select once the chat list arrives
+            self.queue_statuses: Dict[str, str] = {}  # Status text of queued portal requests by chat ID
+            self.webportal_client = services.webportal_client
+            self.db_client = services.db_client
             
             # Set up commands
             logger.debug("Setting up view commands")
             self.view.set_back_command(self.handle_back)
             self.view.set_generate_command(self.handle_generate)
+            self.view.set_regenerate_command(self.handle_regenerate)
+            self.view.set_draft_history_command(self.handle_draft_history)
             self.view.set_sync_command(self.handle_sync)
+            self.view.set_account_sync_command(self.handle_account_sync)
+            self.view.set_account_sync_cancel_command(self.handle_account_sync_cancel)
+            self.view.set_search_command(self.handle_search)
+            self.view.set_sort_filter_command(self.handle_sort_filter)
+            self.view.set_triage_command(self.handle_triage_toggle)
+            self.view.set_triage_step_command(self.handle_triage_step)
+            self.view.set_avatar_loader(self.image_service.load)
+            
+            # Show and follow the portal requests queued for this account
+            for request in self.outbound_queue.pending(self.account_id):
+                self.queue_statuses[request.chat_id] = self._queue_status_text(request)
+            self._queue_listener = lambda request, result: self.dispatcher.call_soon(
+                self._show_queue_update, request, result)
+            self.outbound_queue.add_listener(self._queue_listener)
+            diagnostics.track(self)
+            diagnostics.track(self.view)
             
         except Exception as e:
             logger.exception("Error initializing ChatsController")
@@ -72,18 +137,7 @@ class ChatsController:
         Returns:
             Formatted time string (e.g., "Feb 3 12:34 PM")
         """
-        if not iso_time:
-            return ''
-        try:
-            # If it's already a datetime object, use it directly
-            if isinstance(iso_time, datetime):
-                return iso_time.strftime('%b %d %I:%M %p')
-                
-            # Otherwise parse the string
-            dt = datetime.fromisoformat(iso_time.replace('Z', '+00:00'))
-            return dt.strftime('%b %d %I:%M %p')
-        except (ValueError, TypeError):
-            return iso_time  # Return the original string if parsing fails
+        return format_time(iso_time)
         
     def get_display_name(self, chat: Chat) -> str:
         """
@@ -95,128 +149,475 @@ class ChatsController:
         Returns:
             The best available display name in order: display_name → name → username
         """
-        # Check display_name first
-        if chat.fan.display_name and chat.fan.display_name.strip():
-            return chat.fan.display_name
-            
-        # Then check name
-        if chat.fan.name and chat.fan.name.strip():
-            return chat.fan.name
-            
-        # Finally check username
-        if chat.fan.username and chat.fan.username.strip():
-            return chat.fan.username
-            
-        # If we get here, all fields are empty or None
-        print(f"Warning: No display name found for chat with fan ID {chat.fan.id}")
-        return "Unknown User"
+        return get_display_name(chat.fan)
         
     def handle_chat_click(self, chat: Chat):
         """Handle chat cell click event."""
         print(f"Chat clicked - Fan ID: {chat.fan.id}, Display Name: {self.get_display_name(chat)}")
         self.selected_chat = chat
+        session_manager.set_last_chat(str(chat.fan.id))
+        self._reset_media_session()
+        # The chat list can be ahead of the stored messages: its last message may be a newer fan message
+        from_fan = chat.last_message.from_user.get('id') == chat.fan.id
+        self.fan_message_id = chat.last_message.id if from_fan else None
+        if self.triage_enabled:
+            self.triage.select(chat.fan.id)
+            self._prefetch_upcoming()
+        loaded = self.chat_prefetcher.take(self.account_id, chat)
+        if loaded:
+            # Prefetched by triage mode: no database round trips
+            self._show_loaded_chat(chat, loaded)
+            return
         
         # Format display info with default values first
         display_info = {
             'display_name': self.get_display_name(chat),
+            'avatar_url': chat.fan.avatar,
             'last_message': '',  # Use empty string instead of None
             'last_message_time': self.format_time(chat.last_message.created_at)
         }
         print(f"Setting selected chat with display info: {display_info}")
         self.view.set_selected_chat(display_info)
         
-        # Schedule database call to run after current event is processed
-        self.parent.after_idle(self._fetch_messages, chat)
+        # Show the last draft right away if the chat list already has the fan's last message
+        self._show_cached_draft()
+        
+        self._fetch_messages(chat)
         
     def _fetch_messages(self, chat: Chat):
-        """Fetch messages from database and update display."""
-        messages = self.db_client.get_chat_messages(self.account_id, str(chat.fan.id))
-        if messages:
-            # Get the last message from the fan
-            last_fan_message = self.message_service.get_last_fan_message(messages, str(chat.fan.id))
+        """Load a chat's messages on a worker and update the display when they arrive."""
+        future = self.work_scheduler.submit(WORK_INTERACTIVE, self.chat_prefetcher.load, self.account_id, chat,
+                                            account_id=self.account_id, group='chats')
+        self.messages_future = future
+        future.add_done_callback(lambda done: self.dispatcher.call_soon(self._show_fetched_messages, chat, done))
+        
+    def _show_fetched_messages(self, chat: Chat, future: Future):
+        """Show a finished message load unless another chat has been opened since (Tk thread)."""
+        if future is not self.messages_future or future.cancelled():
+            return
+        self.messages_future = None
+        try:
+            loaded = future.result()
+        except Exception as e:
+            logger.error(f"Error loading messages for chat {chat.fan.id}: {e}")
+            return
+        self._show_loaded_chat(chat, loaded)
+        
+    def _show_loaded_chat(self, chat: Chat, loaded: LoadedChat):
+        """Show a chat's last fan message, cached draft and media."""
+        if loaded.messages:
+            last_fan_message = loaded.last_fan_message
             
             # Update the display with the last fan message
             display_info = {
                 'display_name': self.get_display_name(chat),
+                'avatar_url': chat.fan.avatar,
                 'last_message': last_fan_message.content if last_fan_message else 'No messages from fan',
                 'last_message_time': self.format_time(last_fan_message.timestamp) if last_fan_message else ''
             }
             self.view.set_selected_chat(display_info)
+            if last_fan_message and (self.fan_message_id is None or last_fan_message.id > self.fan_message_id):
+                # Drafts answering an older fan message are stale
+                self.fan_message_id = last_fan_message.id
+                self.generate_message_service.invalidate_drafts(self.account_id, str(chat.fan.id), self.fan_message_id)
+            self._show_cached_draft()
+            if last_fan_message and last_fan_message.media:
+                self._show_media(last_fan_message.media)
         else:
             # Show message to sync when no messages found
             display_info = {
                 'display_name': self.get_display_name(chat),
+                'avatar_url': chat.fan.avatar,
                 'last_message': 'Please press Sync',
                 'last_message_time': ''
             }
             self.view.set_selected_chat(display_info)
+            self._show_cached_draft()
+        
+    def _show_cached_draft(self):
+        """Show the selected chat's latest cached draft for its last fan message, if any."""
+        self.draft_history = []
+        if self.selected_chat and self.fan_message_id is not None:
+            self.draft_history = self.generate_message_service.draft_history(
+                self.account_id, str(self.selected_chat.fan.id), self.fan_message_id)
+        self.draft_index = len(self.draft_history) - 1
+        if self.draft_history:
+            self.view.set_response_text(self.draft_history[-1])
+            self.view.set_draft_position(self.draft_index, len(self.draft_history))
+        
+    def _reset_media_session(self):
+        """Cancel media work for the previously selected chat and start a new session."""
+        if self.media_session:
+            self.media_session.close()
+        self.media_session = self.media_service.open_session()
+        
+    def _media_label(self, item: MediaItem) -> str:
+        """Describe a media item before its thumbnail has loaded."""
+        label = (item.type or 'media').capitalize()
+        if item.is_video and item.duration:
+            label += f" {item.duration // 60}:{item.duration % 60:02d}"
+        return label if item.can_view else f"{label} (locked)"
+        
+    def _show_media(self, items: List[MediaItem]):
+        """Show media metadata in the selected chat; thumbnails load when the strip is displayed."""
+        session = self.media_session
+        
+        def load_thumbnail(index, size, callback):
+            if items[index].can_view:
+                session.load_thumbnail(items[index], size, callback)
+                
+        self.view.set_selected_media([{'label': self._media_label(item)} for item in items],
+                                     load_thumbnail,
+                                     lambda index: self._open_media(session, items[index]))
+        
+    def _open_media(self, session, item: MediaItem):
+        """Download a media item to the cache in the background and open it in the system viewer."""
+        if not item.can_view:
+            return
+        print(f"Opening media {item.id} ({item.type})")
+        session.open_full(
+            item,
+            lambda path: self.dispatcher.call_soon(webbrowser.open, Path(path).as_uri()),
+            lambda error: self.dispatcher.call_soon(messagebox.showerror, "Error", f"Failed to download media: {error}")
+        )
+        
+    def select_chat(self, chat_id: str) -> bool:
+        """
+        Select a chat by fan ID, e.g. when restoring the last workspace.
+        
+        Returns:
+            True if the chat is in the loaded chat list and was selected
+        """
+        try:
+            chat = self.chat_store.get(int(chat_id))
+        except (TypeError, ValueError):
+            chat = None
+        if chat is None:
+            logger.info(f"Chat {chat_id} is not in the chat list for account {self.account_id}")
+            return False
+        self.handle_chat_click(chat)
+        return True
+        
+    def select_chat_when_loaded(self, chat_id: str):
+        """Select a chat by fan ID now, or once the chat list being fetched has arrived."""
+        if self.chats_future is None:
+            self.select_chat(chat_id)
+        else:
+            self.pending_chat_id = chat_id
         
     def handle_sync(self):
-        """Handle sync button click."""
+        """Handle sync button click: queue a portal sync, kept until it gets through."""
         if self.selected_chat:
-            response = self.webportal_client.sync_messages(self.account_id, str(self.selected_chat.fan.id))
-            if response:
-                # Fetch and display messages for the selected chat
-                self._fetch_messages(self.selected_chat)
-                self.fetch_and_display_chats()
-            else:
-                print("Sync failed")
+            self.outbound_queue.enqueue(OP_SYNC, self.account_id, str(self.selected_chat.fan.id))
+            
+    def _queue_status_text(self, request: OutboundRequest) -> str:
+        """Chat cell text for a queued portal request."""
+        action = 'Sync' if request.kind == OP_SYNC else 'Generate'
+        if request.status == STATUS_SENDING:
+            return 'Syncing…' if request.kind == OP_SYNC else 'Generating…'
+        if request.status == STATUS_WAITING:
+            return f"{action} waiting for network" if not self.outbound_queue.online else f"{action} retrying"
+        if request.status == STATUS_FAILED:
+            return f"{action} failed"
+        if request.status == STATUS_DONE:
+            return ''
+        return f"{action} queued"
+        
+    def _show_queue_update(self, request: OutboundRequest, result: Optional[str]):
+        """Show a queued request's progress and apply its result (Tk thread)."""
+        if request.account_id != self.account_id or self.outbound_queue is None:
+            return
+        text = self._queue_status_text(request)
+        if text:
+            self.queue_statuses[request.chat_id] = text
+        else:
+            self.queue_statuses.pop(request.chat_id, None)
+        self.view.set_chat_status(request.chat_id, text)
+        if (request.status == STATUS_DONE and request.kind == OP_GENERATE
+                and request.priority < PRIORITY_PREFETCH and self.triage_enabled):
+            # The operator's own draft is ready, so the chat has been handled; prefetched
+            # drafts are for chats still ahead in the queue
+            self.triage.remove(int(request.chat_id))
+            self._show_triage_status()
+        
+        selected = self.selected_chat and str(self.selected_chat.fan.id) == request.chat_id
+        if request.status != STATUS_DONE or not selected:
+            return
+        if request.kind == OP_SYNC:
+            # Fetch and display messages for the selected chat
+            self._fetch_messages(self.selected_chat)
+            self.fetch_and_display_chats()
+        elif request.fan_message_id is not None and request.fan_message_id == self.fan_message_id:
+            self._show_cached_draft()
+        elif request.fan_message_id is None and result:
+            self.view.set_response_text(result)
+            
+    def _with_queue_status(self, display_info: dict, chat_id: str) -> dict:
+        """Add the chat ID and any queued request's status to a chat cell's display info."""
+        display_info['chat_id'] = chat_id
+        display_info['status'] = self.queue_statuses.get(chat_id, '')
+        return display_info
                 
-    def handle_generate(self):
-        """Handle generate button click."""
+    def handle_account_sync(self, stale_only: bool):
+        """Sync all (or only stale) chats of the account in the background."""
+        if self.account_sync_job or not self.chats:
+            return
+        self.account_sync_job = self.account_sync_service.start(
+            self.account_id, list(self.chats), stale_only,
+            lambda job, progress: self.dispatcher.call_soon(self._show_account_sync_progress, job, progress),
+            lambda job, progress: self.dispatcher.call_soon(self._finish_account_sync, job, progress)
+        )
+        self.view.show_account_sync_progress(0, len(self.chats))
+            
+    def handle_account_sync_cancel(self):
+        """Stop the running account sync after the chats in flight."""
+        if self.account_sync_job:
+            logger.info(f"Cancelling account sync for {self.account_id}")
+            self.account_sync_job.cancel()
+            
+    def _show_account_sync_progress(self, job, progress):
+        """Update the account sync progress (Tk thread)."""
+        if job is self.account_sync_job and not progress.finished:
+            self.view.show_account_sync_progress(progress.done, progress.total, progress.failed)
+            
+    def _finish_account_sync(self, job, progress):
+        """Refresh the chat list once an account sync ends (Tk thread)."""
+        if job is not self.account_sync_job:
+            return
+        self.account_sync_job = None
+        message = f"Synced {progress.synced} chats"
+        if progress.failed:
+            message += f", {progress.failed} failed"
+        if progress.cancelled:
+            message += " (cancelled)"
+        logger.info(f"Account sync for {self.account_id} finished: {progress}")
+        self.view.finish_account_sync(message)
+        if progress.synced:
+            if self.selected_chat:
+                self._fetch_messages(self.selected_chat)
+            self.fetch_and_display_chats()
+            
+    def handle_generate(self, regenerate: bool = False):
+        """
+        Handle generate button click.
+        
+        Reuses the cached draft for the fan's last message unless regenerating;
+        otherwise queues a generate request, whose draft is shown when it arrives.
+        """
         if self.selected_chat:
             print("Generate clicked for chat:", self.selected_chat.fan.id)
-            response = self.generate_message_service.generate_response(self.account_id, str(self.selected_chat.fan.id))
-            if response != 'Generate response error':
-                print("Generated response:", response)
-                self.view.set_response_text(response)
-            else:
-                print("Failed to generate response")
+            chat_id = str(self.selected_chat.fan.id)
+            if not regenerate and self.fan_message_id is not None and self.generate_message_service.draft_history(
+                    self.account_id, chat_id, self.fan_message_id):
+                print("Using cached draft")
+                self._show_cached_draft()
+                return
+            self.outbound_queue.enqueue(OP_GENERATE, self.account_id, chat_id, self.fan_message_id)
+                    
+    def handle_regenerate(self):
+        """Handle regenerate button click: always ask the portal for a new draft."""
+        self.handle_generate(regenerate=True)
+        
+    def handle_draft_history(self):
+        """Show the previous draft for the selected chat, wrapping around to the latest."""
+        if len(self.draft_history) > 1:
+            self.draft_index = (self.draft_index - 1) % len(self.draft_history)
+            self.view.set_response_text(self.draft_history[self.draft_index])
+            self.view.set_draft_position(self.draft_index, len(self.draft_history))
         
     def handle_back(self):
         """Handle back button click."""
+        if self.media_session:
+            self.media_session.close()
+            self.media_session = None
+        session_manager.set_last_account(None)
         self.view.frame.pack_forget()  # Hide chats view
         self.accounts_controller.pack(expand=True, fill=tk.BOTH)  # Show accounts view
         
-    def add_chat(self, chat: Chat):
-        """Add a chat to the list and display."""
-        print(f"Adding chat - Fan ID: {chat.fan.id}, Display Name: {self.get_display_name(chat)}")
-        self.chats.append(chat)
+    def handle_triage_toggle(self, enabled: bool):
+        """Turn triage mode on or off."""
+        self.triage_enabled = enabled
+        if not enabled:
+            self.chat_prefetcher.clear()
+            return
+        self.triage.load(self.chats)
+        if self.selected_chat:
+            self.triage.select(self.selected_chat.fan.id)
+        self._prefetch_upcoming()
+        self._show_triage_status()
         
-        # Format display info
-        display_info = {
-            'display_name': self.get_display_name(chat),
-            'last_message': chat.last_message.text,
-            'last_message_time': self.format_time(chat.last_message.created_at)
-        }
-        print(f"Adding chat cell with display info: {display_info}")
-        self.view.add_chat(display_info, lambda: self.handle_chat_click(chat))
+    def handle_triage_step(self, step: int):
+        """Open the next (1) or previous (-1) chat that needs a reply."""
+        chat = self.triage.next() if step > 0 else self.triage.previous()
+        if chat is None:
+            self.view.set_triage_status("No more chats waiting" if step > 0 else "At the first chat")
+            return
+        self.handle_chat_click(chat)
+        self._show_triage_status()
+        
+    def _prefetch_upcoming(self):
+        """Load the next chats in the triage queue and queue their drafts in the background."""
+        self.chat_prefetcher.prefetch(self.account_id, self.triage.upcoming(self.TRIAGE_PREFETCH_COUNT))
+        
+    def _show_triage_status(self):
+        """Show how many chats are waiting and where the operator is in the queue."""
+        position = self.triage.position()
+        text = f"{len(self.triage)} waiting"
+        if position:
+            text += f" · {position}/{len(self.triage)}"
+        self.view.set_triage_status(text)
+        
+    def handle_search(self, query: str):
+        """Show chats matching a search query, or all chats when the query is empty."""
+        self.view.clear_chats()
+        query = query.strip()
+        if not query:
+            self.display_chats()
+            return
+            
+        # Drop any chat list cells still being rendered
+        self.render_scheduler.cancel()
+        results = self.search_service.search(query, self.account_id)
+        logger.info(f"Search '{query}' returned {len(results)} results")
+        chats_by_id = {str(chat.fan.id): chat for chat in self.chats}
+        for result in results:
+            chat = chats_by_id.get(result.chat_id)
+            if chat is None:
+                # Indexed chat that is not in the current page of the chat list
+                chat = Chat.from_dict({'id': int(result.chat_id), 'displayName': result.display_name})
+            display_info = {
+                'display_name': result.display_name or self.get_display_name(chat),
+                'last_message': result.snippet,
+                'last_message_time': self.format_time(result.timestamp)
+            }
+            self._with_queue_status(display_info, result.chat_id)
+            self.view.add_chat(display_info, lambda chat=chat: self.handle_chat_click(chat))
             
+    def handle_sort_filter(self, sort_key: str, descending: bool, filter_name: Optional[str]):
+        """Re-order the chat list for a new sort or filter selection."""
+        logger.info(f"Sorting chats by {sort_key} (descending={descending}), filter={filter_name}")
+        self.display_chats()
+        
+    def display_chats(self):
+        """Show the stored chats in the order and filter selected in the view."""
+        sort_key, descending, filter_name = self.view.get_sort_filter()
+        chats = list(self.chat_store.query(sort_key, descending, filter_name))
+        self.view.clear_chats()
+        
+        # Cells are added a frame's worth at a time, the first screenful at once
+        visible_rows = self.view.visible_rows()
+        task = self.render_scheduler.start(self._add_chat_row, first_chunk=visible_rows)
+        rows = self.chat_display_service.get_cached_rows(chats)
+        if rows is not None:
+            task.extend(rows, last=True)
+            return
+            
+        # Build the first screenful of rows here and the rest off the main thread
+        task.extend([self.chat_display_service.get_row(chat) for chat in chats[:visible_rows]])
+        if len(chats) <= visible_rows:
+            task.finish()
+            return
+        self.chat_display_service.build_rows_async(
+            chats[visible_rows:],
+            lambda rows: self.dispatcher.call_soon(task.extend, rows),
+            lambda: self.dispatcher.call_soon(task.finish)
+        )
+        
+    def _add_chat_row(self, row: ChatRow):
+        """Add the cell for a prepared row."""
+        chat = self.chat_store.get(row.fan_id)
+        if chat is not None:
+            self.view.add_chat(self._with_queue_status(row.to_display_info(), str(row.fan_id)),
+                               lambda: self.handle_chat_click(chat))
+                
     def fetch_and_display_chats(self):
         """Fetch and display chats for the current account."""
         try:
             logger.info(f"Fetching chats for account: {self.account_id}")
             # Clear existing chats
             self.chats = []
+            self.chat_store.clear()
             self.view.clear_chats()
             
-            # Fetch and display new chats
-            chats = self.chat_service.get_chats_for_account(self.account_id)
+            # Fetch new chats on a worker and display them when they arrive
+            future = self.work_scheduler.submit(WORK_INTERACTIVE, self.chat_service.get_chats_for_account,
+                                                self.account_id, account_id=self.account_id, group='chats')
+            self.chats_future = future
+            future.add_done_callback(lambda done: self.dispatcher.call_soon(self._show_fetched_chats, done))
+        except Exception as e:
+            logger.exception("Error fetching and displaying chats")
+            messagebox.showerror("Error", f"Failed to load chats: {str(e)}")
+            
+    def _show_fetched_chats(self, future: Future):
+        """Display a finished chat list load unless a newer one has started (Tk thread)."""
+        if future is not self.chats_future or future.cancelled():
+            return
+        self.chats_future = None
+        pending_chat_id, self.pending_chat_id = self.pending_chat_id, None
+        try:
+            chats = future.result()
             logger.info(f"Found {len(chats) if chats else 0} chats")
             
             if chats:
-                for chat in chats:
-                    try:
-                        self.add_chat(chat)
-                    except Exception as e:
-                        logger.error(f"Error adding chat {chat.fan.id}: {str(e)}")
+                self.chats = chats
+                diagnostics.track_all(chats, 'Chat')
+                display_names = [self.get_display_name(chat) for chat in chats]
+                self.chat_store.load(chats, display_names)
+                self.display_chats()
+                if self.triage_enabled:
+                    # Only chats that changed are re-ranked; handled ones stay out
+                    self.triage.refresh(chats)
+                    self._show_triage_status()
+                self.search_service.index_chats(
+                    self.account_id,
+                    [(str(chat.fan.id), name) for chat, name in zip(chats, display_names)]
+                )
+                if pending_chat_id:
+                    self.select_chat(pending_chat_id)
             else:
                 logger.warning("No chats found for account")
                 
         except Exception as e:
             logger.exception("Error fetching and displaying chats")
             messagebox.showerror("Error", f"Failed to load chats: {str(e)}")
+        # The account's chats now count against the accounts controller's memory budget
+        self.accounts_controller.handle_chats_loaded(self.account_id)
                 
+    def show(self, **kwargs):
+        """Pack the view again as it was left, without refetching chats."""
+        self.view.pack(**kwargs)
+        if self.selected_chat:
+            session_manager.set_last_chat(str(self.selected_chat.fan.id))
+        diagnostics.schedule_snapshot('chats', self.parent)
+        
+    @property
+    def cached_chat_count(self) -> int:
+        """Number of chats this controller holds in memory."""
+        return len(self.chats)
+            
+    def destroy(self):
+        """Tear down the view and cancel outstanding work; the controller cannot be used afterwards."""
+        logger.debug(f"Destroying chats controller for account: {self.account_id}")
+        self.render_scheduler.cancel()  # Drop chat cells still being rendered
+        # Loads still queued are dropped; ones already running finish unseen
+        self.work_scheduler.cancel(group='chats', account_id=self.account_id)
+        self.chats_future = None
+        self.messages_future = None
+        if self.account_sync_job:
+            self.account_sync_job.cancel()
+            self.account_sync_job = None
+        if self.media_session:
+            self.media_session.close()
+            self.media_session = None
+        # Queued requests keep going; this controller just stops following them
+        self.outbound_queue.remove_listener(self._queue_listener)
+        self.outbound_queue = None
+        self.chats = []
+        self.chat_store.clear()
+        self.chat_display_service.invalidate()
+        self.selected_chat = None
+        self.view.destroy()
+        
     def pack(self, **kwargs):
         """Pack the view into its parent and fetch chats."""
         try:
@@ -227,6 +628,7 @@ class ChatsController:
             # Fetch and display chats
             logger.debug("Starting chat fetch")
             self.fetch_and_display_chats()
+            diagnostics.schedule_snapshot('chats', self.parent)
         except Exception as e:
             logger.exception("Error in pack method")
             messagebox.showerror("Error", f"An error occurred while loading the chat view: {str(e)}")
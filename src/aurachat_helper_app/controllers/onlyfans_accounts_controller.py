@@ -2,27 +2,56 @@ from aurachat_helper_app.views.onlyfans_accounts_view import OnlyFansAccountsVie
 from aurachat_helper_app.views.components.onlyfans_account_cell_view import OnlyFansAccountCellView
 from aurachat_helper_app.controllers.chats_controller import ChatsController
 from aurachat_helper_app.managers.onlyfans_account_manager import OnlyFansAccountManager
+from aurachat_helper_app.managers.session_manager import session_manager
 from aurachat_helper_app.models.onlyfans_account import OnlyFansAccount
+from aurachat_helper_app.services.service_container import ServiceContainer
+from aurachat_helper_app.utils.diagnostics import diagnostics
 from aurachat_helper_app.utils.logger import get_logger
 import tkinter.messagebox as messagebox
 import tkinter as tk
+from collections import OrderedDict
+from typing import List, Optional
 
 logger = get_logger(__name__)
 
 class OnlyFansAccountsController:
     """Controller class for managing OnlyFans accounts."""
     
-    def __init__(self, parent, user_manager):
-        """Initialize the OnlyFans accounts controller."""
+    # Chats controllers kept alive for recently opened accounts, and the total number
+    # of chats they may hold before the least recently used ones are destroyed
+    MAX_LIVE_CHATS_CONTROLLERS = 3
+    MAX_CACHED_CHATS = 10000
+    
+    def __init__(self, parent, user_manager, services: ServiceContainer,
+                 accounts: Optional[List[OnlyFansAccount]] = None):
+        """
+        Initialize the OnlyFans accounts controller.
+        
+        Args:
+            parent: The parent widget
+            user_manager: UserManager with the signed-in user
+            services: Clients and services shared by the session's controllers
+            accounts: Accounts from a persisted session; loaded from the database when None
+        """
         logger.info("Initializing OnlyFans accounts controller")
         self.parent = parent
         self.user_manager = user_manager
+        self.services = services
+        # Flush portal requests left queued by an earlier run
+        self.services.outbound_queue.start()
         self.view = OnlyFansAccountsView(parent)
         self.account_manager = OnlyFansAccountManager()
+        self.chats_controllers: 'OrderedDict[str, ChatsController]' = OrderedDict()
+        self.chats_controller = None
+        diagnostics.track(self)
+        diagnostics.track(self.view)
         
         # Add user's OnlyFans accounts
         current_user = self.user_manager.get_current_user()
-        if current_user and current_user.onlyfans_account_ids:
+        if accounts is not None:
+            logger.info(f"Restoring {len(accounts)} accounts from the persisted session")
+            self.set_accounts(accounts)
+        elif current_user and current_user.onlyfans_account_ids:
             logger.debug(f"Loading accounts for user with {len(current_user.onlyfans_account_ids)} account IDs")
             self.account_manager.load_accounts_from_ids(current_user.onlyfans_account_ids)
             # Display loaded accounts
@@ -30,6 +59,7 @@ class OnlyFansAccountsController:
             logger.info(f"Loaded {len(accounts)} accounts")
             for account in accounts:
                 self.add_account(account)
+            session_manager.save_workspace(current_user, accounts)
         else:
             logger.warning("No accounts found for current user")
         
@@ -37,17 +67,84 @@ class OnlyFansAccountsController:
         """Handle account cell click event."""
         try:
             logger.info(f"Account clicked: {account_info}")
+            session_manager.set_last_account(account_info['id'])
             self.view.frame.pack_forget()  # Hide accounts view
+            controller = self.chats_controllers.pop(account_info['id'], None)
+            if controller is not None:
+                # Recently used account: show the live view as it was left
+                logger.debug("Reusing chats controller")
+                self.chats_controllers[account_info['id']] = controller
+                self.chats_controller = controller
+                controller.show(expand=True, fill=tk.BOTH)
+                return
+                
             logger.debug("Creating chats controller")
-            self.chats_controller = ChatsController(self.parent, self, account_info['id'])
+            self.chats_controller = ChatsController(self.parent, self, account_info['id'], self.services)
+            self.chats_controllers[account_info['id']] = self.chats_controller
             logger.debug("Packing chats controller")
             self.chats_controller.pack(expand=True, fill=tk.BOTH)
+            # The chats load in the background; handle_chats_loaded checks the chat budget
+            # again once they have arrived
+            self._evict_chats_controllers()
         except Exception as e:
             logger.exception(f"Error handling account click for account {account_info}")
             messagebox.showerror("Error", f"An error occurred while loading chats: {str(e)}")
             # Try to recover by showing accounts view again
             self.view.pack(expand=True, fill=tk.BOTH)
         
+    def handle_chats_loaded(self, account_id: str):
+        """Check the memory budget once an account's chat list has been (re)loaded."""
+        if account_id in self.chats_controllers:
+            self._evict_chats_controllers()
+            
+    def _evict_chats_controllers(self):
+        """Destroy the least recently used chats controllers beyond the pool size or chat budget."""
+        def over_budget():
+            cached_chats = sum(controller.cached_chat_count for controller in self.chats_controllers.values())
+            return (len(self.chats_controllers) > self.MAX_LIVE_CHATS_CONTROLLERS
+                    or cached_chats > self.MAX_CACHED_CHATS)
+        
+        # The open account is the most recently used, so it is only reached when it is alone
+        while len(self.chats_controllers) > 1 and over_budget():
+            account_id, controller = self.chats_controllers.popitem(last=False)
+            logger.debug(f"Evicting chats controller for account {account_id} ({controller.cached_chat_count} chats)")
+            controller.destroy()
+            
+    def set_accounts(self, accounts: List[OnlyFansAccount]):
+        """Replace the displayed accounts, e.g. after revalidating a restored session."""
+        account_ids = {account.account_id for account in accounts}
+        for account_id in [account_id for account_id in self.chats_controllers if account_id not in account_ids]:
+            controller = self.chats_controllers.pop(account_id)
+            if controller is self.chats_controller:
+                controller.handle_back()
+                self.chats_controller = None
+            controller.destroy()
+        self.account_manager.clear_accounts()
+        self.view.clear_accounts()
+        for account in accounts:
+            self.account_manager.add_account(account)
+            self.add_account(account)
+            
+    def open_account(self, account_id: str, chat_id: Optional[str] = None) -> bool:
+        """
+        Open an account's chats directly, optionally selecting a chat.
+        
+        Args:
+            account_id: The account to open
+            chat_id: Fan ID of the chat to select once the chats have loaded
+            
+        Returns:
+            True if the account is one of the user's accounts and was opened
+        """
+        account = next((account for account in self.account_manager.get_accounts()
+                        if account.account_id == account_id), None)
+        if account is None:
+            return False
+        self.handle_account_click({'username': account.name, 'id': account.account_id})
+        if chat_id and self.chats_controller:
+            self.chats_controller.select_chat_when_loaded(chat_id)
+        return True
+        
     def add_account(self, account: OnlyFansAccount):
         """Add an account to the view."""
         try:
@@ -57,7 +154,16 @@ class OnlyFansAccountsController:
         except Exception as e:
             logger.exception(f"Error adding account {account.account_id} to view")
             
+    def destroy(self):
+        """Destroy the pooled chats controllers and the accounts view."""
+        for controller in self.chats_controllers.values():
+            controller.destroy()
+        self.chats_controllers.clear()
+        self.chats_controller = None
+        self.view.frame.destroy()
+        
     def pack(self, **kwargs):
         """Pack the view into its parent."""
         logger.debug("Packing accounts view")
-        self.view.pack(**kwargs) 
\ No newline at end of file
+        self.view.pack(**kwargs)
+        diagnostics.schedule_snapshot('accounts', self.parent) 
\ No newline at end of file
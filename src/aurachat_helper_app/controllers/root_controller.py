@@ -1,7 +1,21 @@
 from aurachat_helper_app.views.root_view import RootView
 from aurachat_helper_app.controllers.signin_controller import SignInController
 from aurachat_helper_app.controllers.onlyfans_accounts_controller import OnlyFansAccountsController
+from aurachat_helper_app.managers.user_manager import UserManager
+from aurachat_helper_app.managers.session_manager import session_manager
+from aurachat_helper_app.services.onlyfans_account_service import OnlyFansAccountService
+from aurachat_helper_app.services.service_container import ServiceContainer
+from aurachat_helper_app.db.db_client import db_client
+from aurachat_helper_app.db.mongo_health import MongoHealth, mongo_health, STATUS_HEALTHY, STATUS_SLOW
+from aurachat_helper_app.models.user import User
+from aurachat_helper_app.utils.logger import get_logger
+from aurachat_helper_app.utils.stall_watchdog import StallWatchdog
+from aurachat_helper_app.utils.ui_dispatcher import get_ui_dispatcher
+from aurachat_helper_app.utils.work_scheduler import WORK_BACKGROUND
 import tkinter as tk
+import tkinter.messagebox as messagebox
+
+logger = get_logger(__name__)
 
 class RootController:
     """Root controller class for handling the main application logic."""
@@ -10,24 +24,117 @@ class RootController:
         """Initialize the root controller with its view."""
         self.view = RootView()
         self.view.set_signout_command(self.handle_signout)
-        self.show_signin()
-        
+        self.dispatcher = get_ui_dispatcher(self.view.root)
+        # Connect to the database while the first screen is built
+        mongo_health.add_listener(lambda health: self.dispatcher.call_soon(self._show_db_health, health))
+        mongo_health.start()
+        self.services = ServiceContainer(self.view.root)
+        # Watches the Tk event loop for the life of the window, across sign-outs
+        self.watchdog = None
+        if self.services.config.stall_threshold_ms > 0:
+            self.watchdog = StallWatchdog(self.view.root, self.services.config.stall_threshold_ms)
+            self.watchdog.start()
+        session = session_manager.load()
+        if not session or not self.restore_session(session):
+            self.show_signin()
+    
     def show_signin(self):
         """Show the sign-in view."""
-        self.signin_controller = SignInController(self.view.root)
+        self.signin_controller = SignInController(self.view.root, self.services)
         self.signin_controller.pack(expand=True)
+    
+    def restore_session(self, session: dict) -> bool:
+        """
+        Jump straight back to the persisted workspace, then revalidate it in the background.
+        
+        Args:
+            session: Session dict from the session manager
+        
+        Returns:
+            True if the workspace was restored
+        """
+        try:
+            user = session_manager.get_user(session)
+            accounts = session_manager.get_accounts(session)
+            logger.info(f"Restoring session for {user.email} with {len(accounts)} accounts")
+            
+            user_manager = UserManager()
+            user_manager.restore(user)
+            self.accounts_controller = OnlyFansAccountsController(self.view.root, user_manager, self.services,
+                                                                  accounts=accounts)
+            
+            last_account_id = session.get('last_account_id')
+            if not last_account_id or not self.accounts_controller.open_account(last_account_id, session.get('last_chat_id')):
+                self.accounts_controller.pack(expand=True, fill=tk.BOTH)
+        except Exception as e:
+            logger.exception("Error restoring session")
+            session_manager.clear()
+            self.view.clear_content()
+            return False
+        
+        self.services.work_scheduler.submit(WORK_BACKGROUND, self._revalidate_session, user, accounts)
+        return True
+    
+    def _revalidate_session(self, user: User, accounts: list):
+        """Check the restored user and accounts against the database (worker thread)."""
+        try:
+            user_data = db_client.get_user_by_email(user.email)
+            fresh_user = User.from_dict(user_data) if user_data else None
+            fresh_accounts = OnlyFansAccountService().get_accounts_by_ids(fresh_user.onlyfans_account_ids) if fresh_user else []
+        except Exception as e:
+            # Offline or database unavailable: keep working from the snapshot
+            logger.warning(f"Could not revalidate session: {e}")
+            return
+        self.dispatcher.call_soon(self._apply_revalidation, user, accounts, fresh_user, fresh_accounts)
+    
+    def _apply_revalidation(self, user: User, accounts: list, fresh_user, fresh_accounts: list):
+        """Update the restored workspace with revalidated data (Tk thread)."""
+        accounts_controller = getattr(self, 'accounts_controller', None)
+        if accounts_controller is None or accounts_controller.user_manager.get_current_user() is not user:
+            # Signed out or signed in again since the restore
+            return
+        if fresh_user is None:
+            logger.warning(f"User {user.email} no longer exists; signing out")
+            messagebox.showerror("Session Expired", "Your account could not be found. Please sign in again.")
+            self.handle_signout()
+            return
         
+        accounts_controller.user_manager.restore(fresh_user)
+        if fresh_accounts != accounts:
+            logger.info(f"Accounts changed since the session was saved ({len(accounts)} -> {len(fresh_accounts)})")
+            accounts_controller.set_accounts(fresh_accounts)
+        session_manager.save_workspace(fresh_user, fresh_accounts, renew=False)
+    
+    def _show_db_health(self, health: MongoHealth):
+        """Show the database health in the status bar (Tk thread)."""
+        if health.status in (STATUS_HEALTHY, STATUS_SLOW):
+            color = '#4CAF50' if health.status == STATUS_HEALTHY else '#FFA500'
+            self.view.set_db_status(f"Database: {health.rtt_ms:.0f} ms", color)
+        elif health.rtt_ms is None and health.error:
+            self.view.set_db_status("Database: unavailable", '#F44336')
+        else:
+            self.view.set_db_status("Database: connecting…")
+            
     def handle_signout(self):
         """Handle sign-out action."""
-        # Clear any existing views
-        for widget in self.view.root.winfo_children():
-            if isinstance(widget, tk.Menu):
-                continue  # Don't destroy the menu
-            widget.pack_forget()
-            
+        session_manager.clear()
+        if getattr(self, 'accounts_controller', None):
+            self.accounts_controller.destroy()
+        if getattr(self, 'signin_controller', None):
+            self.signin_controller.destroy()
+        self.accounts_controller = None
+        self.signin_controller = None
+        
+        # Drop the signed-out session's clients, connections and caches
+        self.services.shutdown(discard_queued=True)
+        self.services = ServiceContainer(self.view.root)
+        
+        # Clear any views the controllers did not tear down themselves
+        self.view.clear_content()
+        
         # Show sign-in view
         self.show_signin()
-        
+    
     def start(self):
         """Start the application by launching the main window."""
-        self.view.start() 
\ No newline at end of file
+        self.view.start()
\ No newline at end of file
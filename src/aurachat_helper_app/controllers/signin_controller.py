@@ -3,16 +3,20 @@ import tkinter.messagebox as messagebox
 from aurachat_helper_app.controllers.onlyfans_accounts_controller import OnlyFansAccountsController
 import tkinter as tk
 from aurachat_helper_app.managers.user_manager import UserManager
+from aurachat_helper_app.utils.diagnostics import diagnostics
 
 class SignInController:
     """Sign-in controller class for handling authentication logic."""
     
-    def __init__(self, parent):
-        """Initialize the sign-in controller with its view."""
+    def __init__(self, parent, services):
+        """Initialize the sign-in controller with its view and the session's shared services."""
         self.parent = parent
+        self.services = services
         self.view = SignInView(parent)
         self.view.signin_button.config(command=self.handle_signin)
         self.user_manager = UserManager()
+        self.accounts_controller = None
+        diagnostics.track(self)
         print("SignInController: Initialized")
         
     def handle_signin(self):
@@ -37,12 +41,22 @@ class SignInController:
             print("SignInController: Sign in successful, showing accounts view")
             # Show OnlyFans accounts view
             self.view.frame.pack_forget()  # Hide sign-in view
-            self.accounts_controller = OnlyFansAccountsController(self.parent, self.user_manager)
+            self.accounts_controller = OnlyFansAccountsController(self.parent, self.user_manager, self.services)
             self.accounts_controller.pack(expand=True, fill=tk.BOTH)
+            # The sign-in form is not shown again until sign-out creates a new one
+            self.view.frame.destroy()
         except Exception as e:
             print(f"SignInController: Error during sign in: {e}")
             messagebox.showerror("Sign In Error", f"An error occurred: {str(e)}")
         
     def pack(self, **kwargs):
         """Pack the sign-in view into its parent."""
-        self.view.pack(**kwargs) 
\ No newline at end of file
+        self.view.pack(**kwargs)
+        diagnostics.schedule_snapshot('signin', self.parent)
+        
+    def destroy(self):
+        """Destroy the signed-in accounts controller, if any, and the sign-in view."""
+        if self.accounts_controller:
+            self.accounts_controller.destroy()
+            self.accounts_controller = None
+        self.view.frame.destroy() 
\ No newline at end of file
@@ -1,32 +1,54 @@
-from pymongo import MongoClient
+import time
+from pymongo import MongoClient, ReadPreference, UpdateOne
 from typing import Optional, Dict, Any, List
-import os
-from dotenv import load_dotenv
 import sys
 import ssl
 from datetime import datetime
 from ..models.message import Message
-from ..env_config import MONGODB_URI
+from ..models.message_history import MessageHistory
+from ..models.media_item import MediaItem
+from ..app_config import get_config
 
-# Load .env file if it exists (for development)
-load_dotenv()
+# Storage layouts for chat messages: one embedded array per chat document, or
+# fixed-size buckets plus a summary document (see db/migrate_chat_buckets.py).
+# Portal syncs only write the embedded layout; bucketed chats are caught up by the
+# app's delta sync from the OnlyFans API
+CHAT_LAYOUT_EMBEDDED = "embedded"
+CHAT_LAYOUT_BUCKETED = "bucketed"
+MESSAGE_BUCKET_SIZE = 200
+
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
 
 class MongoDBClient:
     def __init__(self):
         print("MongoDBClient: Initializing connection...")
+        config = get_config()
+        self.chat_storage_layout = config.chat_storage_layout
+        self.read_preference = READ_PREFERENCES.get(config.mongo_read_preference)
+        if self.read_preference is None:
+            print(f"MongoDBClient: Unknown read preference {config.mongo_read_preference!r}, using primary")
+            self.read_preference = ReadPreference.PRIMARY
         try:
-            # Use env_config value first, fallback to environment variable
-            mongodb_uri = MONGODB_URI or os.getenv("MONGODB_URI")
+            mongodb_uri = config.mongodb_uri
             if not mongodb_uri:
                 raise ValueError("MONGODB_URI not found in configuration or environment variables")
 
-            # Add serverSelectionTimeoutMS to prevent hanging and disable SSL verification for development
+            # Add serverSelectionTimeoutMS to prevent hanging and disable SSL verification for development.
+            # The client connects lazily; MongoHealthMonitor warms it up in the background.
             self.client = MongoClient(
                 mongodb_uri,
                 serverSelectionTimeoutMS=5000,  # 5 second timeout
-                tlsAllowInvalidCertificates=True  # Disable SSL verification for development
+                tlsAllowInvalidCertificates=True,  # Disable SSL verification for development
+                minPoolSize=config.mongo_min_pool_size,
+                maxPoolSize=config.mongo_max_pool_size
             )
-            print("MongoDBClient: Connection established")
+            print("MongoDBClient: Client created")
         except Exception as e:
             print(f"MongoDBClient: Connection failed: {e}")
             sys.exit(1)
@@ -57,7 +79,7 @@ class MongoDBClient:
         """
         try:
             print(f"MongoDBClient: Looking up account: {account}")
-            db = self.client['onlyfans']
+            db = self._read_only_db('onlyfans')
             accounts = db['accounts']
             account_doc = accounts.find_one({"account": account})
             print(f"MongoDBClient: Account query result: {account_doc}")
@@ -66,6 +88,27 @@ class MongoDBClient:
             print(f"MongoDBClient: Error looking up account: {e}")
             raise
 
+    def _read_only_db(self, name: str):
+        """
+        Database handle using the configured read preference.
+        
+        Only for lookups that tolerate replication lag (accounts). Chat messages are
+        read right after the delta sync writes them, so they stay on the primary.
+        """
+        return self.client.get_database(name, read_preference=self.read_preference)
+        
+    def ping(self) -> float:
+        """
+        Round trip a ping to the server.
+        
+        Returns:
+            Round-trip time in milliseconds; the first call also pays server selection,
+            TLS and authentication
+        """
+        started = time.perf_counter()
+        self.client['admin'].command('ping')
+        return (time.perf_counter() - started) * 1000
+        
     def close(self):
         """Close the MongoDB connection"""
         print("MongoDBClient: Closing connection...")
@@ -83,7 +126,16 @@ class MongoDBClient:
         Returns:
             List of Message objects if found, None if no document exists
         """
-        document = self.client['onlyfans']['chats'].find_one({
+        db = self.client['onlyfans']
+        if self.chat_storage_layout == CHAT_LAYOUT_BUCKETED:
+            buckets = db['chat_message_buckets'].find(
+                {'account': account, 'chat_id': chat_id},
+                {'messages': 1}
+            ).sort('bucket', 1)
+            messages = [self._to_message(msg) for bucket in buckets for msg in bucket.get('messages', [])]
+            return messages or None
+            
+        document = db['chats'].find_one({
             'account': account,
             'chat_id': chat_id
         })
@@ -91,15 +143,249 @@ class MongoDBClient:
         if not document or 'messages' not in document:
             return None
             
-        messages = []
-        for msg in document['messages']:
-            messages.append(Message(
-                content=msg.get('content', ''),
-                timestamp=msg.get('timestamp', ''),
-                sender=msg.get('sender', '')
-            ))
+        return [self._to_message(msg) for msg in document['messages']]
+        
+    def get_chat_history(self, account: str, chat_id: str) -> Optional[MessageHistory]:
+        """
+        Fetch all messages of a chat into a compact MessageHistory.
+        
+        Unlike get_chat_messages no Message object is built per message, so this
+        suits long chats that are scanned rather than displayed.
+        
+        Args:
+            account: The account identifier
+            chat_id: The chat identifier
             
-        return messages
+        Returns:
+            The chat's history oldest first, None if no messages exist
+        """
+        db = self.client['onlyfans']
+        if self.chat_storage_layout == CHAT_LAYOUT_BUCKETED:
+            buckets = db['chat_message_buckets'].find(
+                {'account': account, 'chat_id': chat_id},
+                {'messages': 1}
+            ).sort('bucket', 1)
+            history = MessageHistory.from_dicts(msg for bucket in buckets for msg in bucket.get('messages', []))
+            return history or None
+            
+        document = db['chats'].find_one(
+            {'account': account, 'chat_id': chat_id},
+            {'messages': 1}
+        )
+        if not document or not document.get('messages'):
+            return None
+        return MessageHistory.from_dicts(document['messages'])
+        
+    def get_recent_chat_messages(self, account: str, chat_id: str, limit: int = MESSAGE_BUCKET_SIZE) -> Optional[List[Message]]:
+        """
+        Fetch only the newest messages of a chat.
+        
+        With the bucketed layout this reads the newest bucket (and the one before it
+        only when the newest holds fewer than ``limit`` messages). With the embedded
+        layout the array is sliced server-side so only the tail is transferred.
+        
+        Args:
+            account: The account identifier
+            chat_id: The chat identifier
+            limit: Maximum number of messages to return
+            
+        Returns:
+            List of Message objects oldest first, None if no messages exist
+        """
+        if self.chat_storage_layout == CHAT_LAYOUT_BUCKETED:
+            bucket_count = -(-limit // MESSAGE_BUCKET_SIZE) + 1
+            buckets = list(self.client['onlyfans']['chat_message_buckets'].find(
+                {'account': account, 'chat_id': chat_id},
+                {'messages': 1, 'count': 1}
+            ).sort('bucket', -1).limit(bucket_count))
+            
+            messages: List[Message] = []
+            for bucket in buckets:
+                stored = bucket.get('messages', [])
+                messages[:0] = [self._to_message(msg) for msg in stored]
+                if len(messages) >= limit:
+                    break
+            return messages[-limit:] or None
+            
+        document = self.client['onlyfans']['chats'].find_one(
+            {'account': account, 'chat_id': chat_id},
+            {'messages': {'$slice': -limit}}
+        )
+        if not document or not document.get('messages'):
+            return None
+        return [self._to_message(msg) for msg in document['messages']]
+        
+    def get_chat_summary(self, account: str, chat_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the summary document of a chat stored in the bucketed layout.
+        
+        Args:
+            account: The account identifier
+            chat_id: The chat identifier
+            
+        Returns:
+            The summary document (last_message, last_fan_message, last_message_id,
+            message_count, newest_bucket, newest_bucket_count), or None
+        """
+        return self.client['onlyfans']['chat_summaries'].find_one({'account': account, 'chat_id': chat_id})
+        
+    def get_last_fan_message(self, account: str, chat_id: str) -> Optional[Message]:
+        """
+        Get the newest message sent by the fan of a chat.
+        
+        Chat IDs are the fan's user ID, so fan messages are those whose sender is the chat ID.
+        
+        Args:
+            account: The account identifier
+            chat_id: The chat identifier
+            
+        Returns:
+            The last Message from the fan, or None if the fan has not written
+        """
+        if self.chat_storage_layout == CHAT_LAYOUT_BUCKETED:
+            summary = self.get_chat_summary(account, chat_id)
+            if summary and summary.get('last_fan_message'):
+                return self._to_message(summary['last_fan_message'])
+            return None
+            
+        history = self.get_chat_history(account, chat_id)
+        return history.last_message_from(chat_id) if history else None
+
+    def get_chat_sync_state(self, account: str, chat_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the delta sync high-water mark for a chat without loading its messages.
+        
+        Args:
+            account: The account identifier
+            chat_id: The chat identifier
+            
+        Returns:
+            Dict with 'last_message_id' and 'last_message' (the newest stored message
+            dict, if any), or None if no document exists
+        """
+        if self.chat_storage_layout == CHAT_LAYOUT_BUCKETED:
+            summary = self.get_chat_summary(account, chat_id)
+            if not summary:
+                return None
+            return {
+                'last_message_id': summary.get('last_message_id'),
+                'last_message': summary.get('last_message')
+            }
+            
+        document = self.client['onlyfans']['chats'].find_one(
+            {'account': account, 'chat_id': chat_id},
+            {'last_message_id': 1, 'messages': {'$slice': -1}}
+        )
+        if not document:
+            return None
+            
+        stored = document.get('messages') or []
+        return {
+            'last_message_id': document.get('last_message_id'),
+            'last_message': stored[-1] if stored else None
+        }
+        
+    def append_chat_messages(self, account: str, chat_id: str, messages: List[Message], last_message_id: int) -> int:
+        """
+        Append newly synced messages to a chat and advance its high-water mark.
+        
+        The chat must already exist; chats are created by the portal's sync. Messages
+        already stored, e.g. by a portal sync that ran meanwhile, are skipped.
+        
+        Args:
+            account: The account identifier
+            chat_id: The chat identifier
+            messages: New messages, oldest first
+            last_message_id: ID of the newest message now stored for the chat
+            
+        Returns:
+            Number of messages appended
+        """
+        print(f"MongoDBClient: Appending {len(messages)} messages to chat {chat_id}")
+        if self.chat_storage_layout == CHAT_LAYOUT_BUCKETED:
+            return self._append_bucketed_messages(account, chat_id, messages, last_message_id)
+            
+        chats = self.client['onlyfans']['chats']
+        chat = {'account': account, 'chat_id': chat_id}
+        added = 0
+        if messages:
+            # Each push only applies while the chat does not hold the message yet
+            result = chats.bulk_write([
+                UpdateOne({**chat, 'messages': {'$not': {'$elemMatch': self._same_message(message)}}},
+                          {'$push': {'messages': message.to_dict()}})
+                for message in messages
+            ])
+            added = result.modified_count
+        if last_message_id is not None:
+            chats.update_one(chat, {'$max': {'last_message_id': last_message_id}})
+        return added
+        
+    def _same_message(self, message: Message) -> Dict[str, Any]:
+        """Filter for stored copies of a message: the same ID, or the same time and sender if stored without one."""
+        same_time = {'id': None, 'timestamp': message.timestamp, 'sender': message.sender}
+        if message.id is None:
+            return same_time
+        return {'$or': [{'id': message.id}, same_time]}
+        
+    def _append_bucketed_messages(self, account: str, chat_id: str, messages: List[Message], last_message_id: int) -> int:
+        """Fill the newest bucket, open new buckets as needed and update the summary."""
+        db = self.client['onlyfans']
+        summary = self.get_chat_summary(account, chat_id)
+        if summary is None:
+            return 0
+        if messages:
+            # Only the buckets holding a copy of one of the messages are read
+            stored = [msg for bucket in db['chat_message_buckets'].find(
+                {'account': account, 'chat_id': chat_id,
+                 '$or': [{'messages': {'$elemMatch': self._same_message(message)}} for message in messages]},
+                {'messages': 1}
+            ) for msg in bucket.get('messages', [])]
+            # Matched as in _same_message
+            stored_ids = {msg['id'] for msg in stored if msg.get('id') is not None}
+            stored_times = {(msg.get('timestamp'), msg.get('sender')) for msg in stored if msg.get('id') is None}
+            messages = [message for message in messages
+                        if message.id not in stored_ids and (message.timestamp, message.sender) not in stored_times]
+        bucket = summary.get('newest_bucket', 0)
+        bucket_count = summary.get('newest_bucket_count', 0)
+        
+        pending = [message.to_dict() for message in messages]
+        while pending:
+            if bucket_count >= MESSAGE_BUCKET_SIZE:
+                bucket += 1
+                bucket_count = 0
+            chunk = pending[:MESSAGE_BUCKET_SIZE - bucket_count]
+            pending = pending[len(chunk):]
+            db['chat_message_buckets'].update_one(
+                {'account': account, 'chat_id': chat_id, 'bucket': bucket},
+                {'$push': {'messages': {'$each': chunk}}, '$inc': {'count': len(chunk)}},
+                upsert=True
+            )
+            bucket_count += len(chunk)
+            
+        summary_update: Dict[str, Any] = {
+            'newest_bucket': bucket,
+            'newest_bucket_count': bucket_count
+        }
+        if messages:
+            summary_update['last_message'] = messages[-1].to_dict()
+            fan_messages = [message for message in messages if message.sender == str(chat_id)]
+            if fan_messages:
+                summary_update['last_fan_message'] = fan_messages[-1].to_dict()
+        update: Dict[str, Any] = {'$set': summary_update, '$inc': {'message_count': len(messages)}}
+        if last_message_id is not None:
+            update['$max'] = {'last_message_id': last_message_id}
+        db['chat_summaries'].update_one({'account': account, 'chat_id': chat_id}, update)
+        return len(messages)
+        
+    def _to_message(self, msg: Dict[str, Any]) -> Message:
+        """Convert a stored message dict into a Message object."""
+        return Message(
+            content=msg.get('content', ''),
+            timestamp=msg.get('timestamp', ''),
+            sender=msg.get('sender', ''),
+            id=msg.get('id'),
+            media=[MediaItem.from_dict(item) for item in msg.get('media') or []]
+        )
 
 # Create a global instance
 db_client = MongoDBClient() 
\ No newline at end of file
@@ -0,0 +1,194 @@
+"""
+Migrate onlyfans.chats documents to the bucketed message layout.
+
+Each chat's embedded ``messages`` array is split into fixed-size documents in
+``onlyfans.chat_message_buckets`` and a small ``onlyfans.chat_summaries`` document
+holding the last message and last fan message. Chats are streamed from a cursor and
+written in bulk batches, so memory stays bounded by the batch size rather than the
+collection size. The original documents are left untouched. Chats that already have
+a summary are skipped, so a re-run (e.g. after an interrupted one) never overwrites
+messages appended in the bucketed layout; set CHAT_STORAGE_LAYOUT=bucketed once it
+has completed.
+
+The web portal's sync keeps writing the embedded documents, which bucketed reads do
+not see. In bucketed mode the app's delta sync (run whenever a chat is opened, and
+after the Sync button's portal sync) pages the OnlyFans API back to the stored
+messages however far that is, and buckets chats the portal has created since with
+migrate_chat.
+
+Usage:
+    python -m aurachat_helper_app.db.migrate_chat_buckets [--batch-size N] [--account ID] [--dry-run]
+"""
+import argparse
+import time
+from typing import Optional, Dict, Any, List, Tuple
+from pymongo import ReplaceOne, ASCENDING
+from .db_client import db_client, MESSAGE_BUCKET_SIZE
+
+def build_bucket_documents(chat: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Split one embedded chat document into bucket documents and a summary.
+
+    Args:
+        chat: A document from onlyfans.chats
+
+    Returns:
+        Tuple of (bucket documents, summary document)
+    """
+    account = chat.get('account')
+    chat_id = chat.get('chat_id')
+    messages = chat.get('messages') or []
+
+    buckets = []
+    for bucket, start in enumerate(range(0, len(messages), MESSAGE_BUCKET_SIZE)):
+        chunk = messages[start:start + MESSAGE_BUCKET_SIZE]
+        buckets.append({
+            'account': account,
+            'chat_id': chat_id,
+            'bucket': bucket,
+            'count': len(chunk),
+            'messages': chunk
+        })
+
+    last_fan_message = None
+    for message in reversed(messages):
+        if message.get('sender') == str(chat_id):
+            last_fan_message = message
+            break
+
+    summary = {
+        'account': account,
+        'chat_id': chat_id,
+        'last_message': messages[-1] if messages else None,
+        'last_fan_message': last_fan_message,
+        'last_message_id': chat.get('last_message_id') or (messages[-1].get('id') if messages else None),
+        'message_count': len(messages),
+        'newest_bucket': max(len(buckets) - 1, 0),
+        'newest_bucket_count': buckets[-1]['count'] if buckets else 0
+    }
+    return buckets, summary
+
+def migrate_chat(account: str, chat_id: str) -> bool:
+    """
+    Bucket one chat that has no summary yet, e.g. one the portal's sync has just created.
+
+    Args:
+        account: The account identifier
+        chat_id: The chat identifier
+
+    Returns:
+        True if the chat was migrated, False if it was already or has no document
+    """
+    db = db_client.client['onlyfans']
+    if db['chat_summaries'].find_one({'account': account, 'chat_id': chat_id}, {'_id': 1}):
+        return False
+    chat = db['chats'].find_one({'account': account, 'chat_id': chat_id})
+    if not chat:
+        return False
+    buckets, summary = build_bucket_documents(chat)
+    if buckets:
+        db['chat_message_buckets'].bulk_write([ReplaceOne(
+            {'account': account, 'chat_id': chat_id, 'bucket': bucket['bucket']},
+            bucket,
+            upsert=True
+        ) for bucket in buckets], ordered=False)
+    # Written last: the summary marks the chat as migrated
+    db['chat_summaries'].replace_one({'account': account, 'chat_id': chat_id}, summary, upsert=True)
+    return True
+
+def ensure_indexes(db) -> None:
+    """Create the indexes the bucketed read paths rely on."""
+    db['chat_message_buckets'].create_index(
+        [('account', ASCENDING), ('chat_id', ASCENDING), ('bucket', ASCENDING)],
+        unique=True
+    )
+    db['chat_summaries'].create_index([('account', ASCENDING), ('chat_id', ASCENDING)], unique=True)
+
+def migrate(batch_size: int = 100, account: Optional[str] = None, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Stream chats into the bucketed layout.
+
+    Args:
+        batch_size: Number of chats read per cursor batch and written per bulk call
+        account: Only migrate chats of this account, if given
+        dry_run: Count what would be written without writing anything
+
+    Returns:
+        Counts of migrated chats, buckets and messages, and of chats skipped as already migrated
+    """
+    db = db_client.client['onlyfans']
+    if not dry_run:
+        ensure_indexes(db)
+
+    query = {'account': account} if account else {}
+    cursor = db['chats'].find(query, batch_size=batch_size)
+
+    stats = {'chats': 0, 'buckets': 0, 'messages': 0, 'skipped': 0}
+    pending: List[Dict[str, Any]] = []
+    bucket_ops: List[ReplaceOne] = []
+    summary_ops: List[ReplaceOne] = []
+    started = time.time()
+
+    def flush():
+        # Chats with a summary were migrated before and may have had messages appended since
+        migrated = {(summary['account'], summary['chat_id']) for summary in db['chat_summaries'].find(
+            {'account': {'$in': list({chat.get('account') for chat in pending})},
+             'chat_id': {'$in': list({chat.get('chat_id') for chat in pending})}},
+            {'account': 1, 'chat_id': 1}
+        )} if pending else set()
+        for chat in pending:
+            if (chat.get('account'), chat.get('chat_id')) in migrated:
+                stats['skipped'] += 1
+            else:
+                add(chat)
+        pending.clear()
+        if not dry_run:
+            if bucket_ops:
+                db['chat_message_buckets'].bulk_write(bucket_ops, ordered=False)
+            if summary_ops:
+                db['chat_summaries'].bulk_write(summary_ops, ordered=False)
+        bucket_ops.clear()
+        summary_ops.clear()
+
+    def add(chat):
+        buckets, summary = build_bucket_documents(chat)
+        for bucket in buckets:
+            bucket_ops.append(ReplaceOne(
+                {'account': bucket['account'], 'chat_id': bucket['chat_id'], 'bucket': bucket['bucket']},
+                bucket,
+                upsert=True
+            ))
+        summary_ops.append(ReplaceOne(
+            {'account': summary['account'], 'chat_id': summary['chat_id']},
+            summary,
+            upsert=True
+        ))
+        stats['chats'] += 1
+        stats['buckets'] += len(buckets)
+        stats['messages'] += summary['message_count']
+
+    try:
+        for chat in cursor:
+            pending.append(chat)
+            if len(pending) >= batch_size:
+                flush()
+                print(f"Migrated {stats['chats']} chats ({stats['messages']} messages) in {time.time() - started:.1f}s")
+        flush()
+    finally:
+        cursor.close()
+
+    print(f"Done: {stats['chats']} chats, {stats['buckets']} buckets, {stats['messages']} messages, "
+          f"{stats['skipped']} already migrated{' (dry run)' if dry_run else ''}")
+    return stats
+
+def main():
+    """Command line entry point for the migration."""
+    parser = argparse.ArgumentParser(description="Migrate onlyfans.chats to bucketed message storage")
+    parser.add_argument('--batch-size', type=int, default=100, help="Chats per cursor batch and bulk write")
+    parser.add_argument('--account', help="Only migrate chats for this account")
+    parser.add_argument('--dry-run', action='store_true', help="Report counts without writing")
+    args = parser.parse_args()
+    migrate(batch_size=args.batch_size, account=args.account, dry_run=args.dry_run)
+
+if __name__ == '__main__':
+    main()
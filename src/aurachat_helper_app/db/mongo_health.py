@@ -0,0 +1,115 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+from .db_client import MongoDBClient, db_client
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+STATUS_CONNECTING = 'connecting'
+STATUS_HEALTHY = 'healthy'
+STATUS_SLOW = 'slow'
+STATUS_UNAVAILABLE = 'unavailable'
+
+@dataclass(frozen=True)
+class MongoHealth:
+    """Latest result of the database health check."""
+    status: str
+    rtt_ms: Optional[float] = None
+    error: Optional[str] = None
+    checked_at: float = 0.0
+
+class MongoHealthMonitor:
+    """
+    Warms up the MongoDB connection in the background and keeps checking it.
+    
+    The first ping pays server selection, TLS and authentication at startup instead
+    of at the first query, after which the driver fills the pool to minPoolSize.
+    Later pings measure the round trip; listeners are told whenever the health changes
+    status or its round trip moves noticeably.
+    """
+    
+    PING_INTERVAL_S = 30
+    RETRY_INTERVAL_S = 5
+    SLOW_RTT_MS = 250
+    
+    def __init__(self, client: MongoDBClient, interval_s: Optional[float] = None):
+        """
+        Initialize the monitor.
+        
+        Args:
+            client: The database client to check
+            interval_s: Seconds between pings while the database is reachable
+        """
+        self.client = client
+        self.interval_s = interval_s or self.PING_INTERVAL_S
+        self.health = MongoHealth(STATUS_CONNECTING)
+        self._listeners: List[Callable[[MongoHealth], None]] = []
+        self._lock = threading.Lock()
+        self._started = False
+        self._stopped = threading.Event()
+    
+    def add_listener(self, listener: Callable[[MongoHealth], None]) -> None:
+        """Register a callback for health changes; it is called from the monitor thread."""
+        with self._lock:
+            self._listeners.append(listener)
+        listener(self.health)
+    
+    def remove_listener(self, listener: Callable[[MongoHealth], None]) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+    
+    def start(self) -> None:
+        """Start warming up and monitoring; later calls do nothing."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        threading.Thread(target=self._run, daemon=True, name="mongo-health").start()
+    
+    def stop(self) -> None:
+        self._stopped.set()
+    
+    def check(self) -> MongoHealth:
+        """Ping the database once and publish the result."""
+        try:
+            rtt_ms = self.client.ping()
+            status = STATUS_SLOW if rtt_ms > self.SLOW_RTT_MS else STATUS_HEALTHY
+            health = MongoHealth(status, rtt_ms=rtt_ms, checked_at=time.time())
+        except Exception as e:
+            health = MongoHealth(STATUS_UNAVAILABLE, error=str(e), checked_at=time.time())
+        self._publish(health)
+        return health
+    
+    def _run(self) -> None:
+        try:
+            # Not a round-trip measurement: it includes connecting
+            logger.info(f"MongoDB connection warmed up in {self.client.ping():.0f}ms")
+        except Exception as e:
+            logger.warning(f"MongoDB warm-up failed: {e}")
+        health = self.check()
+        while not self._stopped.wait(self.RETRY_INTERVAL_S if health.status == STATUS_UNAVAILABLE
+                                     else self.interval_s):
+            health = self.check()
+    
+    def _publish(self, health: MongoHealth) -> None:
+        previous, self.health = self.health, health
+        if previous.status != health.status:
+            logger.info(f"MongoDB health: {previous.status} -> {health.status}"
+                        + (f" ({health.error})" if health.error else ""))
+        elif previous.rtt_ms is not None and health.rtt_ms is not None and \
+                abs(health.rtt_ms - previous.rtt_ms) < max(5.0, previous.rtt_ms * 0.2):
+            # Not worth redrawing for
+            return
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(health)
+            except Exception as e:
+                logger.error(f"Error in MongoDB health listener: {e}")
+
+# Create a global instance
+mongo_health = MongoHealthMonitor(db_client)
\ No newline at end of file
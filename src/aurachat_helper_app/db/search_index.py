@@ -0,0 +1,255 @@
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from dataclasses import dataclass
+from typing import Optional, List, Iterable, Tuple
+from ..models.message import Message
+from ..utils.app_paths import get_data_dir
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chats (
+    id INTEGER PRIMARY KEY,
+    account TEXT NOT NULL,
+    chat_id TEXT NOT NULL,
+    display_name TEXT NOT NULL DEFAULT '',
+    UNIQUE (account, chat_id)
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    account TEXT NOT NULL,
+    chat_id TEXT NOT NULL,
+    message_key TEXT NOT NULL,
+    sender TEXT,
+    timestamp TEXT,
+    content TEXT NOT NULL,
+    UNIQUE (account, chat_id, message_key)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS chats_fts USING fts5(
+    display_name, content='chats', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    content, account UNINDEXED, content='messages', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS chats_ai AFTER INSERT ON chats BEGIN
+    INSERT INTO chats_fts(rowid, display_name) VALUES (new.id, new.display_name);
+END;
+CREATE TRIGGER IF NOT EXISTS chats_au AFTER UPDATE OF display_name ON chats BEGIN
+    INSERT INTO chats_fts(chats_fts, rowid, display_name) VALUES ('delete', old.id, old.display_name);
+    INSERT INTO chats_fts(rowid, display_name) VALUES (new.id, new.display_name);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts(rowid, content, account) VALUES (new.id, new.content, new.account);
+END;
+"""
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_QUERY_TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+@dataclass
+class SearchResult:
+    """A single ranked search hit."""
+    account: str
+    chat_id: str
+    display_name: str
+    snippet: str
+    timestamp: Optional[str]
+    score: float
+    matched_name: bool = False
+
+class SearchIndex:
+    """On-disk inverted index over message content and fan display names, backed by SQLite FTS5."""
+
+    RECENT_CANDIDATES = 1000
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (or create) the index.
+
+        Args:
+            path: Database file path, defaults to search_index.db in the app data directory
+        """
+        self.path = path or os.path.join(get_data_dir(), 'search_index.db')
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+        logger.debug(f"Search index opened at {self.path}")
+
+    def upsert_chat(self, account: str, chat_id: str, display_name: str) -> None:
+        """Index or rename a chat's fan display name."""
+        self.upsert_chats(account, [(chat_id, display_name)])
+
+    def upsert_chats(self, account: str, chats: Iterable[Tuple[str, str]]) -> None:
+        """
+        Index display names for many chats in one transaction.
+
+        Args:
+            account: The account identifier
+            chats: (chat_id, display_name) pairs
+        """
+        rows = [(account, str(chat_id), name or '') for chat_id, name in chats]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO chats (account, chat_id, display_name) VALUES (?, ?, ?) "
+                "ON CONFLICT (account, chat_id) DO UPDATE SET display_name = excluded.display_name "
+                "WHERE display_name != excluded.display_name",
+                rows
+            )
+
+    def add_messages(self, account: str, chat_id: str, messages: Iterable[Message]) -> int:
+        """
+        Add messages to the index, skipping any that are already indexed.
+
+        Args:
+            account: The account identifier
+            chat_id: The chat identifier
+            messages: Messages to index
+
+        Returns:
+            Number of newly indexed messages
+        """
+        rows = []
+        for message in messages:
+            content = _TAG_RE.sub('', message.content or '').strip()
+            if not content:
+                continue
+            rows.append((account, str(chat_id), self._message_key(message), message.sender,
+                         str(message.timestamp or ''), content))
+        if not rows:
+            return 0
+
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                "INSERT OR IGNORE INTO messages (account, chat_id, message_key, sender, timestamp, content) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            return cursor.rowcount
+
+    def search(self, query: str, account: Optional[str] = None, limit: int = 50) -> List[SearchResult]:
+        """
+        Search fan names and message content.
+
+        Quoted text matches as an exact phrase; a word ending in ``*`` and the last word
+        typed match as prefixes. Name matches are listed first, then message matches
+        ranked by BM25. Message ranking only considers the newest ``RECENT_CANDIDATES``
+        matches, which keeps very common terms fast on large indexes and favours recent
+        conversations.
+
+        Args:
+            query: The user's query text
+            account: Restrict results to this account, if given
+            limit: Maximum number of message results
+
+        Returns:
+            Ranked list of SearchResult objects
+        """
+        match = self.build_match_expression(query)
+        if not match:
+            return []
+
+        name_filter = " AND c.account = ?" if account else ""
+        message_filter = " AND account = ?" if account else ""
+        params = [match] + ([account] if account else [])
+        with self._lock:
+            name_rows = self._conn.execute(
+                "SELECT c.account, c.chat_id, c.display_name, bm25(chats_fts) AS score "
+                "FROM chats_fts JOIN chats c ON c.id = chats_fts.rowid "
+                f"WHERE chats_fts MATCH ?{name_filter} ORDER BY score LIMIT ?",
+                params + [limit]
+            ).fetchall()
+            # FTS5 walks rowids newest first and stops at the candidate limit
+            candidates = self._conn.execute(
+                "SELECT rowid, bm25(messages_fts) AS score FROM messages_fts "
+                f"WHERE messages_fts MATCH ?{message_filter} ORDER BY rowid DESC LIMIT ?",
+                params + [self.RECENT_CANDIDATES]
+            ).fetchall()
+            top = sorted(candidates, key=lambda row: row[1])[:limit]
+            details = {}
+            if top:
+                placeholders = ','.join('?' * len(top))
+                for row in self._conn.execute(
+                    "SELECT m.id, m.account, m.chat_id, COALESCE(c.display_name, ''), m.content, m.timestamp "
+                    "FROM messages m LEFT JOIN chats c ON c.account = m.account AND c.chat_id = m.chat_id "
+                    f"WHERE m.id IN ({placeholders})",
+                    [rowid for rowid, _ in top]
+                ):
+                    details[row[0]] = row[1:]
+
+        results = [SearchResult(account=row[0], chat_id=row[1], display_name=row[2], snippet='',
+                                timestamp=None, score=row[3], matched_name=True) for row in name_rows]
+        highlight = self._highlight_pattern(query)
+        for rowid, score in top:
+            if rowid not in details:
+                continue
+            row_account, chat_id, display_name, content, timestamp = details[rowid]
+            results.append(SearchResult(account=row_account, chat_id=chat_id, display_name=display_name,
+                                        snippet=self._snippet(content, highlight), timestamp=timestamp or None,
+                                        score=score))
+        return results
+
+    def build_match_expression(self, query: str) -> str:
+        """
+        Translate user query text into a safe FTS5 match expression.
+
+        Args:
+            query: Raw query text, e.g. 'tip "last week"'
+
+        Returns:
+            The match expression, or an empty string if the query has no searchable words
+        """
+        terms = []
+        tokens = _QUERY_TOKEN_RE.findall(query or '')
+        for position, (phrase, word) in enumerate(tokens):
+            if phrase:
+                words = _WORD_RE.findall(phrase)
+                if words:
+                    terms.append('"' + ' '.join(words) + '"')
+                continue
+            words = _WORD_RE.findall(word)
+            prefix = word.endswith('*') or position == len(tokens) - 1
+            for index, token in enumerate(words):
+                is_prefix = prefix and index == len(words) - 1
+                terms.append(f'"{token}"*' if is_prefix else f'"{token}"')
+        return ' AND '.join(terms)
+
+    def _highlight_pattern(self, query: str) -> Optional[re.Pattern]:
+        """Build a regex matching any query word at the start of a word."""
+        words = sorted({word.lower() for word in _WORD_RE.findall(query or '')}, key=len, reverse=True)
+        if not words:
+            return None
+        return re.compile(r'\b(' + '|'.join(re.escape(word) for word in words) + r')\w*', re.IGNORECASE)
+
+    def _snippet(self, content: str, pattern: Optional[re.Pattern], width: int = 80) -> str:
+        """Cut a window of the content around the first hit and bracket matched words."""
+        hit = pattern.search(content) if pattern else None
+        start = max(0, hit.start() - width // 3) if hit else 0
+        window = content[start:start + width]
+        if pattern:
+            window = pattern.sub(lambda m: f"[{m.group(0)}]", window)
+        prefix = '…' if start > 0 else ''
+        suffix = '…' if start + width < len(content) else ''
+        return f"{prefix}{window}{suffix}"
+
+    def close(self) -> None:
+        """Close the index database."""
+        with self._lock:
+            self._conn.close()
+
+    def _message_key(self, message: Message) -> str:
+        """Stable key used to avoid indexing the same message twice."""
+        if message.id is not None:
+            return str(message.id)
+        return f"{message.timestamp}|{message.sender}|{zlib.crc32((message.content or '').encode('utf-8')):x}"
+
+# Create a global instance
+search_index = SearchIndex()
@@ -1,7 +1,6 @@
 import sentry_sdk
 from aurachat_helper_app.controllers.root_controller import RootController
-import os
-from dotenv import load_dotenv
+from aurachat_helper_app.app_config import get_config
 from aurachat_helper_app.utils.logger import setup_logger, get_logger
 
 # Get logger for main module
@@ -14,9 +13,9 @@ def main():
         setup_logger()
         logger.info("Initializing application...")
         
-        # Load environment variables
-        load_dotenv()
-        logger.debug("Environment variables loaded")
+        # Configuration is loaded once and shared by every client
+        config = get_config()
+        logger.debug("Configuration loaded")
         
         # Initialize Sentry
         sentry_sdk.init(
@@ -27,7 +26,7 @@ def main():
             # Enable performance monitoring
             traces_sample_rate=1.0,
             # Set environment
-            environment=os.getenv("ENVIRONMENT", "development")
+            environment=config.environment
         )
         logger.debug("Sentry initialized")
         
@@ -0,0 +1,235 @@
+from array import array
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from ..models.chat import Chat
+
+# Sort keys and filters understood by ChatStore.query
+SORT_LAST_MESSAGE_TIME = 'last_message_time'
+SORT_UNREAD_COUNT = 'unread_count'
+SORT_UNREAD_TIPS = 'has_unread_tips'
+SORT_DISPLAY_NAME = 'display_name'
+
+FILTER_ALL = None
+FILTER_UNREAD = 'unread'
+FILTER_UNREAD_TIPS = 'unread_tips'
+FILTER_CAN_SEND = 'can_send'
+
+_FLAG_UNREAD_TIPS = 1
+_FLAG_CAN_SEND = 2
+
+class ChatQueryResult:
+    """Live, ordered view over one of the store's sorted indexes."""
+    
+    def __init__(self, store: 'ChatStore', index: List[Tuple[Any, int]], descending: bool):
+        self._store = store
+        self._index = index
+        self._descending = descending
+    
+    def __len__(self) -> int:
+        return len(self._index)
+    
+    def row(self, position: int) -> int:
+        """Get the store row at a position of this ordering."""
+        if self._descending:
+            position = len(self._index) - 1 - position
+        return self._index[position][1]
+    
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self._store.chat_at(self.row(i)) for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        return self._store.chat_at(self.row(position))
+    
+    def __iter__(self) -> Iterator[Chat]:
+        entries = reversed(self._index) if self._descending else iter(self._index)
+        for _, row in entries:
+            yield self._store.chat_at(row)
+    
+    def fan_ids(self, start: int = 0, stop: Optional[int] = None) -> List[int]:
+        """Fan IDs for a window of the ordering, without touching Chat objects."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        return [self._store.fan_id_at(self.row(i)) for i in range(start, stop)]
+
+class ChatStore:
+    """
+    Columnar store of the chat fields the chat list sorts and filters on.
+    
+    Fields live in parallel arrays indexed by row. Sorted indexes are kept per
+    (sort key, filter) as lists of (key, row) tuples, built on first use and then
+    updated incrementally with bisect when a chat changes, so re-sorting or
+    filtering only hands back an existing index.
+    """
+    
+    def __init__(self):
+        """Initialize an empty store."""
+        self._fan_ids = array('q')
+        self._last_message_times = array('d')
+        self._unread_counts = array('l')
+        self._flags = bytearray()
+        self._display_names: List[str] = []
+        self._chats: List[Optional[Chat]] = []
+        self._row_by_fan: Dict[int, int] = {}
+        self._free_rows: List[int] = []
+        self._indexes: Dict[Tuple[str, Optional[str]], List[Tuple[Any, int]]] = {}
+        
+        self._sort_keys: Dict[str, Callable[[int], Any]] = {
+            SORT_LAST_MESSAGE_TIME: lambda row: self._last_message_times[row],
+            SORT_UNREAD_COUNT: lambda row: self._unread_counts[row],
+            SORT_UNREAD_TIPS: lambda row: self._flags[row] & _FLAG_UNREAD_TIPS,
+            SORT_DISPLAY_NAME: lambda row: self._display_names[row].casefold(),
+        }
+        self._filters: Dict[Optional[str], Callable[[int], bool]] = {
+            FILTER_ALL: lambda row: True,
+            FILTER_UNREAD: lambda row: self._unread_counts[row] > 0,
+            FILTER_UNREAD_TIPS: lambda row: bool(self._flags[row] & _FLAG_UNREAD_TIPS),
+            FILTER_CAN_SEND: lambda row: bool(self._flags[row] & _FLAG_CAN_SEND),
+        }
+    
+    def __len__(self) -> int:
+        return len(self._row_by_fan)
+    
+    def __contains__(self, fan_id: int) -> bool:
+        return fan_id in self._row_by_fan
+    
+    # Loading and updating -------------------------------------------------------
+    
+    def load(self, chats: List[Chat], display_names: List[str]) -> None:
+        """
+        Replace the store's contents in one pass.
+        
+        Args:
+            chats: Chats in API order
+            display_names: Display name for each chat, in the same order
+        """
+        self.clear()
+        for chat, display_name in zip(chats, display_names):
+            self._append_row(chat, display_name)
+        # Build the default ordering up front; other combinations are built on first query
+        self.query()
+    
+    def upsert(self, chat: Chat, display_name: str) -> None:
+        """
+        Add a chat or update it in place, adjusting only the indexes whose keys changed.
+        
+        Args:
+            chat: The chat to store
+            display_name: The chat's display name
+        """
+        row = self._row_by_fan.get(chat.fan.id)
+        if row is None:
+            row = self._append_row(chat, display_name)
+            for (sort_key, filter_name), index in self._indexes.items():
+                if self._filters[filter_name](row):
+                    insort(index, (self._sort_keys[sort_key](row), row))
+            return
+        
+        before = {key: (self._sort_keys[key[0]](row), self._filters[key[1]](row)) for key in self._indexes}
+        self._write_row(row, chat, display_name)
+        for (sort_key, filter_name), index in self._indexes.items():
+            old_key, was_in = before[(sort_key, filter_name)]
+            new_key, is_in = self._sort_keys[sort_key](row), self._filters[filter_name](row)
+            if old_key == new_key and was_in == is_in:
+                continue
+            if was_in:
+                self._remove_entry(index, (old_key, row))
+            if is_in:
+                insort(index, (new_key, row))
+    
+    def remove(self, fan_id: int) -> None:
+        """Remove a chat from the store."""
+        row = self._row_by_fan.pop(fan_id, None)
+        if row is None:
+            return
+        for (sort_key, filter_name), index in self._indexes.items():
+            if self._filters[filter_name](row):
+                self._remove_entry(index, (self._sort_keys[sort_key](row), row))
+        self._chats[row] = None
+        self._free_rows.append(row)
+    
+    def clear(self) -> None:
+        """Remove all chats and indexes."""
+        self.__init__()
+    
+    # Queries --------------------------------------------------------------------
+    
+    def query(self, sort_key: str = SORT_LAST_MESSAGE_TIME, descending: bool = True,
+              filter_name: Optional[str] = FILTER_ALL) -> ChatQueryResult:
+        """
+        Get chats in a sort order, optionally filtered.
+        
+        Args:
+            sort_key: One of the SORT_* constants
+            descending: Largest key first when True
+            filter_name: One of the FILTER_* constants
+        
+        Returns:
+            A live ChatQueryResult over the matching chats
+        """
+        if sort_key not in self._sort_keys:
+            raise ValueError(f"Unknown sort key: {sort_key}")
+        if filter_name not in self._filters:
+            raise ValueError(f"Unknown filter: {filter_name}")
+        index = self._indexes.get((sort_key, filter_name))
+        if index is None:
+            key, keep = self._sort_keys[sort_key], self._filters[filter_name]
+            index = sorted((key(row), row) for row in self._row_by_fan.values() if keep(row))
+            self._indexes[(sort_key, filter_name)] = index
+        return ChatQueryResult(self, index, descending)
+    
+    def get(self, fan_id: int) -> Optional[Chat]:
+        """Get the stored Chat for a fan ID."""
+        row = self._row_by_fan.get(fan_id)
+        return self._chats[row] if row is not None else None
+    
+    def chat_at(self, row: int) -> Chat:
+        return self._chats[row]
+    
+    def fan_id_at(self, row: int) -> int:
+        return self._fan_ids[row]
+    
+    def display_name(self, fan_id: int) -> str:
+        return self._display_names[self._row_by_fan[fan_id]]
+    
+    # Internals ------------------------------------------------------------------
+    
+    def _append_row(self, chat: Chat, display_name: str) -> int:
+        if self._free_rows:
+            row = self._free_rows.pop()
+        else:
+            row = len(self._fan_ids)
+            self._fan_ids.append(0)
+            self._last_message_times.append(0.0)
+            self._unread_counts.append(0)
+            self._flags.append(0)
+            self._display_names.append('')
+            self._chats.append(None)
+        self._write_row(row, chat, display_name)
+        self._row_by_fan[chat.fan.id] = row
+        return row
+    
+    def _write_row(self, row: int, chat: Chat, display_name: str) -> None:
+        self._fan_ids[row] = chat.fan.id
+        self._last_message_times[row] = self._parse_time(chat.last_message.created_at)
+        self._unread_counts[row] = chat.unread_messages_count or 0
+        self._flags[row] = ((_FLAG_UNREAD_TIPS if chat.has_unread_tips else 0)
+                            | (_FLAG_CAN_SEND if chat.can_send_message else 0))
+        self._display_names[row] = display_name or ''
+        self._chats[row] = chat
+    
+    def _remove_entry(self, index: List[Tuple[Any, int]], entry: Tuple[Any, int]) -> None:
+        position = bisect_left(index, entry)
+        if position < len(index) and index[position] == entry:
+            del index[position]
+    
+    def _parse_time(self, value: Any) -> float:
+        """Parse an ISO 8601 timestamp into epoch seconds, 0 if missing or invalid."""
+        if not value:
+            return 0.0
+        if isinstance(value, datetime):
+            return value.timestamp()
+        try:
+            return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return 0.0
\ No newline at end of file
@@ -0,0 +1,162 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Tuple
+from ..utils.app_paths import get_data_dir
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class DraftCache:
+    """
+    Generated reply drafts, keyed by chat and the fan message they answer.
+    
+    Each chat keeps a short history of drafts for its latest fan message; a draft
+    for a newer fan message, or an explicit invalidation, drops the older ones.
+    Chats are evicted least recently used first. Drafts and invalidations are
+    appended to a JSONL log, so saving one costs a single write however many are
+    cached; the log is replayed on first use and compacted when most of its lines
+    are superseded.
+    """
+    
+    MAX_DRAFTS_PER_CHAT = 5
+    MAX_CHATS = 5000
+    
+    def __init__(self, path: Optional[str] = None, max_chats: Optional[int] = None):
+        """
+        Initialize the draft cache.
+        
+        Args:
+            path: Draft log, by default drafts.jsonl in the app data directory
+            max_chats: Number of chats to keep drafts for
+        """
+        self.path = path or os.path.join(get_data_dir(), 'drafts.jsonl')
+        self.max_chats = max_chats or self.MAX_CHATS
+        self._lock = threading.Lock()
+        self._chats: Optional['OrderedDict[Tuple[str, str], Dict[str, Any]]'] = None
+    
+    def get(self, account_id: str, chat_id: str, fan_message_id: Any) -> Optional[str]:
+        """
+        Get the latest cached draft answering a fan message.
+        
+        Returns:
+            The draft text, or None if the chat has no draft for that message
+        """
+        history = self.history(account_id, chat_id, fan_message_id)
+        return history[-1] if history else None
+    
+    def history(self, account_id: str, chat_id: str, fan_message_id: Any) -> List[str]:
+        """Get the cached drafts answering a fan message, oldest first."""
+        key = (account_id, chat_id)
+        with self._lock:
+            chats = self._load()
+            chat = chats.get(key)
+            if chat is None or chat['fan_message_id'] != fan_message_id:
+                return []
+            chats.move_to_end(key)
+            return [entry['text'] for entry in chat['drafts']]
+    
+    def put(self, account_id: str, chat_id: str, fan_message_id: Any, text: str) -> None:
+        """Cache a draft answering a fan message, keeping the chat's recent drafts for the same message."""
+        entry = {
+            'account_id': account_id,
+            'chat_id': chat_id,
+            'fan_message_id': fan_message_id,
+            'text': text,
+            'created_at': datetime.now(timezone.utc).isoformat()
+        }
+        with self._lock:
+            self._load()
+            self._apply(entry)
+            self._append(entry)
+    
+    def invalidate(self, account_id: str, chat_id: str, fan_message_id: Any = None) -> None:
+        """
+        Drop a chat's drafts, e.g. when a new fan message arrives.
+        
+        Args:
+            account_id: The ID of the OnlyFans account
+            chat_id: The ID of the chat
+            fan_message_id: Only drop drafts answering an older fan message than this one;
+                stored messages can lag the chat list, so a draft for a newer message is kept
+        """
+        key = (account_id, chat_id)
+        with self._lock:
+            chat = self._load().get(key)
+            if chat is None or (fan_message_id is not None and not self._is_older(chat['fan_message_id'], fan_message_id)):
+                return
+            del self._chats[key]
+            self._append({'account_id': account_id, 'chat_id': chat_id, 'invalidated': True})
+    
+    @staticmethod
+    def _is_older(cached_id: Any, fan_message_id: Any) -> bool:
+        """Whether a cached draft's fan message ID is older than another; IDs grow over time."""
+        try:
+            return int(cached_id) < int(fan_message_id)
+        except (TypeError, ValueError):
+            # Not comparable (e.g. a draft generated without a fan message): keep it
+            return False
+    
+    def _apply(self, entry: Dict[str, Any]) -> None:
+        """Apply a logged draft or invalidation to the in-memory cache; the caller holds the lock."""
+        key = (entry['account_id'], entry['chat_id'])
+        if entry.get('invalidated'):
+            self._chats.pop(key, None)
+            return
+        chat = self._chats.get(key)
+        if chat is None or chat['fan_message_id'] != entry['fan_message_id']:
+            chat = self._chats[key] = {'fan_message_id': entry['fan_message_id'], 'drafts': []}
+        chat['drafts'].append(entry)
+        del chat['drafts'][:-self.MAX_DRAFTS_PER_CHAT]
+        self._chats.move_to_end(key)
+        while len(self._chats) > self.max_chats:
+            self._chats.popitem(last=False)
+    
+    def _append(self, entry: Dict[str, Any]) -> None:
+        """Append an entry to the draft log; the caller holds the lock."""
+        try:
+            with open(self.path, 'a', encoding='utf-8') as log:
+                log.write(json.dumps(entry) + '\n')
+        except OSError as e:
+            logger.error(f"Error saving draft: {e}")
+    
+    def _load(self) -> 'OrderedDict[Tuple[str, str], Dict[str, Any]]':
+        """Replay the draft log on first use; the caller holds the lock."""
+        if self._chats is not None:
+            return self._chats
+        self._chats = OrderedDict()
+        lines = 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as log:
+                for line in log:
+                    lines += 1
+                    try:
+                        self._apply(json.loads(line))
+                    except (ValueError, KeyError, TypeError):
+                        # A line cut short by an interrupted write
+                        continue
+        except FileNotFoundError:
+            return self._chats
+        except OSError as e:
+            logger.warning(f"Ignoring unreadable draft cache: {e}")
+            return self._chats
+        if lines > 2 * sum(len(chat['drafts']) for chat in self._chats.values()) + 100:
+            self._compact()
+        return self._chats
+    
+    def _compact(self) -> None:
+        """Rewrite the log with only the current drafts, least recently used chats first."""
+        temp_path = self.path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as log:
+                for chat in self._chats.values():
+                    for entry in chat['drafts']:
+                        log.write(json.dumps(entry) + '\n')
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.error(f"Error compacting draft cache: {e}")
+
+# Create a global instance
+draft_cache = DraftCache()
\ No newline at end of file
@@ -0,0 +1,123 @@
+import threading
+from array import array
+from bisect import insort
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from ..models.message import Message
+from ..models.message_history import parse_timestamp_ms
+
+class ChatMessageIndex:
+    """
+    Lookups over one chat's messages, maintained incrementally as messages arrive.
+    
+    Messages are kept in arrival order and never modified. Alongside them the
+    index keeps each sender's newest message and positions ordered by timestamp,
+    so the last message and the last fan message are O(1).
+    """
+    
+    def __init__(self, fan_id: str):
+        """
+        Initialize an empty index.
+        
+        Args:
+            fan_id: The chat's fan; chat IDs are the fan's user ID
+        """
+        self.fan_id = str(fan_id)
+        self._messages: List[Message] = []
+        self._timestamps = array('q')
+        self._keys: Set[Any] = set()
+        self._by_time: List[Tuple[int, int]] = []
+        self._last_by_sender: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self._messages)
+    
+    def add(self, messages: Iterable[Message]) -> int:
+        """
+        Add messages not yet in the index, in any order.
+        
+        Returns:
+            Number of messages added
+        """
+        added = 0
+        for message in messages:
+            key = self._key(message)
+            if key in self._keys:
+                continue
+            self._keys.add(key)
+            position = len(self._messages)
+            timestamp = parse_timestamp_ms(message.timestamp)
+            self._messages.append(message)
+            self._timestamps.append(timestamp)
+            entry = (timestamp, position)
+            # Synced messages arrive in order, so this is almost always an append
+            self._insert(self._by_time, entry)
+            sender = str(message.sender)
+            newest = self._last_by_sender.get(sender)
+            if newest is None or entry > (self._timestamps[newest], newest):
+                self._last_by_sender[sender] = position
+            added += 1
+        return added
+    
+    @property
+    def last_message(self) -> Optional[Message]:
+        """The newest message in the chat."""
+        return self._messages[self._by_time[-1][1]] if self._by_time else None
+    
+    @property
+    def last_fan_message(self) -> Optional[Message]:
+        """The newest message from the fan."""
+        return self.last_from(self.fan_id)
+    
+    def last_from(self, sender: str) -> Optional[Message]:
+        """The newest message from a sender."""
+        position = self._last_by_sender.get(str(sender))
+        return None if position is None else self._messages[position]
+    
+    def _insert(self, entries: List[Tuple[int, int]], entry: Tuple[int, int]) -> None:
+        if not entries or entry > entries[-1]:
+            entries.append(entry)
+        else:
+            insort(entries, entry)
+    
+    def _key(self, message: Message) -> Any:
+        """Identity of a message; stored messages without an ID fall back to their fields."""
+        if message.id is not None:
+            return message.id
+        return (str(message.timestamp), message.sender, message.content)
+
+class MessageIndexStore:
+    """Chat message indexes for the recently opened chats, least recently used evicted first."""
+    
+    MAX_CHATS = 200
+    
+    def __init__(self, max_chats: Optional[int] = None):
+        self.max_chats = max_chats or self.MAX_CHATS
+        self._indexes: 'OrderedDict[Tuple[str, str], ChatMessageIndex]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, account_id: str, chat_id: str) -> Optional[ChatMessageIndex]:
+        """Get a chat's index if it has been built."""
+        key = (account_id, str(chat_id))
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+            return index
+    
+    def add(self, account_id: str, chat_id: str, messages: Iterable[Message]) -> ChatMessageIndex:
+        """Add messages to a chat's index, creating it if needed."""
+        key = (account_id, str(chat_id))
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                index = self._indexes[key] = ChatMessageIndex(chat_id)
+                while len(self._indexes) > self.max_chats:
+                    self._indexes.popitem(last=False)
+            self._indexes.move_to_end(key)
+            index.add(messages)
+            return index
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
\ No newline at end of file
@@ -0,0 +1,133 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List
+from ..models.user import User
+from ..models.onlyfans_account import OnlyFansAccount
+from ..app_config import AppConfig, get_config
+from ..utils.app_paths import get_data_dir
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+SESSION_VERSION = 1
+
+class SessionManager:
+    """Manager class for the persisted session: signed-in user, accounts and last open workspace."""
+    
+    def __init__(self, path: Optional[str] = None, config: Optional[AppConfig] = None):
+        """
+        Initialize the session manager.
+        
+        Args:
+            path: Session file, by default session.json in the app data directory
+            config: App configuration with the session lifetime, by default the process-wide one
+        """
+        self.path = path or os.path.join(get_data_dir(), 'session.json')
+        self.ttl = timedelta(days=(config or get_config()).session_ttl_days)
+        self._lock = threading.Lock()
+    
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Load the persisted session.
+        
+        Returns:
+            The session dict, or None if there is none, it has expired or it cannot be read
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as session_file:
+                session = json.load(session_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable session file: {e}")
+            return None
+        
+        if session.get('version') != SESSION_VERSION or not session.get('user'):
+            return None
+        try:
+            expires_at = datetime.fromisoformat(session['expires_at'])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if expires_at <= datetime.now(timezone.utc):
+            logger.info("Persisted session has expired")
+            self.clear()
+            return None
+        return session
+    
+    def get_user(self, session: Dict[str, Any]) -> User:
+        """Get the User stored in a session."""
+        return User.from_dict(session['user'])
+    
+    def get_accounts(self, session: Dict[str, Any]) -> List[OnlyFansAccount]:
+        """Get the OnlyFans accounts stored in a session."""
+        return [OnlyFansAccount.from_dict(account) for account in session.get('accounts', [])]
+    
+    def save_workspace(self, user: User, accounts: List[OnlyFansAccount], renew: bool = True) -> None:
+        """
+        Persist the signed-in user and their accounts.
+        
+        Args:
+            user: The signed-in user
+            accounts: The user's OnlyFans accounts
+            renew: Start a new expiry period (on sign-in); False keeps the current one
+        """
+        def update(session):
+            if renew or 'expires_at' not in session:
+                session['expires_at'] = (datetime.now(timezone.utc) + self.ttl).isoformat()
+            if session.get('user', {}).get('email') != user.email:
+                session.pop('last_account_id', None)
+                session.pop('last_chat_id', None)
+            session['user'] = user.to_dict()
+            session['accounts'] = [account.to_dict() for account in accounts]
+        self._update(update)
+    
+    def set_last_account(self, account_id: Optional[str]) -> None:
+        """Remember the open account; None when the operator goes back to the account list."""
+        def update(session):
+            if session.get('last_account_id') != account_id:
+                session['last_chat_id'] = None
+            session['last_account_id'] = account_id
+        self._update(update)
+    
+    def set_last_chat(self, chat_id: Optional[str]) -> None:
+        """Remember the selected chat in the open account."""
+        def update(session):
+            session['last_chat_id'] = chat_id
+        self._update(update)
+    
+    def clear(self) -> None:
+        """Delete the persisted session, e.g. on sign-out."""
+        with self._lock:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.error(f"Error removing session file: {e}")
+    
+    def _update(self, change) -> None:
+        """Apply a change to the stored session and write it atomically."""
+        with self._lock:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as session_file:
+                    session = json.load(session_file)
+            except (OSError, ValueError):
+                session = {}
+            change(session)
+            if not session.get('user'):
+                # Nothing to restore without a signed-in user
+                return
+            session['version'] = SESSION_VERSION
+            session['saved_at'] = datetime.now(timezone.utc).isoformat()
+            temp_path = self.path + '.tmp'
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as session_file:
+                    json.dump(session, session_file)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                logger.error(f"Error saving session: {e}")
+
+# Create a global instance
+session_manager = SessionManager()
\ No newline at end of file
@@ -0,0 +1,134 @@
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from ..models.chat import Chat
+
+# Sort key of a chat in the queue: unread tips first, then more unread messages,
+# then the fan who has been waiting longest
+TriageKey = Tuple[int, int, float]
+
+class TriageQueue:
+    """
+    Priority queue of the chats that need attention, walked with a cursor.
+    
+    A chat needs attention when it has unread messages or tips, or its last message
+    is from the fan. Entries are kept sorted with bisect and updated incrementally
+    as chats change: refresh re-ranks only the chats of a new chat list that differ
+    from the last version seen, so a chat dropped once handled stays out until it
+    changes again. The cursor remembers the current chat's key, so next and
+    previous still work after that chat has been handled and dropped out.
+    """
+    
+    def __init__(self):
+        """Initialize an empty queue."""
+        self._entries: List[Tuple[TriageKey, int]] = []
+        self._keys: Dict[int, TriageKey] = {}
+        self._chats: Dict[int, Chat] = {}
+        self._seen: Dict[int, Tuple[Any, ...]] = {}  # Last seen state of every chat, queued or not
+        self._cursor: Optional[Tuple[TriageKey, int]] = None
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def load(self, chats: Iterable[Chat]) -> None:
+        """Rebuild the queue from a chat list; the cursor is kept."""
+        self._entries = []
+        self._keys = {}
+        self._chats = {}
+        self._seen = {}
+        for chat in chats:
+            self._seen[chat.fan.id] = self._state(chat)
+            key = self.triage_key(chat)
+            if key is not None:
+                self._keys[chat.fan.id] = key
+                self._chats[chat.fan.id] = chat
+                self._entries.append((key, chat.fan.id))
+        self._entries.sort()
+    
+    def update(self, chat: Chat) -> None:
+        """Re-rank a chat after it changed, adding or dropping it as needed."""
+        self.remove(chat.fan.id)
+        self._seen[chat.fan.id] = self._state(chat)
+        key = self.triage_key(chat)
+        if key is not None:
+            self._keys[chat.fan.id] = key
+            self._chats[chat.fan.id] = chat
+            insort(self._entries, (key, chat.fan.id))
+    
+    def refresh(self, chats: Iterable[Chat]) -> None:
+        """Apply a refreshed chat list: changed chats are re-ranked and missing ones dropped."""
+        present = set()
+        for chat in chats:
+            present.add(chat.fan.id)
+            if self._seen.get(chat.fan.id) != self._state(chat):
+                self.update(chat)
+            elif chat.fan.id in self._chats:
+                self._chats[chat.fan.id] = chat
+        for fan_id in [fan_id for fan_id in self._seen if fan_id not in present]:
+            self.remove(fan_id)
+            del self._seen[fan_id]
+    
+    def remove(self, fan_id: int) -> None:
+        """Drop a chat, e.g. once it has been answered."""
+        key = self._keys.pop(fan_id, None)
+        self._chats.pop(fan_id, None)
+        if key is not None:
+            position = bisect_left(self._entries, (key, fan_id))
+            if position < len(self._entries) and self._entries[position] == (key, fan_id):
+                del self._entries[position]
+    
+    def next(self) -> Optional[Chat]:
+        """Move to and return the chat after the cursor; the first chat if there is no cursor."""
+        position = bisect_right(self._entries, self._cursor) if self._cursor else 0
+        return self._move(position)
+    
+    def previous(self) -> Optional[Chat]:
+        """Move to and return the chat before the cursor."""
+        if not self._cursor:
+            return self._move(0)
+        return self._move(bisect_left(self._entries, self._cursor) - 1)
+    
+    def select(self, fan_id: int) -> None:
+        """Put the cursor on a chat the operator opened directly."""
+        key = self._keys.get(fan_id)
+        if key is not None:
+            self._cursor = (key, fan_id)
+    
+    def upcoming(self, count: int) -> List[Chat]:
+        """The chats after the cursor, nearest first, without moving it."""
+        start = bisect_right(self._entries, self._cursor) if self._cursor else 0
+        return [self._chats[fan_id] for _, fan_id in self._entries[start:start + count]]
+    
+    def position(self) -> int:
+        """1-based position of the cursor's chat, 0 if the cursor is not on a queued chat."""
+        if not self._cursor:
+            return 0
+        position = bisect_left(self._entries, self._cursor)
+        if position < len(self._entries) and self._entries[position] == self._cursor:
+            return position + 1
+        return 0
+    
+    def _move(self, position: int) -> Optional[Chat]:
+        if not 0 <= position < len(self._entries):
+            return None
+        self._cursor = self._entries[position]
+        return self._chats[self._cursor[1]]
+    
+    @staticmethod
+    def _state(chat: Chat) -> Tuple[Any, ...]:
+        """What the chat's rank depends on; a chat is only re-ranked when this changes."""
+        return (chat.last_message.id, chat.unread_messages_count, chat.has_unread_tips)
+    
+    @staticmethod
+    def triage_key(chat: Chat) -> Optional[TriageKey]:
+        """Sort key of a chat, None if it does not need attention."""
+        from_fan = chat.last_message.from_user.get('id') == chat.fan.id
+        if not (chat.unread_messages_count > 0 or chat.has_unread_tips or from_fan):
+            return None
+        waiting_since = float('inf')
+        if from_fan and chat.last_message.created_at:
+            try:
+                waiting_since = datetime.fromisoformat(chat.last_message.created_at.replace('Z', '+00:00')).timestamp()
+            except ValueError:
+                pass
+        return (0 if chat.has_unread_tips else 1, -chat.unread_messages_count, waiting_since)
\ No newline at end of file
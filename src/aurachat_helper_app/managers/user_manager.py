@@ -17,6 +17,10 @@ class UserManager:
             return True
         return False
         
+    def restore(self, user: User):
+        """Set the current user from a persisted session without querying the database."""
+        self._current_user = user
+        
     def sign_out(self):
         """Sign out the current user."""
         self._current_user = None
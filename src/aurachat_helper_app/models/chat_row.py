@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+@dataclass(frozen=True)
+class ChatRow:
+    """Ready-to-render display model for a chat cell."""
+    fan_id: int
+    display_name: str
+    snippet: str
+    time_text: str
+    unread_count: int
+    has_unread_tips: bool
+    avatar_url: Optional[str]
+    source: Tuple[Any, ...]
+    
+    def to_display_info(self) -> Dict[str, Any]:
+        """Convert the row to the display info dictionary the chat cell views take."""
+        return {
+            'display_name': self.display_name,
+            'last_message': self.snippet,
+            'last_message_time': self.time_text,
+            'unread_count': self.unread_count,
+            'avatar_url': self.avatar_url
+        }
\ No newline at end of file
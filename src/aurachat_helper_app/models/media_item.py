@@ -0,0 +1,67 @@
+from dataclasses import dataclass
+from typing import Optional, Dict, Any
+
+@dataclass
+class MediaItem:
+    """Metadata for a media attachment on a message; the media itself is fetched on demand."""
+    id: int
+    type: str
+    can_view: bool
+    thumb_url: Optional[str] = None
+    preview_url: Optional[str] = None
+    full_url: Optional[str] = None
+    width: int = 0
+    height: int = 0
+    size: int = 0
+    duration: int = 0
+    
+    @property
+    def is_video(self) -> bool:
+        return self.type in ('video', 'gif')
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'MediaItem':
+        """
+        Create a MediaItem from an API media dict or a stored one.
+        
+        The API nests URLs under 'files' ({'full': {'url': ...}, 'thumb': ...}) in newer
+        responses and puts them at the top level ('full', 'thumb', 'src') in older ones.
+        """
+        files = data.get('files') or {}
+        
+        def file_url(name: str) -> Optional[str]:
+            entry = files.get(name)
+            if isinstance(entry, dict) and entry.get('url'):
+                return entry['url']
+            value = data.get(name)
+            return value if isinstance(value, str) and value else None
+        
+        full = files.get('full') if isinstance(files.get('full'), dict) else {}
+        info = (data.get('info') or {}).get('source') or {}
+        return cls(
+            id=data.get('id', 0),
+            type=data.get('type', ''),
+            can_view=data.get('canView', data.get('can_view', True)),
+            thumb_url=data.get('thumb_url') or file_url('thumb') or file_url('squarePreview'),
+            preview_url=data.get('preview_url') or file_url('preview'),
+            full_url=data.get('full_url') or file_url('full') or file_url('src') or info.get('source'),
+            width=data.get('width') or full.get('width') or info.get('width') or 0,
+            height=data.get('height') or full.get('height') or info.get('height') or 0,
+            size=data.get('size') or full.get('size') or 0,
+            duration=data.get('duration') or 0
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the media item to a dictionary for storage."""
+        return {
+            "id": self.id,
+            "type": self.type,
+            "can_view": self.can_view,
+            "thumb_url": self.thumb_url,
+            "preview_url": self.preview_url,
+            "full_url": self.full_url,
+            "width": self.width,
+            "height": self.height,
+            "size": self.size,
+            "duration": self.duration
+        }
\ No newline at end of file
@@ -1,9 +1,25 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+from typing import Optional, List
+from .media_item import MediaItem
 
 @dataclass
 class Message:
     """Represents a message in the database."""
     content: str
     timestamp: datetime
-    sender: str 
\ No newline at end of file
+    sender: str
+    id: Optional[int] = None
+    media: List[MediaItem] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Convert the message object to a dictionary for storage."""
+        data = {
+            "id": self.id,
+            "content": self.content,
+            "timestamp": self.timestamp,
+            "sender": self.sender
+        }
+        if self.media:
+            data["media"] = [item.to_dict() for item in self.media]
+        return data
@@ -0,0 +1,184 @@
+import sys
+from array import array
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from .media_item import MediaItem
+from .message import Message
+
+NO_ID = -1
+
+def parse_timestamp_ms(value: Any) -> int:
+    """Parse a stored ISO 8601 timestamp (or datetime) into epoch milliseconds, 0 if missing or invalid."""
+    if not value:
+        return 0
+    try:
+        if not isinstance(value, datetime):
+            value = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        if value.tzinfo is None:
+            # Mongo returns naive UTC datetimes
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1000)
+    except (ValueError, TypeError, OverflowError):
+        return 0
+
+class _Columns:
+    """The shared storage behind a MessageHistory and every slice of it."""
+    
+    __slots__ = ('ids', 'timestamps', 'sender_codes', 'senders', 'offsets', 'content', 'media')
+    
+    def __init__(self):
+        self.ids = array('q')
+        self.timestamps = array('q')
+        self.sender_codes = array('I')
+        self.senders: List[str] = []
+        # Message i's content is content[offsets[i]:offsets[i + 1]]: an ASCII str
+        # when every message is ASCII (slices need no decoding), UTF-8 bytes otherwise
+        self.offsets = array('q', [0])
+        self.content: Union[str, bytes] = ''
+        # Only the few messages with attachments have an entry
+        self.media: Dict[int, List[Dict[str, Any]]] = {}
+
+class MessageHistory(Sequence):
+    """
+    A chat's messages, oldest first, stored column-wise.
+    
+    IDs and timestamps (parsed once into epoch milliseconds) are packed arrays,
+    senders are codes into a small table of interned IDs, and all content shares
+    one text buffer. Indexing materializes a Message on demand; slicing with a
+    step of 1 returns a view over the same storage without copying, and the
+    *_at accessors read single fields without building a Message at all.
+    """
+    
+    __slots__ = ('_columns', '_start', '_stop')
+    
+    def __init__(self, columns: Optional[_Columns] = None, start: int = 0, stop: Optional[int] = None):
+        self._columns = columns or _Columns()
+        self._start = start
+        self._stop = len(self._columns.ids) if stop is None else stop
+    
+    @classmethod
+    def from_dicts(cls, stored: Iterable[Dict[str, Any]]) -> 'MessageHistory':
+        """
+        Build a history from stored message dicts (content/timestamp/sender/id/media), oldest first.
+        
+        Args:
+            stored: Message dicts as kept in the chats or chat_message_buckets collections
+        """
+        columns = _Columns()
+        codes: Dict[str, int] = {}
+        parts: List[bytes] = []
+        position = 0
+        for index, msg in enumerate(stored):
+            message_id = msg.get('id')
+            columns.ids.append(NO_ID if message_id is None else message_id)
+            columns.timestamps.append(parse_timestamp_ms(msg.get('timestamp')))
+            sender = msg.get('sender', '')
+            code = codes.get(sender)
+            if code is None:
+                code = codes[sender] = len(columns.senders)
+                columns.senders.append(sys.intern(str(sender)))
+            columns.sender_codes.append(code)
+            encoded = (msg.get('content') or '').encode('utf-8')
+            parts.append(encoded)
+            position += len(encoded)
+            columns.offsets.append(position)
+            if msg.get('media'):
+                columns.media[index] = msg['media']
+        content = b''.join(parts)
+        columns.content = content.decode('ascii') if content.isascii() else content
+        return cls(columns)
+    
+    def __len__(self) -> int:
+        return self._stop - self._start
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[Message, 'MessageHistory', List[Message]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return MessageHistory(self._columns, self._start + start, self._start + max(start, stop))
+        return self._message(self._position(index))
+    
+    def __iter__(self) -> Iterator[Message]:
+        for position in range(self._start, self._stop):
+            yield self._message(position)
+    
+    def __reversed__(self) -> Iterator[Message]:
+        for position in range(self._stop - 1, self._start - 1, -1):
+            yield self._message(position)
+    
+    def id_at(self, index: int) -> Optional[int]:
+        """ID of a message, None if it has none."""
+        message_id = self._columns.ids[self._position(index)]
+        return None if message_id == NO_ID else message_id
+    
+    def timestamp_ms_at(self, index: int) -> int:
+        """Timestamp of a message in epoch milliseconds, 0 if unknown."""
+        return self._columns.timestamps[self._position(index)]
+    
+    def sender_at(self, index: int) -> str:
+        """Sender ID of a message."""
+        columns = self._columns
+        return columns.senders[columns.sender_codes[self._position(index)]]
+    
+    def content_at(self, index: int) -> str:
+        """Content of a message."""
+        return self._content(self._position(index))
+    
+    def contents(self) -> Iterator[str]:
+        """The messages' contents, oldest first, without building Message objects."""
+        offsets = self._columns.offsets
+        content = self._columns.content
+        decode = not isinstance(content, str)
+        for position in range(self._start, self._stop):
+            chunk = content[offsets[position]:offsets[position + 1]]
+            yield chunk.decode('utf-8') if decode else chunk
+    
+    def timestamps_ms(self) -> memoryview:
+        """The messages' timestamps in epoch milliseconds, as a view over the shared array."""
+        return memoryview(self._columns.timestamps)[self._start:self._stop]
+    
+    def last_index_from(self, sender: str) -> Optional[int]:
+        """Index of the newest message sent by a sender, or None."""
+        columns = self._columns
+        try:
+            code = columns.senders.index(str(sender))
+        except ValueError:
+            return None
+        sender_codes = columns.sender_codes
+        for position in range(self._stop - 1, self._start - 1, -1):
+            if sender_codes[position] == code:
+                return position - self._start
+        return None
+    
+    def last_message_from(self, sender: str) -> Optional[Message]:
+        """The newest message sent by a sender, or None."""
+        index = self.last_index_from(sender)
+        return None if index is None else self[index]
+    
+    def _position(self, index: int) -> int:
+        """Position in the shared storage of an index into this view."""
+        length = self._stop - self._start
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('message index out of range')
+        return self._start + index
+    
+    def _content(self, position: int) -> str:
+        offsets = self._columns.offsets
+        content = self._columns.content[offsets[position]:offsets[position + 1]]
+        return content if isinstance(content, str) else content.decode('utf-8')
+    
+    def _message(self, position: int) -> Message:
+        columns = self._columns
+        message_id = columns.ids[position]
+        timestamp_ms = columns.timestamps[position]
+        return Message(
+            content=self._content(position),
+            timestamp=datetime.fromtimestamp(timestamp_ms / 1000, timezone.utc) if timestamp_ms else None,
+            sender=columns.senders[columns.sender_codes[position]],
+            id=None if message_id == NO_ID else message_id,
+            media=[MediaItem.from_dict(item) for item in columns.media.get(position, ())]
+        )
\ No newline at end of file
@@ -0,0 +1,152 @@
+import threading
+from dataclasses import dataclass, replace
+from typing import Callable, List, Optional
+from aurachat_helper_app.api.aurachat_webportal_client import AuraChatWebPortalClient
+from aurachat_helper_app.db.db_client import db_client
+from aurachat_helper_app.models.chat import Chat
+from aurachat_helper_app.utils.logger import get_logger
+from aurachat_helper_app.utils.work_scheduler import WORK_BACKGROUND, WorkScheduler
+
+logger = get_logger(__name__)
+
+@dataclass(frozen=True)
+class AccountSyncProgress:
+    """Snapshot of an account sync's progress."""
+    total: int
+    synced: int = 0
+    skipped: int = 0
+    failed: int = 0
+    cancelled: bool = False
+    
+    @property
+    def done(self) -> int:
+        return self.synced + self.skipped + self.failed
+    
+    @property
+    def finished(self) -> bool:
+        return self.done >= self.total
+
+class AccountSyncJob:
+    """A running account sync; cancelling it stops the sync after the chats in flight."""
+    
+    def __init__(self, account_id: str, total: int, on_progress: 'SyncCallback', on_done: 'SyncCallback'):
+        self.account_id = account_id
+        self.progress = AccountSyncProgress(total)
+        self.cancelled = threading.Event()
+        self._futures = []
+        self._on_progress = on_progress
+        self._on_done = on_done
+        self._lock = threading.Lock()
+    
+    def cancel(self) -> None:
+        """Stop syncing further chats; the done callback reports the partial result."""
+        if self.cancelled.is_set():
+            return
+        self.cancelled.set()
+        cancelled = sum(1 for future in self._futures if future.cancel())
+        # Cancelled futures never run, so account for them here
+        self._record(skipped=cancelled, cancelled=True)
+    
+    def _record(self, synced: int = 0, skipped: int = 0, failed: int = 0, cancelled: bool = False) -> None:
+        """Update the progress and notify (any thread)."""
+        with self._lock:
+            was_finished = self.progress.finished
+            self.progress = replace(self.progress,
+                                    synced=self.progress.synced + synced,
+                                    skipped=self.progress.skipped + skipped,
+                                    failed=self.progress.failed + failed,
+                                    cancelled=self.progress.cancelled or cancelled)
+            progress = self.progress
+        self._on_progress(self, progress)
+        if progress.finished and not was_finished:
+            self._on_done(self, progress)
+
+SyncCallback = Callable[[AccountSyncJob, AccountSyncProgress], None]
+
+class AccountSyncService:
+    """
+    Syncs many chats of an account through the web portal as background work.
+    
+    Chats are queued in priority order (unread tips, then unread, then most recent),
+    so with the scheduler's background cap the chats operators are most likely to
+    open are synced first, and anything the operator does goes ahead of them.
+    """
+    
+    def __init__(self, webportal_client: AuraChatWebPortalClient, scheduler: Optional[WorkScheduler] = None):
+        """
+        Initialize the account sync service.
+        
+        Args:
+            webportal_client: Client used to sync each chat
+            scheduler: Scheduler the chat syncs run on, by default one of its own
+        """
+        self.webportal_client = webportal_client
+        self.db_client = db_client
+        self._owns_scheduler = scheduler is None
+        self.scheduler = scheduler or WorkScheduler()
+    
+    def prioritize(self, chats: List[Chat]) -> List[Chat]:
+        """Order chats unread tips first, then by unread count, then most recent message."""
+        return sorted(chats, key=lambda chat: (not chat.has_unread_tips,
+                                               -(chat.unread_messages_count or 0),
+                                               -(chat.last_message.id or 0)))
+    
+    def is_stale(self, account_id: str, chat: Chat) -> bool:
+        """Whether the stored messages are older than the chat list's last message."""
+        state = self.db_client.get_chat_sync_state(account_id, str(chat.fan.id))
+        if not state:
+            return True
+        stored_id = state.get('last_message_id') or (state.get('last_message') or {}).get('id')
+        return not stored_id or (chat.last_message.id or 0) > stored_id
+    
+    def start(self, account_id: str, chats: List[Chat], stale_only: bool,
+              on_progress: SyncCallback, on_done: SyncCallback) -> AccountSyncJob:
+        """
+        Start syncing an account's chats in the background.
+        
+        Args:
+            account_id: The ID of the OnlyFans account
+            chats: Chats to sync, typically the account's whole chat list
+            stale_only: Skip chats whose stored messages are already up to date
+            on_progress: Receives the job and a progress snapshot after each chat, from a worker thread
+            on_done: Receives the job and its final progress once, from a worker thread (or
+                the cancelling thread)
+        
+        Returns:
+            The job, which can be cancelled
+        """
+        job = AccountSyncJob(account_id, len(chats), on_progress, on_done)
+        logger.info(f"Syncing {len(chats)} chats of account {account_id} (stale only: {stale_only})")
+        if not chats:
+            on_done(job, job.progress)
+            return job
+        for chat in self.prioritize(chats):
+            job._futures.append(self.scheduler.submit(WORK_BACKGROUND, self._sync_chat, job, chat, stale_only,
+                                                      account_id=account_id, group='account-sync'))
+        return job
+    
+    def _sync_chat(self, job: AccountSyncJob, chat: Chat, stale_only: bool) -> None:
+        """Sync one chat of a job (worker thread)."""
+        if job.cancelled.is_set():
+            job._record(skipped=1)
+            return
+        chat_id = str(chat.fan.id)
+        try:
+            if stale_only and not self.is_stale(job.account_id, chat):
+                job._record(skipped=1)
+                return
+            response = self.webportal_client.sync_messages(job.account_id, chat_id)
+        except Exception as e:
+            logger.error(f"Error syncing chat {chat_id}: {e}")
+            response = None
+        if response:
+            job._record(synced=1)
+        else:
+            job._record(failed=1)
+    
+    def shutdown(self) -> None:
+        """Cancel queued chat syncs, e.g. on sign-out."""
+        if self._owns_scheduler:
+            self.scheduler.shutdown()
+        else:
+            self.scheduler.cancel(group='account-sync')
\ No newline at end of file
@@ -0,0 +1,170 @@
+import threading
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+from aurachat_helper_app.models.chat import Chat, Fan
+from aurachat_helper_app.models.chat_row import ChatRow
+from aurachat_helper_app.services.chat_service import clean_html
+from aurachat_helper_app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+@lru_cache(maxsize=8192)
+def format_time(iso_time) -> str:
+    """
+    Convert an ISO 8601 timestamp to readable format, memoized.
+    
+    Args:
+        iso_time: ISO 8601 timestamp string or datetime
+    
+    Returns:
+        Formatted time string (e.g., "Feb 03 12:34 PM"), or the input if it cannot be parsed
+    """
+    if not iso_time:
+        return ''
+    try:
+        if isinstance(iso_time, datetime):
+            return iso_time.strftime('%b %d %I:%M %p')
+        dt = datetime.fromisoformat(iso_time.replace('Z', '+00:00'))
+        return dt.strftime('%b %d %I:%M %p')
+    except (ValueError, TypeError, AttributeError):
+        return iso_time
+
+def get_display_name(fan: Fan) -> str:
+    """
+    Get the display name for a fan with fallbacks.
+    
+    Args:
+        fan: The fan object
+    
+    Returns:
+        The best available name in order: display_name → name → username
+    """
+    for name in (fan.display_name, fan.name, fan.username):
+        if name and name.strip():
+            return name
+    print(f"Warning: No display name found for chat with fan ID {fan.id}")
+    return "Unknown User"
+
+class ChatDisplayService:
+    """Builds and caches ChatRow display models for chat cells."""
+    
+    SNIPPET_CHARS = 60
+    BATCH_SIZE = 200
+    
+    def __init__(self, snippet_chars: Optional[int] = None):
+        """
+        Initialize the display service.
+        
+        Args:
+            snippet_chars: Width of the last-message snippet in characters
+        """
+        self.snippet_chars = snippet_chars or self.SNIPPET_CHARS
+        self._rows: Dict[int, ChatRow] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+    
+    def _source(self, chat: Chat) -> tuple:
+        """The chat fields a row is derived from; the cached row is reused while these match."""
+        fan, message = chat.fan, chat.last_message
+        return (fan.display_name, fan.name, fan.username, fan.avatar, message.id, message.text, message.created_at,
+                chat.unread_messages_count, chat.has_unread_tips)
+    
+    def _build(self, chat: Chat, source: tuple) -> ChatRow:
+        snippet = clean_html(chat.last_message.text)
+        if len(snippet) > self.snippet_chars:
+            snippet = snippet[:self.snippet_chars - 1].rstrip() + '…'
+        return ChatRow(
+            fan_id=chat.fan.id,
+            display_name=get_display_name(chat.fan),
+            snippet=snippet,
+            time_text=format_time(chat.last_message.created_at),
+            unread_count=chat.unread_messages_count or 0,
+            has_unread_tips=bool(chat.has_unread_tips),
+            avatar_url=chat.fan.avatar,
+            source=source
+        )
+    
+    def get_row(self, chat: Chat) -> ChatRow:
+        """
+        Get the display row for a chat, rebuilding it only if its source fields changed.
+        
+        Args:
+            chat: The chat to display
+        
+        Returns:
+            The ChatRow for the chat
+        """
+        source = self._source(chat)
+        with self._lock:
+            row = self._rows.get(chat.fan.id)
+        if row is not None and row.source == source:
+            return row
+        row = self._build(chat, source)
+        with self._lock:
+            self._rows[chat.fan.id] = row
+        return row
+    
+    def get_cached_rows(self, chats: List[Chat]) -> Optional[List[ChatRow]]:
+        """
+        Get rows for chats only if every one is cached and current.
+        
+        Returns:
+            The rows in chat order, or None if any row needs building
+        """
+        rows = []
+        with self._lock:
+            for chat in chats:
+                row = self._rows.get(chat.fan.id)
+                if row is None or row.source != self._source(chat):
+                    return None
+                rows.append(row)
+        return rows
+    
+    def build_rows_async(self, chats: List[Chat], on_batch: Callable[[List[ChatRow]], None],
+                         on_done: Optional[Callable[[], None]] = None) -> int:
+        """
+        Build rows on a worker thread, reporting them in batches.
+        
+        Starting a new build supersedes any build still running; its remaining
+        batches are dropped.
+        
+        Args:
+            chats: Chats in display order
+            on_batch: Called from the worker thread with each batch of rows, in order
+            on_done: Called from the worker thread after the last batch
+        
+        Returns:
+            The generation number of this build
+        """
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        worker = threading.Thread(target=self._build_batches, args=(chats, generation, on_batch, on_done),
+                                  daemon=True, name=f"chat-rows-{generation}")
+        worker.start()
+        return generation
+    
+    def is_current(self, generation: int) -> bool:
+        """Whether a build generation has not been superseded."""
+        return generation == self._generation
+    
+    def _build_batches(self, chats: List[Chat], generation: int, on_batch, on_done) -> None:
+        try:
+            for start in range(0, len(chats), self.BATCH_SIZE):
+                if not self.is_current(generation):
+                    return
+                on_batch([self.get_row(chat) for chat in chats[start:start + self.BATCH_SIZE]])
+            if on_done and self.is_current(generation):
+                on_done()
+        except Exception:
+            logger.exception("Error building chat rows")
+    
+    def invalidate(self, fan_id: Optional[int] = None) -> None:
+        """Drop one cached row, or all of them (which also stops any build in progress)."""
+        with self._lock:
+            if fan_id is None:
+                self._rows.clear()
+                self._generation += 1
+            else:
+                self._rows.pop(fan_id, None)
\ No newline at end of file
@@ -0,0 +1,161 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Iterable, List, Optional, Tuple
+from aurachat_helper_app.models.chat import Chat
+from aurachat_helper_app.models.message import Message
+from aurachat_helper_app.services.generate_message_service import GenerateMessageService
+from aurachat_helper_app.services.message_service import MessageService
+from aurachat_helper_app.services.message_sync_service import MessageSyncService
+from aurachat_helper_app.services.outbound_queue import OP_GENERATE, PRIORITY_PREFETCH, OutboundQueue
+from aurachat_helper_app.services.search_service import SearchService
+from aurachat_helper_app.utils.logger import get_logger
+from aurachat_helper_app.utils.work_scheduler import WORK_PREFETCH, WorkScheduler
+
+logger = get_logger(__name__)
+
+@dataclass
+class LoadedChat:
+    """A chat's recent messages and last fan message, ready to be shown."""
+    last_message_id: Any
+    messages: List[Message]
+    last_fan_message: Optional[Message]
+    loaded_at: float = field(default_factory=time.monotonic)
+
+class ChatPrefetcher:
+    """
+    Loads the messages of the chats the operator is about to open.
+    
+    load() does the work of opening a chat: catch the local store up, read the
+    recent messages and index them. In triage mode the next few chats are loaded
+    as prefetch work on the scheduler and their drafts queued for generation at
+    PRIORITY_PREFETCH, so stepping to the next chat finds everything ready.
+    """
+    
+    MAX_ENTRIES = 20
+    MAX_AGE_S = 120
+    
+    def __init__(self, db_client, message_sync_service: MessageSyncService, message_service: MessageService,
+                 search_service: SearchService, generate_service: GenerateMessageService,
+                 outbound_queue: OutboundQueue, scheduler: Optional[WorkScheduler] = None):
+        """
+        Initialize the prefetcher.
+        
+        Args:
+            db_client: Database client holding the stored messages
+            message_sync_service: Service that merges new messages into the database
+            message_service: Service holding the per-chat message indexes
+            search_service: Local full-text index the messages are added to
+            generate_service: Service whose draft cache is checked before queueing a draft
+            outbound_queue: Queue the prefetched generate requests are sent through
+            scheduler: Scheduler the chats are loaded on, by default one of its own
+        """
+        self.db_client = db_client
+        self.message_sync_service = message_sync_service
+        self.message_service = message_service
+        self.search_service = search_service
+        self.generate_service = generate_service
+        self.outbound_queue = outbound_queue
+        self._owns_scheduler = scheduler is None
+        self.scheduler = scheduler or WorkScheduler()
+        self._lock = threading.Lock()
+        self._loaded: 'OrderedDict[Tuple[str, str], LoadedChat]' = OrderedDict()
+    
+    def load(self, account_id: str, chat: Chat) -> LoadedChat:
+        """
+        Sync, read and index a chat's recent messages; runs on any thread.
+        
+        Args:
+            account_id: The ID of the OnlyFans account
+            chat: The chat from the chat list
+        
+        Returns:
+            The loaded chat
+        """
+        chat_id = str(chat.fan.id)
+        # Catch the local store up with anything newer than its high-water mark
+        self.message_sync_service.sync_chat(account_id, chat_id, chat.last_message.id)
+        messages = self.db_client.get_recent_chat_messages(account_id, chat_id)
+        last_fan_message = None
+        if messages:
+            self.search_service.index_messages(account_id, chat_id, messages)
+            self.message_service.index_messages(account_id, chat_id, messages)
+            last_fan_message = self.message_service.last_fan_message(account_id, chat_id)
+            if not last_fan_message:
+                # The fan's last message is older than the recent window
+                older = self.db_client.get_last_fan_message(account_id, chat_id)
+                if older:
+                    self.message_service.index_messages(account_id, chat_id, [older])
+                    last_fan_message = self.message_service.last_fan_message(account_id, chat_id)
+        return LoadedChat(chat.last_message.id, messages or [], last_fan_message)
+    
+    def prefetch(self, account_id: str, chats: Iterable[Chat]) -> None:
+        """Load chats in the background and queue drafts for the ones without one."""
+        for chat in chats:
+            with self._lock:
+                loaded = self._loaded.get((account_id, str(chat.fan.id)))
+            if loaded and self._is_fresh(loaded, chat):
+                continue
+            # Chats already queued or loading are not queued again
+            self.scheduler.submit(WORK_PREFETCH, self._prefetch, account_id, chat, account_id=account_id,
+                                  key=self._work_key(account_id, chat), group='prefetch')
+    
+    def take(self, account_id: str, chat: Chat) -> Optional[LoadedChat]:
+        """
+        Hand over a prefetched chat, once.
+        
+        Returns:
+            The loaded chat, or None if it was not prefetched, is too old or a newer
+            message has arrived since
+        """
+        with self._lock:
+            loaded = self._loaded.pop((account_id, str(chat.fan.id)), None)
+        if loaded and self._is_fresh(loaded, chat):
+            return loaded
+        # The caller loads the chat itself now
+        self.scheduler.cancel(key=self._work_key(account_id, chat))
+        return None
+    
+    def clear(self) -> None:
+        """Cancel queued prefetches and drop everything prefetched, e.g. when triage mode is turned off."""
+        self.scheduler.cancel(group='prefetch')
+        with self._lock:
+            self._loaded.clear()
+    
+    def shutdown(self) -> None:
+        """Cancel queued prefetches, e.g. on sign-out."""
+        self.clear()
+        if self._owns_scheduler:
+            self.scheduler.shutdown()
+    
+    def _prefetch(self, account_id: str, chat: Chat) -> None:
+        """Load one chat and queue its draft (worker thread)."""
+        key = (account_id, str(chat.fan.id))
+        try:
+            loaded = self.load(account_id, chat)
+            with self._lock:
+                self._loaded[key] = loaded
+                self._loaded.move_to_end(key)
+                while len(self._loaded) > self.MAX_ENTRIES:
+                    self._loaded.popitem(last=False)
+            # The chat list can be ahead of the stored messages
+            fan_message_ids = [loaded.last_fan_message.id] if loaded.last_fan_message else []
+            if chat.last_message.from_user.get('id') == chat.fan.id and chat.last_message.id is not None:
+                fan_message_ids.append(chat.last_message.id)
+            if fan_message_ids:
+                fan_message_id = max(fan_message_ids)
+                # Drafts answering an older fan message are stale
+                self.generate_service.invalidate_drafts(account_id, key[1], fan_message_id)
+                if not self.generate_service.draft_history(account_id, key[1], fan_message_id):
+                    self.outbound_queue.enqueue(OP_GENERATE, account_id, key[1], fan_message_id,
+                                                priority=PRIORITY_PREFETCH)
+        except Exception as e:
+            logger.warning(f"Error prefetching chat {key[1]}: {e}")
+    
+    def _work_key(self, account_id: str, chat: Chat) -> Tuple[str, str, str]:
+        return 'prefetch', account_id, str(chat.fan.id)
+    
+    def _is_fresh(self, loaded: LoadedChat, chat: Chat) -> bool:
+        return (loaded.last_message_id == chat.last_message.id
+                and time.monotonic() - loaded.loaded_at < self.MAX_AGE_S)
\ No newline at end of file
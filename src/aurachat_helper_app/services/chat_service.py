@@ -1,14 +1,32 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from aurachat_helper_app.api.onlyfansapi_client import OnlyFansAPIClient
 from aurachat_helper_app.models.chat import Chat
 import re
 
+HTML_TAG_PATTERN = re.compile('<.*?>')
+
+def clean_html(text: str) -> str:
+    """
+    Remove HTML tags from a string.
+    
+    Args:
+        text: The string containing HTML tags
+        
+    Returns:
+        The cleaned string without HTML tags
+    """
+    if not text:
+        return ''
+    if '<' not in text:
+        return text
+    return HTML_TAG_PATTERN.sub('', text)
+
 class ChatService:
     """Service class for handling chat-related operations."""
     
-    def __init__(self):
+    def __init__(self, api_client: Optional[OnlyFansAPIClient] = None):
         """Initialize the chat service."""
-        self.api_client = OnlyFansAPIClient()
+        self.api_client = api_client or OnlyFansAPIClient()
         
     def clean_html(self, text: str) -> str:
         """
@@ -20,15 +38,7 @@ class ChatService:
         Returns:
             The cleaned string without HTML tags
         """
-        if not text:
-            return ''
-            
-        # Remove <p> and </p> tags
-        text = text.replace('<p>', '').replace('</p>', '')
-        
-        # Remove any remaining HTML tags
-        clean = re.compile('<.*?>')
-        return re.sub(clean, '', text)
+        return clean_html(text)
         
     def get_chats_for_account(self, account_id: str) -> List[Chat]:
         """
@@ -54,10 +64,7 @@ class ChatService:
         chats = []
         for chat_data in chats_data:
             try:
-                # Clean HTML from last message before creating Chat object
-                if 'lastMessage' in chat_data and 'text' in chat_data['lastMessage']:
-                    chat_data['lastMessage']['text'] = self.clean_html(chat_data['lastMessage']['text'])
-                    
+                # Last message HTML is cleaned when display rows are built (ChatDisplayService)
                 chat = Chat.from_dict(chat_data)
                 chats.append(chat)
             except Exception as e:
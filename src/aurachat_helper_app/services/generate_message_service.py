@@ -1,33 +1,76 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+import requests
 from aurachat_helper_app.api.aurachat_webportal_client import AuraChatWebPortalClient
+from aurachat_helper_app.managers.draft_cache import DraftCache, draft_cache
 import re
 
+# Returned by generate_response when no draft could be generated
+GENERATE_ERROR = 'Generate response error'
+
 class GenerateMessageService:
     """Service for handling message generation operations."""
     
-    def __init__(self):
-        """Initialize the message generation service with a web portal client."""
-        self.webportal_client = AuraChatWebPortalClient()
+    def __init__(self, webportal_client: Optional[AuraChatWebPortalClient] = None,
+                 drafts: Optional[DraftCache] = None):
+        """Initialize the message generation service with a web portal client and draft cache."""
+        self.webportal_client = webportal_client or AuraChatWebPortalClient()
+        self.drafts = drafts or draft_cache
+        
+    def draft_response(self, account_id: str, chat_id: str, fan_message_id: Any,
+                       regenerate: bool = False) -> Tuple[str, bool]:
+        """
+        Get the draft answering a chat's last fan message, generating one only if needed.
+        
+        Args:
+            account_id: The ID of the OnlyFans account
+            chat_id: The ID of the chat
+            fan_message_id: ID of the fan message the draft answers
+            regenerate: Generate a new draft even if one is cached
+            
+        Returns:
+            Tuple of (draft text or GENERATE_ERROR, whether it came from the cache)
+        """
+        if not regenerate:
+            cached = self.drafts.get(account_id, chat_id, fan_message_id)
+            if cached is not None:
+                return cached, True
+        text = self.generate_response(account_id, chat_id)
+        if text != GENERATE_ERROR:
+            self.drafts.put(account_id, chat_id, fan_message_id, text)
+        return text, False
+        
+    def draft_history(self, account_id: str, chat_id: str, fan_message_id: Any) -> List[str]:
+        """Get the cached drafts answering a chat's last fan message, oldest first."""
+        return self.drafts.history(account_id, chat_id, fan_message_id)
+        
+    def invalidate_drafts(self, account_id: str, chat_id: str, fan_message_id: Any) -> None:
+        """Drop a chat's cached drafts if they answer an older fan message than this one."""
+        self.drafts.invalidate(account_id, chat_id, fan_message_id)
         
-    def generate_response(self, account_id: str, chat_id: str) -> str:
+    def generate_response(self, account_id: str, chat_id: str, raise_errors: bool = False) -> str:
         """
         Generate a response for a chat.
         
         Args:
             account_id: The ID of the OnlyFans account
             chat_id: The ID of the chat
+            raise_errors: Raise request errors (e.g. when offline) instead of returning GENERATE_ERROR
             
         Returns:
             The generated response content, or 'Generate response error' if generation fails
         """
         try:
-            response = self.webportal_client.generate_response(account_id, chat_id)
+            response = self.webportal_client.generate_response(account_id, chat_id, raise_errors=raise_errors)
             print("Generate response:", response)
             if response and 'text' in response:
                 # Remove HTML tags from content
                 clean_content = re.sub(r'<[^>]+>', '', response['text'])
                 return clean_content
-            return 'Generate response error'
+            return GENERATE_ERROR
+        except requests.exceptions.RequestException:
+            if raise_errors:
+                raise
+            return GENERATE_ERROR
         except Exception as e:
             print(f"Error generating message: {e}")
-            return 'Generate response error' 
\ No newline at end of file
+            return GENERATE_ERROR 
\ No newline at end of file
@@ -0,0 +1,193 @@
+import base64
+import io
+import math
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+import requests
+import tkinter as tk
+from aurachat_helper_app.utils.app_paths import get_data_dir
+from aurachat_helper_app.utils.disk_cache import DiskCache
+from aurachat_helper_app.utils.logger import get_logger
+from aurachat_helper_app.utils.ui_dispatcher import UIDispatcher
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; without it only PNG and GIF images can be shown
+    Image = None
+
+logger = get_logger(__name__)
+
+PNG_SIGNATURE = b'\x89PNG'
+GIF_SIGNATURE = b'GIF8'
+
+def url_cache_key(url: str) -> str:
+    """Cache key for a URL, ignoring the query string that CDNs use for signing."""
+    return urlsplit(url)._replace(query='', fragment='').geturl()
+
+class ImageService:
+    """
+    Loads remote images (fan avatars) as Tk thumbnails without blocking the UI.
+    
+    Downloads and decoding run on a bounded worker pool. Square thumbnails are kept
+    in a content-addressed disk cache and, as PhotoImages, in an LRU memory cache
+    bounded by decoded size. Concurrent requests for the same image share one fetch.
+    """
+    
+    MAX_WORKERS = 4
+    MEMORY_BUDGET_BYTES = 32 * 1024 * 1024
+    DISK_BUDGET_BYTES = 200 * 1024 * 1024
+    REQUEST_TIMEOUT = 15
+    
+    def __init__(self, dispatcher: UIDispatcher, disk_cache: Optional[DiskCache] = None,
+                 max_workers: Optional[int] = None, session: Optional[requests.Session] = None):
+        """
+        Initialize the image service.
+        
+        Args:
+            dispatcher: Dispatcher used to hand decoded images back to the Tk thread
+            disk_cache: Thumbnail cache, by default under the app data directory
+            max_workers: Number of concurrent downloads/decodes
+            session: HTTP session shared with the rest of the app, by default a new one
+        """
+        self.dispatcher = dispatcher
+        self.disk_cache = disk_cache or DiskCache(get_data_dir('image_cache'), self.DISK_BUDGET_BYTES)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or self.MAX_WORKERS, thread_name_prefix='images')
+        self._session = session or requests.Session()
+        self._memory: 'OrderedDict[str, tk.PhotoImage]' = OrderedDict()
+        self._memory_bytes = 0
+        self._pending: Dict[str, List[Callable[[tk.PhotoImage], None]]] = {}
+        self._failed = set()
+        if Image is None:
+            logger.info("Pillow not installed; only PNG and GIF images will be displayed")
+    
+    def load(self, url: str, size: int, callback: Callable[[tk.PhotoImage], None]) -> None:
+        """
+        Request a square thumbnail; must be called on the Tk thread.
+        
+        The callback runs on the Tk thread, immediately on a memory hit, and is not
+        called at all if the image cannot be fetched or decoded.
+        
+        Args:
+            url: The image URL
+            size: Thumbnail edge length in pixels
+            callback: Receives the PhotoImage
+        """
+        if not url:
+            return
+        key = self.thumbnail_key(url, size)
+        self.load_generated(key, size, callback, lambda: self._fetch(url, key, size))
+        
+    def load_generated(self, key: str, size: int, callback: Callable[[tk.PhotoImage], None],
+                       produce: Callable[[], Optional[bytes]]) -> None:
+        """
+        Request a thumbnail produced by a function on the worker pool; must be called on the Tk thread.
+        
+        Args:
+            key: Cache key identifying the thumbnail
+            size: Thumbnail edge length in pixels
+            callback: Receives the PhotoImage on the Tk thread
+            produce: Returns PNG or GIF bytes (or None); runs on a worker thread
+        """
+        photo = self._memory.get(key)
+        if photo is not None:
+            self._memory.move_to_end(key)
+            callback(photo)
+            return
+        if key in self._failed:
+            return
+        if key in self._pending:
+            self._pending[key].append(callback)
+            return
+        self._pending[key] = [callback]
+        self._executor.submit(self._produce, key, size, produce)
+    
+    def thumbnail_key(self, url: str, size: int) -> str:
+        """Cache key of the thumbnail for a URL at a size."""
+        return f"{url_cache_key(url)}@{size}"
+    
+    def _produce(self, key: str, size: int, produce: Callable[[], Optional[bytes]]) -> None:
+        """Run a thumbnail producer and hand the result to the Tk thread (worker thread)."""
+        retry = False
+        try:
+            data = produce()
+        except Exception as e:
+            # Errors such as timeouts may be transient, so later requests try again
+            logger.warning(f"Error loading image {key}: {e}")
+            data, retry = None, True
+        self.dispatcher.call_soon(self._deliver, key, data, size, retry)
+        
+    def _fetch(self, url: str, key: str, size: int) -> Optional[bytes]:
+        """Get a thumbnail from the disk cache or download and downscale it (worker thread)."""
+        data = self.disk_cache.get(key)
+        if data is None:
+            response = self._session.get(url, timeout=self.REQUEST_TIMEOUT)
+            response.raise_for_status()
+            data = self.thumbnail(response.content, size)
+            if data:
+                self.disk_cache.put(key, data)
+        return data
+    
+    def thumbnail(self, raw: bytes, size: int) -> Optional[bytes]:
+        """Downscale and centre-crop an image to a size x size PNG."""
+        if Image is None:
+            # Tk decodes PNG and GIF itself; it is subsampled on delivery
+            return raw if raw[:4] in (PNG_SIGNATURE, GIF_SIGNATURE) else None
+        with Image.open(io.BytesIO(raw)) as image:
+            image.draft('RGB', (size * 2, size * 2))
+            image = image.convert('RGBA')
+            edge = min(image.size)
+            left, top = (image.width - edge) // 2, (image.height - edge) // 2
+            image = image.crop((left, top, left + edge, top + edge)).resize((size, size), Image.LANCZOS)
+            output = io.BytesIO()
+            image.save(output, format='PNG')
+            return output.getvalue()
+    
+    def _deliver(self, key: str, data: Optional[bytes], size: int, retry: bool = False) -> None:
+        """Create the PhotoImage and run waiting callbacks (Tk thread)."""
+        callbacks = self._pending.pop(key, [])
+        photo = None
+        if data:
+            try:
+                photo = tk.PhotoImage(master=self.dispatcher.root, data=base64.b64encode(data))
+                if photo.width() > size:
+                    photo = photo.subsample(math.ceil(photo.width() / size))
+            except tk.TclError as e:
+                logger.warning(f"Could not decode image {key}: {e}")
+                photo = None
+        if photo is None:
+            if not retry:
+                self._failed.add(key)
+            return
+        
+        self._memory[key] = photo
+        self._memory_bytes += photo.width() * photo.height() * 4
+        while self._memory_bytes > self.MEMORY_BUDGET_BYTES and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.width() * evicted.height() * 4
+        
+        for callback in callbacks:
+            try:
+                callback(photo)
+            except tk.TclError:
+                # The widget that asked for the image has been destroyed
+                pass
+    
+    def release(self, keys) -> None:
+        """Drop specific thumbnails from memory, e.g. when the view showing them closes."""
+        for key in keys:
+            photo = self._memory.pop(key, None)
+            if photo is not None:
+                self._memory_bytes -= photo.width() * photo.height() * 4
+                
+    def clear_memory(self) -> None:
+        """Drop all in-memory thumbnails."""
+        self._memory.clear()
+        self._memory_bytes = 0
+        
+    def shutdown(self) -> None:
+        """Cancel queued loads and drop all in-memory thumbnails, e.g. on sign-out."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._pending.clear()
+        self.clear_memory()
\ No newline at end of file
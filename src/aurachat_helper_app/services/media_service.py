@@ -0,0 +1,188 @@
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional
+from urllib.parse import urlsplit
+import requests
+from aurachat_helper_app.models.media_item import MediaItem
+from aurachat_helper_app.services.image_service import ImageService, url_cache_key
+from aurachat_helper_app.utils.app_paths import get_data_dir
+from aurachat_helper_app.utils.disk_cache import DiskCache
+from aurachat_helper_app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class DownloadCancelled(Exception):
+    """Raised inside a download when its media session has been closed."""
+
+class MediaService:
+    """
+    Fetches message media on demand into a bounded disk cache.
+    
+    Thumbnails come from the API's thumb/preview images through the ImageService.
+    Videos without one get a poster frame decoded by ffmpeg (when installed) from
+    a byte-range download of the start of the file. Full media is streamed to disk
+    in chunks and never read into memory.
+    """
+    
+    MAX_WORKERS = 2
+    DISK_BUDGET_BYTES = 1024 * 1024 * 1024
+    HEAD_BYTES = 2 * 1024 * 1024
+    CHUNK_BYTES = 64 * 1024
+    REQUEST_TIMEOUT = 30
+    
+    def __init__(self, image_service: ImageService, disk_cache: Optional[DiskCache] = None,
+                 max_workers: Optional[int] = None, session: Optional[requests.Session] = None):
+        """
+        Initialize the media service.
+        
+        Args:
+            image_service: Service that decodes thumbnails and hands them to the Tk thread
+            disk_cache: Cache for downloaded media, by default under the app data directory
+            max_workers: Number of concurrent media downloads
+            session: HTTP session shared with the rest of the app, by default a new one
+        """
+        self.image_service = image_service
+        self.disk_cache = disk_cache or DiskCache(get_data_dir('media_cache'), self.DISK_BUDGET_BYTES)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or self.MAX_WORKERS, thread_name_prefix='media')
+        self._session = session or requests.Session()
+        self.ffmpeg = shutil.which('ffmpeg')
+    
+    def open_session(self) -> 'MediaSession':
+        """Start tracking media work for one selected chat."""
+        return MediaSession(self)
+    
+    def shutdown(self) -> None:
+        """Cancel queued downloads, e.g. on sign-out; running ones stop when their session closes."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    def download(self, url: str, key: str, cancelled: threading.Event, max_bytes: Optional[int] = None) -> str:
+        """
+        Stream a file (or its first max_bytes) into the disk cache (worker thread).
+        
+        Args:
+            url: The media URL
+            key: Cache key for the download
+            cancelled: Event that aborts the download between chunks
+            max_bytes: Only fetch this many leading bytes, using an HTTP Range request
+        
+        Returns:
+            Path of the cached file
+        """
+        path = self.disk_cache.get_path(key)
+        if path:
+            return path
+        headers = {'Range': f"bytes=0-{max_bytes - 1}"} if max_bytes else {}
+        with self._session.get(url, headers=headers, stream=True, timeout=self.REQUEST_TIMEOUT) as response:
+            response.raise_for_status()
+            
+            def chunks():
+                received = 0
+                for chunk in response.iter_content(self.CHUNK_BYTES):
+                    if cancelled.is_set():
+                        raise DownloadCancelled(url)
+                    yield chunk
+                    received += len(chunk)
+                    if max_bytes and received >= max_bytes:
+                        # The server ignored the Range header
+                        break
+            
+            suffix = os.path.splitext(urlsplit(url).path)[1][:8]
+            return self.disk_cache.put_stream(key, chunks(), suffix)
+    
+    def poster_frame(self, item: MediaItem, size: int, cancelled: threading.Event) -> Optional[bytes]:
+        """Decode a square PNG poster frame from the start of a video (worker thread)."""
+        if not self.ffmpeg or not item.full_url:
+            return None
+        key = f"poster:{url_cache_key(item.full_url)}@{size}"
+        cached = self.disk_cache.get(key)
+        if cached is not None:
+            return cached
+        path = self.download(item.full_url, f"head:{url_cache_key(item.full_url)}", cancelled, self.HEAD_BYTES)
+        result = subprocess.run(
+            [self.ffmpeg, '-v', 'error', '-i', path, '-frames:v', '1',
+             '-vf', f"scale={size}:{size}:force_original_aspect_ratio=increase,crop={size}:{size}",
+             '-f', 'image2pipe', '-vcodec', 'png', '-'],
+            capture_output=True, timeout=30
+        )
+        if result.returncode != 0 or not result.stdout:
+            # Typically an MP4 whose index is at the end of the file
+            logger.debug(f"No poster frame for media {item.id}: {result.stderr[:200]!r}")
+            return None
+        self.disk_cache.put(key, result.stdout, '.png')
+        return result.stdout
+
+class MediaSession:
+    """Media work for one selected chat; closing it cancels downloads and frees thumbnails."""
+    
+    def __init__(self, service: MediaService):
+        self.service = service
+        self.cancelled = threading.Event()
+        self._futures: List[Future] = []
+        self._thumbnail_keys = set()
+    
+    def load_thumbnail(self, item: MediaItem, size: int, callback: Callable) -> None:
+        """
+        Load a thumbnail for a media item; must be called on the Tk thread.
+        
+        Args:
+            item: The media item
+            size: Thumbnail edge length in pixels
+            callback: Receives the PhotoImage on the Tk thread, unless the session is closed first
+        """
+        if self.cancelled.is_set():
+            return
+        
+        def deliver(photo):
+            if not self.cancelled.is_set():
+                callback(photo)
+        
+        images = self.service.image_service
+        url = item.thumb_url or item.preview_url or (None if item.is_video else item.full_url)
+        if url:
+            self._thumbnail_keys.add(images.thumbnail_key(url, size))
+            images.load(url, size, deliver)
+        elif item.is_video and item.full_url:
+            key = f"poster:{url_cache_key(item.full_url)}@{size}"
+            self._thumbnail_keys.add(key)
+            images.load_generated(key, size, deliver,
+                                  lambda: self.service.poster_frame(item, size, self.cancelled))
+    
+    def open_full(self, item: MediaItem, on_ready: Callable[[str], None],
+                  on_error: Optional[Callable[[Exception], None]] = None) -> None:
+        """
+        Stream a media item to the disk cache in the background.
+        
+        Args:
+            item: The media item
+            on_ready: Receives the cached file path, called from the worker thread
+            on_error: Receives the exception if the download fails, called from the worker thread
+        """
+        if self.cancelled.is_set() or not item.full_url:
+            return
+        
+        def run():
+            try:
+                path = self.service.download(item.full_url, f"full:{url_cache_key(item.full_url)}",
+                                             self.cancelled)
+                if not self.cancelled.is_set():
+                    on_ready(path)
+            except DownloadCancelled:
+                logger.debug(f"Download of media {item.id} cancelled")
+            except Exception as e:
+                logger.warning(f"Error downloading media {item.id}: {e}")
+                if on_error:
+                    on_error(e)
+        
+        self._futures.append(self.service._executor.submit(run))
+    
+    def close(self) -> None:
+        """Cancel outstanding downloads and drop this chat's thumbnails from memory (Tk thread)."""
+        self.cancelled.set()
+        for future in self._futures:
+            future.cancel()
+        self._futures.clear()
+        self.service.image_service.release(self._thumbnail_keys)
+        self._thumbnail_keys.clear()
\ No newline at end of file
@@ -1,55 +1,76 @@
+from dataclasses import replace
 from typing import Optional, Dict, Any, List
 from aurachat_helper_app.api.onlyfansapi_client import OnlyFansAPIClient
+from aurachat_helper_app.managers.message_index import ChatMessageIndex, MessageIndexStore
 from aurachat_helper_app.models.message import Message
-import re
+from aurachat_helper_app.services.chat_service import clean_html
 
 class MessageService:
     """Service for handling message-related operations."""
     
-    def __init__(self):
+    def __init__(self, api_client: Optional[OnlyFansAPIClient] = None):
         """Initialize the message service with an API client."""
-        self.api_client = OnlyFansAPIClient()
+        self.api_client = api_client or OnlyFansAPIClient()
+        self.indexes = MessageIndexStore()
+        
+    def index_messages(self, account_id: str, chat_id: str, messages: List[Message]) -> ChatMessageIndex:
+        """
+        Add messages to a chat's index; messages already indexed are skipped.
+        
+        Args:
+            account_id: The ID of the OnlyFans account
+            chat_id: The ID of the chat
+            messages: Messages as returned by the database client, in any order
+            
+        Returns:
+            The chat's index
+        """
+        return self.indexes.add(account_id, chat_id, messages)
+        
+    def last_fan_message(self, account_id: str, chat_id: str) -> Optional[Message]:
+        """
+        Get the last indexed message from a chat's fan with HTML tags removed.
+        
+        Returns:
+            A cleaned copy of the message (the indexed one is never modified), or None
+        """
+        index = self.indexes.get(account_id, chat_id)
+        message = index.last_fan_message if index else None
+        return self._cleaned(message) if message else None
         
     def get_last_fan_message(self, messages: List[Message], fan_id: str) -> Optional[Message]:
         """
-        Get the last message from a fan with HTML tags removed.
+        Get the last message from a fan in a list with HTML tags removed.
         
         Args:
             messages: List of Message objects
             fan_id: The fan's ID to match against
             
         Returns:
-            The last Message from the fan with cleaned content, or None if not found
+            A cleaned copy of the last Message from the fan (the list is not modified), or None if not found
         """
-        # Find the last message from the fan
-        last_fan_message = None
         for msg in reversed(messages):
             if msg.sender == str(fan_id):
-                last_fan_message = msg
-                break
-                
-        if last_fan_message:
-            # Remove HTML tags from the message content
-            last_fan_message.content = self._remove_html_tags(last_fan_message.content)
-            
-        return last_fan_message
+                return self._cleaned(msg)
+        return None
+        
+    def _cleaned(self, message: Message) -> Message:
+        """Copy of a message with HTML tags removed from its content."""
+        return replace(message, content=self._remove_html_tags(message.content))
         
     def _remove_html_tags(self, text: str) -> str:
         """Remove HTML tags from text."""
         if not text:
             return text
-            
-        # Remove <p> and </p> tags
-        text = text.replace('<p>', '').replace('</p>', '')
-        
-        # Remove any remaining HTML tags
-        clean = re.compile('<.*?>')
-        return re.sub(clean, '', text)
+        return clean_html(text)
         
     def get_most_recent_message_text(self, account_id: str, chat_id: str) -> Optional[str]:
         """
         Get the most recent message text from a chat.
         
+        Always asks the API: the chat's index only holds what has been synced to the
+        database and can be behind.
+        
         Args:
             account_id: The ID of the OnlyFans account
             chat_id: The ID of the chat
@@ -58,7 +79,7 @@ class MessageService:
             The text of the most recent message, or None if no messages found
         """
         try:
-            response = self.api_client.get_chat_messages(account_id, chat_id)
+            response = self.api_client.get_chat_messages(account_id, chat_id, limit=1)
             if not response or 'data' not in response or 'list' not in response['data']:
                 return None
                 
@@ -0,0 +1,194 @@
+import threading
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterator, List, Tuple
+from datetime import datetime, timezone
+from aurachat_helper_app.api.onlyfansapi_client import OnlyFansAPIClient
+from aurachat_helper_app.db.db_client import db_client, CHAT_LAYOUT_BUCKETED
+from aurachat_helper_app.db.migrate_chat_buckets import migrate_chat
+from aurachat_helper_app.models.message import Message
+from aurachat_helper_app.models.media_item import MediaItem
+from aurachat_helper_app.services.chat_service import clean_html
+from aurachat_helper_app.services.search_service import SearchService
+from aurachat_helper_app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class _ChatLock:
+    """A chat's sync lock and the number of syncs holding or waiting for it."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = 0
+
+class MessageSyncService:
+    """Service for incrementally syncing chat messages from the OnlyFans API into the database."""
+
+    PAGE_SIZE = 50
+    MAX_PAGES = 20  # Upper bound on pages fetched in a single catch-up of an embedded chat
+
+    def __init__(self, api_client: Optional[OnlyFansAPIClient] = None,
+                 search_service: Optional[SearchService] = None):
+        """Initialize the sync service with an API client and the search index to keep up to date."""
+        self.api_client = api_client or OnlyFansAPIClient()
+        self.db_client = db_client
+        self.search_service = search_service or SearchService()
+        # One sync per chat at a time: a prefetch and an open of the same chat would
+        # otherwise both read the old mark and append the same messages. A chat's lock is
+        # dropped once no sync holds or waits for it
+        self._chat_locks: Dict[Tuple[str, str], _ChatLock] = {}
+        self._locks_lock = threading.Lock()
+
+    def fetch_messages_after(self, account_id: str, chat_id: str, last_message_id: Optional[int],
+                             last_timestamp: Any = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Fetch only the messages newer than a known message.
+
+        Pages back from the newest message until the high-water mark is reached, so the
+        number of requests scales with the number of new messages rather than chat length.
+        Without a mark only the newest page is fetched, filtered by ``last_timestamp``.
+        Embedded chats give up after MAX_PAGES and leave the rest to a portal sync;
+        portal syncs never reach bucketed chats, so those keep paging.
+
+        Args:
+            account_id: The ID of the OnlyFans account
+            chat_id: The ID of the chat
+            last_message_id: ID of the newest message already stored, or None
+            last_timestamp: Timestamp of the newest stored message, used when there is no ID
+
+        Returns:
+            New raw API messages ordered oldest first, or None if a request failed or an
+            embedded chat's mark was not reached within MAX_PAGES (storing only the newest
+            pages would leave a gap that no later sync fills)
+        """
+        new_messages: List[Dict[str, Any]] = []
+        before_id = None
+        since = self._parse_timestamp(last_timestamp)
+        max_pages = None if self.db_client.chat_storage_layout == CHAT_LAYOUT_BUCKETED else self.MAX_PAGES
+
+        pages = 0
+        while True:
+            response = self.api_client.get_chat_messages(account_id, chat_id, limit=self.PAGE_SIZE, before_id=before_id)
+            if not response or 'data' not in response:
+                return None
+
+            page = response['data'].get('list') or []
+            reached_mark = False
+            for message in page:
+                if last_message_id is not None and message.get('id', 0) <= last_message_id:
+                    reached_mark = True
+                    break
+                if last_message_id is None and since is not None:
+                    created = self._parse_timestamp(message.get('createdAt'))
+                    if created is not None and created <= since:
+                        reached_mark = True
+                        break
+                new_messages.append(message)
+
+            if reached_mark or not page or not response['data'].get('hasMore') or last_message_id is None:
+                break
+            pages += 1
+            if max_pages is not None and pages >= max_pages:
+                logger.warning(f"Delta sync for chat {chat_id} did not reach the stored messages within "
+                               f"{max_pages} pages; a portal sync is needed")
+                return None
+            if page[-1].get('id') is None:
+                # Nothing to page back from
+                return None
+            before_id = page[-1].get('id')
+
+        new_messages.reverse()
+        return new_messages
+
+    def sync_chat(self, account_id: str, chat_id: str, known_latest_id: Optional[int] = None) -> Optional[int]:
+        """
+        Merge any messages newer than the stored high-water mark into the database.
+
+        Args:
+            account_id: The ID of the OnlyFans account
+            chat_id: The ID of the chat
+            known_latest_id: Latest message ID known from the chat list; when the stored
+                mark already covers it no request is made
+
+        Returns:
+            Number of messages added, or None if the sync failed or the portal has not
+            synced the chat yet
+        """
+        with self._chat_lock(account_id, chat_id):
+            return self._sync_chat(account_id, chat_id, known_latest_id)
+
+    def _sync_chat(self, account_id: str, chat_id: str, known_latest_id: Optional[int]) -> Optional[int]:
+        try:
+            state = self.db_client.get_chat_sync_state(account_id, chat_id)
+            if (state is None and self.db_client.chat_storage_layout == CHAT_LAYOUT_BUCKETED
+                    and migrate_chat(account_id, chat_id)):
+                # The portal has created the chat since the layout was migrated
+                state = self.db_client.get_chat_sync_state(account_id, chat_id)
+            if state is None:
+                # Only the portal's full sync creates chats; a delta would store just the
+                # newest page, and the chat would never show "Please press Sync"
+                logger.info(f"Chat {chat_id} has not been synced by the portal yet")
+                return None
+            last_stored = state.get('last_message') or {}
+            # Portal syncs store messages without moving last_message_id, so the newest
+            # stored message can be ahead of the mark
+            marks = [mark for mark in (state.get('last_message_id'), last_stored.get('id')) if mark is not None]
+            last_message_id = max(marks) if marks else None
+            if last_message_id is not None and known_latest_id and known_latest_id <= last_message_id:
+                return 0
+
+            raw_messages = self.fetch_messages_after(account_id, chat_id, last_message_id, last_stored.get('timestamp'))
+            if raw_messages is None:
+                return None
+            if not raw_messages:
+                return 0
+
+            messages = [self.to_message(raw) for raw in raw_messages]
+            added = self.db_client.append_chat_messages(account_id, chat_id, messages, raw_messages[-1].get('id'))
+            self.search_service.index_messages(account_id, chat_id, messages)
+            logger.info(f"Delta sync added {added} messages to chat {chat_id}")
+            return added
+        except Exception as e:
+            logger.error(f"Error delta syncing chat {chat_id}: {e}")
+            return None
+
+    @contextmanager
+    def _chat_lock(self, account_id: str, chat_id: str) -> Iterator[None]:
+        """Hold the lock serializing syncs of one chat."""
+        key = (account_id, str(chat_id))
+        with self._locks_lock:
+            chat_lock = self._chat_locks.get(key)
+            if chat_lock is None:
+                chat_lock = self._chat_locks[key] = _ChatLock()
+            chat_lock.users += 1
+        try:
+            with chat_lock.lock:
+                yield
+        finally:
+            with self._locks_lock:
+                chat_lock.users -= 1
+                if not chat_lock.users:
+                    del self._chat_locks[key]
+
+    def to_message(self, data: Dict[str, Any]) -> Message:
+        """Convert a raw API message into a database Message in the portal's stored shape."""
+        from_user = data.get('fromUser') or {}
+        created = self._parse_timestamp(data.get('createdAt'))
+        return Message(
+            content=clean_html(data.get('text', '') or ''),
+            # Naive UTC, as the portal stores it and pymongo returns it
+            timestamp=created.astimezone(timezone.utc).replace(tzinfo=None) if created else data.get('createdAt', ''),
+            sender=str(from_user.get('id', '')),
+            id=data.get('id'),
+            media=[MediaItem.from_dict(item) for item in data.get('media') or []]
+        )
+
+    def _parse_timestamp(self, value: Any) -> Optional[datetime]:
+        """Parse a stored or API timestamp into an aware datetime, if possible."""
+        if not value:
+            return None
+        try:
+            parsed = value if isinstance(value, datetime) else datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        # Mongo returns naive UTC datetimes; make everything comparable
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
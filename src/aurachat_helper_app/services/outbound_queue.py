@@ -0,0 +1,350 @@
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import requests
+from aurachat_helper_app.api.aurachat_webportal_client import AuraChatWebPortalClient
+from aurachat_helper_app.services.generate_message_service import GENERATE_ERROR, GenerateMessageService
+from aurachat_helper_app.utils.app_paths import get_data_dir
+from aurachat_helper_app.utils.logger import get_logger
+from aurachat_helper_app.utils.work_scheduler import WORK_INTERACTIVE, WORK_PREFETCH, WorkScheduler
+
+logger = get_logger(__name__)
+
+OP_GENERATE = 'generate'
+OP_SYNC = 'sync'
+
+# Lower is sent first: the operator is waiting on a generated draft
+PRIORITIES = {OP_GENERATE: 0, OP_SYNC: 1}
+# Drafts generated ahead of time for chats the operator has not opened yet
+PRIORITY_PREFETCH = 2
+
+STATUS_QUEUED = 'queued'
+STATUS_SENDING = 'sending'
+STATUS_WAITING = 'waiting'  # Offline or the portal is erroring; retried later
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+@dataclass
+class OutboundRequest:
+    """A sync or generate request for one chat, waiting to be sent to the portal."""
+    kind: str
+    account_id: str
+    chat_id: str
+    fan_message_id: Any = None
+    priority: int = 0
+    enqueued_at: float = field(default_factory=time.time)
+    attempts: int = 0
+    retry_at: float = 0.0
+    status: str = STATUS_QUEUED
+    
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        """Requests are deduplicated per kind and chat."""
+        return self.kind, self.account_id, self.chat_id
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'OutboundRequest':
+        request = cls(**{name: data[name] for name in cls.__dataclass_fields__ if name in data})
+        # Whatever was in flight when the app stopped is sent again
+        request.status = STATUS_QUEUED
+        return request
+
+# Receives the request (its status updated) and, for a finished generate request, the draft
+QueueListener = Callable[[OutboundRequest, Optional[str]], None]
+
+class OutboundQueue:
+    """
+    Durable queue of portal sync and generate requests.
+    
+    Requests are persisted to disk as soon as they are queued, deduplicated per
+    chat (one queued while the chat's request is being sent is kept as its
+    follow-up and queued once that finishes), and sent in priority order through the work scheduler (prefetched drafts
+    as prefetch work, the rest as interactive). A connection error marks
+    the queue offline: nothing more is sent until a single request, retried with
+    backoff, gets through, after which the backlog drains at the normal
+    concurrency. Portal errors (5xx, 429) are retried per request; other
+    failures drop the request.
+    """
+    
+    MAX_CONCURRENCY = 2
+    RETRY_BASE_S = 2.0
+    RETRY_MAX_S = 60.0
+    MAX_ATTEMPTS = 5
+    
+    def __init__(self, webportal_client: AuraChatWebPortalClient, generate_service: GenerateMessageService,
+                 path: Optional[str] = None, max_concurrency: Optional[int] = None,
+                 scheduler: Optional[WorkScheduler] = None):
+        """
+        Initialize the queue; requests persisted by an earlier run are loaded.
+        
+        Args:
+            webportal_client: Client used to send sync requests
+            generate_service: Service used to generate drafts and cache them
+            path: Queue file, by default outbound_queue.json in the app data directory
+            max_concurrency: Number of requests sent at once while online
+            scheduler: Scheduler the requests are sent on, by default one of its own
+        """
+        self.webportal_client = webportal_client
+        self.generate_service = generate_service
+        self.path = path or os.path.join(get_data_dir(), 'outbound_queue.json')
+        self.max_concurrency = max_concurrency or self.MAX_CONCURRENCY
+        self.online = True
+        self._offline_attempts = 0
+        self._retry_at = 0.0
+        self._requests: Dict[Tuple[str, str, str], OutboundRequest] = {}
+        # Requests made while the request with the same key was being sent
+        self._follow_ups: Dict[Tuple[str, str, str], OutboundRequest] = {}
+        self._in_flight = 0
+        self._listeners: List[QueueListener] = []
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self._owns_scheduler = scheduler is None
+        self.scheduler = scheduler or WorkScheduler()
+        self._load()
+    
+    def start(self) -> None:
+        """Start sending; safe to call more than once."""
+        with self._condition:
+            if self._thread is None and not self._stopped:
+                self._thread = threading.Thread(target=self._run, daemon=True, name='outbound-queue')
+                self._thread.start()
+    
+    def enqueue(self, kind: str, account_id: str, chat_id: str, fan_message_id: Any = None,
+                priority: Optional[int] = None) -> OutboundRequest:
+        """
+        Queue a request, or update the chat's pending request of the same kind.
+        
+        While that request is being sent it may already be stale (the fan wrote again,
+        or more messages arrived), so the new one is kept as its follow-up instead.
+        
+        Args:
+            kind: OP_SYNC or OP_GENERATE
+            account_id: The ID of the OnlyFans account
+            chat_id: The ID of the chat
+            fan_message_id: For generate requests, the fan message the draft answers
+            priority: Overrides the kind's priority, e.g. PRIORITY_PREFETCH; a pending request
+                only ever moves up
+        
+        Returns:
+            The pending request
+        """
+        priority = PRIORITIES[kind] if priority is None else priority
+        with self._condition:
+            key = (kind, account_id, chat_id)
+            request = self._requests.get(key)
+            if request is not None and request.status == STATUS_SENDING:
+                request = self._follow_ups.get(key)
+                if request is None:
+                    request = self._follow_ups[key] = OutboundRequest(kind, account_id, chat_id, fan_message_id,
+                                                                      priority)
+            if request is None:
+                request = OutboundRequest(kind, account_id, chat_id, fan_message_id, priority)
+                self._requests[request.key] = request
+            else:
+                request.fan_message_id = fan_message_id
+                request.priority = min(request.priority, priority)
+            self._save()
+            self._condition.notify_all()
+        self._notify(request)
+        return request
+    
+    def pending(self, account_id: Optional[str] = None) -> List[OutboundRequest]:
+        """Requests not yet sent, in the order they will be sent."""
+        with self._condition:
+            requests_ = [request for request in [*self._requests.values(), *self._follow_ups.values()]
+                         if account_id is None or request.account_id == account_id]
+        return sorted(requests_, key=lambda request: (request.priority, request.enqueued_at))
+    
+    def add_listener(self, listener: QueueListener) -> None:
+        """Register a callback for request status changes; it runs on a worker thread."""
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: QueueListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def clear(self) -> None:
+        """Drop all pending requests, e.g. on sign-out."""
+        with self._condition:
+            self._requests.clear()
+            self._follow_ups.clear()
+            self._save()
+    
+    @staticmethod
+    def discard_saved(path: Optional[str] = None) -> None:
+        """Delete the queue file without loading it, e.g. on sign-out before the queue was used."""
+        try:
+            os.remove(path or os.path.join(get_data_dir(), 'outbound_queue.json'))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Error removing outbound queue: {e}")
+    
+    def shutdown(self) -> None:
+        """Stop sending; pending requests stay on disk for the next run."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._owns_scheduler:
+            self.scheduler.shutdown()
+        else:
+            self.scheduler.cancel(group='outbound')
+    
+    def _run(self) -> None:
+        """Hand ready requests to the scheduler in priority order (queue thread)."""
+        while True:
+            with self._condition:
+                request, wait = self._next_ready()
+                while request is None and not self._stopped:
+                    self._condition.wait(wait)
+                    request, wait = self._next_ready()
+                if self._stopped:
+                    return
+                request.status = STATUS_SENDING
+                self._in_flight += 1
+            self._notify(request)
+            work_class = WORK_PREFETCH if request.priority >= PRIORITY_PREFETCH else WORK_INTERACTIVE
+            try:
+                self.scheduler.submit(work_class, self._send, request, account_id=request.account_id,
+                                      group='outbound')
+            except RuntimeError:
+                # The scheduler was shut down (sign-out); the request stays saved
+                return
+    
+    def _next_ready(self) -> Tuple[Optional[OutboundRequest], Optional[float]]:
+        """The next request to send and, if none is ready, how long to wait; the caller holds the lock."""
+        # Offline, a single request probes for connectivity
+        limit = self.max_concurrency if self.online else 1
+        if self._in_flight >= limit:
+            return None, None
+        now = time.time()
+        if self._retry_at > now:
+            return None, self._retry_at - now
+        ready = [request for request in self._requests.values() if request.status != STATUS_SENDING]
+        if not ready:
+            return None, None
+        waiting = [request for request in ready if request.retry_at <= now]
+        if not waiting:
+            return None, min(request.retry_at for request in ready) - now
+        return min(waiting, key=lambda request: (request.priority, request.enqueued_at)), None
+    
+    def _send(self, request: OutboundRequest) -> None:
+        """Send one request and record the outcome (worker thread)."""
+        result = None
+        offline = False
+        try:
+            result = self._execute(request)
+            status = STATUS_DONE
+        except (requests.ConnectionError, requests.Timeout) as e:
+            logger.warning(f"Portal unreachable, keeping {request.kind} for chat {request.chat_id} queued: {e}")
+            status = STATUS_WAITING
+            offline = True
+        except requests.HTTPError as e:
+            code = e.response.status_code if e.response is not None else 0
+            retryable = code >= 500 or code == 429
+            if retryable and request.attempts + 1 < self.MAX_ATTEMPTS:
+                status = STATUS_WAITING
+            else:
+                logger.error(f"Giving up on {request.kind} for chat {request.chat_id}: {e}")
+                status = STATUS_FAILED
+        except Exception as e:
+            logger.error(f"Error sending {request.kind} for chat {request.chat_id}: {e}")
+            status = STATUS_FAILED
+        
+        with self._condition:
+            self._in_flight -= 1
+            request.status = status
+            if offline:
+                # Hold everything back; the next probe goes out after the backoff
+                self.online = False
+                self._offline_attempts += 1
+                self._retry_at = time.time() + self._backoff(self._offline_attempts)
+            elif status == STATUS_WAITING:
+                request.attempts += 1
+                request.retry_at = time.time() + self._backoff(request.attempts)
+            elif status == STATUS_DONE:
+                if not self.online:
+                    logger.info("Portal reachable again, flushing queued requests")
+                self.online = True
+                self._offline_attempts = 0
+                self._retry_at = 0.0
+            follow_up = self._follow_ups.pop(request.key, None)
+            if status in (STATUS_DONE, STATUS_FAILED) and self._requests.get(request.key) is request:
+                del self._requests[request.key]
+                if follow_up and self._needs_follow_up(request, status, follow_up):
+                    self._requests[follow_up.key] = follow_up
+                else:
+                    follow_up = None
+            elif follow_up:
+                # Retried later anyway: with the newer details
+                request.fan_message_id = follow_up.fan_message_id
+                request.priority = min(request.priority, follow_up.priority)
+                follow_up = None
+            self._save()
+            self._condition.notify_all()
+        self._notify(request, result)
+        if follow_up:
+            self._notify(follow_up)
+    
+    def _needs_follow_up(self, request: OutboundRequest, status: str, follow_up: OutboundRequest) -> bool:
+        """Whether a follow-up still has to be sent after its request finished."""
+        # A prefetched draft for the fan message that was just answered adds nothing
+        return not (status == STATUS_DONE and request.kind == OP_GENERATE
+                    and follow_up.fan_message_id == request.fan_message_id
+                    and follow_up.priority >= PRIORITY_PREFETCH)
+    
+    def _backoff(self, attempts: int) -> float:
+        return min(self.RETRY_MAX_S, self.RETRY_BASE_S * 2 ** (attempts - 1))
+    
+    def _execute(self, request: OutboundRequest) -> Optional[str]:
+        """Send a request; raises requests errors so they can be retried."""
+        if request.kind == OP_SYNC:
+            self.webportal_client.sync_messages(request.account_id, request.chat_id, raise_errors=True)
+            return None
+        text = self.generate_service.generate_response(request.account_id, request.chat_id, raise_errors=True)
+        if text == GENERATE_ERROR:
+            raise ValueError("The portal returned no draft")
+        if request.fan_message_id is not None:
+            self.generate_service.drafts.put(request.account_id, request.chat_id, request.fan_message_id, text)
+        return text
+    
+    def _notify(self, request: OutboundRequest, result: Optional[str] = None) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(request, result)
+            except Exception as e:
+                logger.error(f"Error in outbound queue listener: {e}")
+    
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as queue_file:
+                stored = json.load(queue_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable outbound queue: {e}")
+            return
+        for data in stored.get('requests', []):
+            try:
+                request = OutboundRequest.from_dict(data)
+            except TypeError:
+                continue
+            self._requests[request.key] = request
+        if self._requests:
+            logger.info(f"Loaded {len(self._requests)} queued portal requests")
+    
+    def _save(self) -> None:
+        """Write the pending requests atomically; the caller holds the lock."""
+        temp_path = self.path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as queue_file:
+                # A follow-up comes after its request, so it replaces it when loaded
+                requests_ = [*self._requests.values(), *self._follow_ups.values()]
+                json.dump({'requests': [asdict(request) for request in requests_]}, queue_file)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.error(f"Error saving outbound queue: {e}")
\ No newline at end of file
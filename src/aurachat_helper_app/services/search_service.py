@@ -0,0 +1,62 @@
+from typing import Optional, List, Iterable, Tuple
+from aurachat_helper_app.db.search_index import search_index, SearchIndex, SearchResult
+from aurachat_helper_app.models.message import Message
+from aurachat_helper_app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class SearchService:
+    """Service for keeping the local search index up to date and querying it."""
+
+    def __init__(self, index: Optional[SearchIndex] = None):
+        """Initialize the search service with the shared on-disk index."""
+        self.index = index or search_index
+
+    def index_chats(self, account_id: str, chats: Iterable[Tuple[str, str]]) -> None:
+        """
+        Index fan display names for an account's chats.
+
+        Args:
+            account_id: The ID of the OnlyFans account
+            chats: (chat_id, display_name) pairs
+        """
+        try:
+            self.index.upsert_chats(account_id, chats)
+        except Exception as e:
+            logger.error(f"Error indexing chats for account {account_id}: {e}")
+
+    def index_messages(self, account_id: str, chat_id: str, messages: List[Message]) -> int:
+        """
+        Add any messages not yet indexed for a chat.
+
+        Args:
+            account_id: The ID of the OnlyFans account
+            chat_id: The ID of the chat
+            messages: Messages as returned by the database client
+
+        Returns:
+            Number of newly indexed messages
+        """
+        try:
+            return self.index.add_messages(account_id, chat_id, messages)
+        except Exception as e:
+            logger.error(f"Error indexing messages for chat {chat_id}: {e}")
+            return 0
+
+    def search(self, query: str, account_id: Optional[str] = None, limit: int = 50) -> List[SearchResult]:
+        """
+        Search chats by fan name and message content.
+
+        Args:
+            query: The query text; quote phrases, end a word with * for prefix matching
+            account_id: Restrict results to this account, if given
+            limit: Maximum number of message results
+
+        Returns:
+            Ranked search results, one entry per matching name or message
+        """
+        try:
+            return self.index.search(query, account_id, limit)
+        except Exception as e:
+            logger.error(f"Error searching for '{query}': {e}")
+            return []
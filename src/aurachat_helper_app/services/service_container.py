@@ -0,0 +1,156 @@
+import os
+from functools import cached_property
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from aurachat_helper_app.app_config import AppConfig, get_config
+from aurachat_helper_app.api.onlyfansapi_client import OnlyFansAPIClient
+from aurachat_helper_app.api.aurachat_webportal_client import AuraChatWebPortalClient
+from aurachat_helper_app.api.transport import install_transport
+from aurachat_helper_app.db.db_client import db_client
+from aurachat_helper_app.services.account_sync_service import AccountSyncService
+from aurachat_helper_app.services.chat_prefetcher import ChatPrefetcher
+from aurachat_helper_app.services.chat_service import ChatService
+from aurachat_helper_app.services.message_service import MessageService
+from aurachat_helper_app.services.message_sync_service import MessageSyncService
+from aurachat_helper_app.services.generate_message_service import GenerateMessageService
+from aurachat_helper_app.services.search_service import SearchService
+from aurachat_helper_app.services.image_service import ImageService
+from aurachat_helper_app.services.media_service import MediaService
+from aurachat_helper_app.services.outbound_queue import OutboundQueue
+from aurachat_helper_app.utils.app_paths import get_data_dir
+from aurachat_helper_app.utils.logger import get_logger
+from aurachat_helper_app.utils.rate_limiter import HostRateLimiter, RateLimitedAdapter
+from aurachat_helper_app.utils.ui_dispatcher import UIDispatcher, get_ui_dispatcher
+from aurachat_helper_app.utils.work_scheduler import WorkScheduler
+
+logger = get_logger(__name__)
+
+class ServiceContainer:
+    """
+    Owns the clients and services shared by the controllers of one signed-in session.
+    
+    Everything is built on first use and then reused, so opening an account or a chat
+    does not create new API clients, HTTP connection pools or caches. All HTTP clients
+    share one keep-alive session, on which API traffic can be recorded or replayed
+    (AURACHAT_TRANSPORT), and database and API work shares one priority scheduler, so
+    background work never crowds out the operator's own requests. The root controller
+    creates a container per session and shuts it down on sign-out.
+    """
+    
+    HTTP_POOL_SIZE = 16
+    
+    def __init__(self, root=None, config: Optional[AppConfig] = None,
+                 rate_limiter: Optional[HostRateLimiter] = None):
+        """
+        Initialize the container.
+        
+        Args:
+            root: The Tk root window; needed only by the UI-facing services
+            config: App configuration, by default the process-wide one
+            rate_limiter: Per-host request rate limits applied to every HTTP client
+        """
+        self.root = root
+        self.config = config or get_config()
+        self.db_client = db_client
+        self.http_session = requests.Session()
+        if rate_limiter:
+            adapter = RateLimitedAdapter(rate_limiter, pool_connections=self.HTTP_POOL_SIZE,
+                                         pool_maxsize=self.HTTP_POOL_SIZE)
+        else:
+            adapter = HTTPAdapter(pool_connections=self.HTTP_POOL_SIZE, pool_maxsize=self.HTTP_POOL_SIZE)
+        self.http_session.mount('https://', adapter)
+        self.http_session.mount('http://', adapter)
+        install_transport(self.http_session, self.config.transport_mode,
+                          self.config.transport_file or os.path.join(get_data_dir(), 'api_recording.jsonl.gz'),
+                          [self.config.onlyfansapi_base_url, self.config.portal_url],
+                          self.config.replay_latency_scale)
+        self.closed = False
+    
+    @cached_property
+    def work_scheduler(self) -> WorkScheduler:
+        return WorkScheduler()
+    
+    @cached_property
+    def onlyfans_api(self) -> OnlyFansAPIClient:
+        return OnlyFansAPIClient(self.config, self.http_session)
+    
+    @cached_property
+    def webportal_client(self) -> AuraChatWebPortalClient:
+        return AuraChatWebPortalClient(self.config.portal_url, self.http_session)
+    
+    @cached_property
+    def search_service(self) -> SearchService:
+        return SearchService()
+    
+    @cached_property
+    def chat_service(self) -> ChatService:
+        return ChatService(self.onlyfans_api)
+    
+    @cached_property
+    def message_service(self) -> MessageService:
+        return MessageService(self.onlyfans_api)
+    
+    @cached_property
+    def message_sync_service(self) -> MessageSyncService:
+        return MessageSyncService(self.onlyfans_api, self.search_service)
+    
+    @cached_property
+    def generate_message_service(self) -> GenerateMessageService:
+        return GenerateMessageService(self.webportal_client)
+    
+    @cached_property
+    def account_sync_service(self) -> AccountSyncService:
+        return AccountSyncService(self.webportal_client, self.work_scheduler)
+    
+    @cached_property
+    def outbound_queue(self) -> OutboundQueue:
+        # Started right away so requests persisted by an earlier run are flushed
+        queue = OutboundQueue(self.webportal_client, self.generate_message_service, scheduler=self.work_scheduler)
+        queue.start()
+        return queue
+    
+    @cached_property
+    def chat_prefetcher(self) -> ChatPrefetcher:
+        return ChatPrefetcher(self.db_client, self.message_sync_service, self.message_service,
+                              self.search_service, self.generate_message_service, self.outbound_queue,
+                              self.work_scheduler)
+    
+    @cached_property
+    def dispatcher(self) -> UIDispatcher:
+        return get_ui_dispatcher(self.root)
+    
+    @cached_property
+    def image_service(self) -> ImageService:
+        return ImageService(self.dispatcher, session=self.http_session)
+    
+    @cached_property
+    def media_service(self) -> MediaService:
+        return MediaService(self.image_service, session=self.http_session)
+    
+    def shutdown(self, discard_queued: bool = False) -> None:
+        """
+        Stop background work and release connections and caches; the container is unusable afterwards.
+        
+        Args:
+            discard_queued: Drop queued portal requests (on sign-out) instead of keeping them for the next run
+        """
+        if self.closed:
+            return
+        self.closed = True
+        if discard_queued:
+            if 'outbound_queue' in self.__dict__:
+                self.outbound_queue.clear()
+            else:
+                OutboundQueue.discard_saved()
+        # Only shut down what was actually built
+        for name in ('chat_prefetcher', 'outbound_queue', 'account_sync_service', 'work_scheduler',
+                     'media_service', 'image_service'):
+            service = self.__dict__.get(name)
+            if service is not None:
+                try:
+                    service.shutdown()
+                except Exception as e:
+                    logger.error(f"Error shutting down {name}: {e}")
+        self.http_session.close()
+        logger.info("Service container shut down")
\ No newline at end of file
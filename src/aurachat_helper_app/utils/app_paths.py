@@ -0,0 +1,7 @@
+import os
+
+def get_data_dir(*parts: str) -> str:
+    """Get a directory under the application data directory in the user's home, creating it if needed."""
+    path = os.path.join(os.path.expanduser('~/aurachat_data'), *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,102 @@
+import gc
+import threading
+import weakref
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+from ..app_config import get_config
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+class Diagnostics:
+    """
+    Counts live Tk widgets and tracked objects per screen to catch leaks across navigation.
+    
+    Enabled with AURACHAT_DIAGNOSTICS=1. Objects are tracked through weak references, so
+    tracking never keeps anything alive; when disabled, tracking and snapshots do nothing.
+    A screen is flagged when a count has grown on each of its last GROWTH_VISITS visits.
+    """
+    
+    GROWTH_VISITS = 3
+    
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._tracked: Dict[str, weakref.WeakSet] = defaultdict(weakref.WeakSet)
+        self._history: Dict[str, List[Dict[str, int]]] = defaultdict(list)
+        self._lock = threading.Lock()
+    
+    def track(self, obj: Any, kind: Optional[str] = None) -> None:
+        """Count an object under a kind (its class name by default) while it is alive."""
+        if self.enabled:
+            with self._lock:
+                self._tracked[kind or type(obj).__name__].add(obj)
+    
+    def track_all(self, objects: Iterable[Any], kind: str) -> None:
+        """Track many objects of one kind."""
+        if self.enabled:
+            with self._lock:
+                tracked = self._tracked[kind]
+                for obj in objects:
+                    tracked.add(obj)
+    
+    def count_widgets(self, root) -> int:
+        """Count the live Tk widgets under a window, including the window itself."""
+        count, pending = 0, [root]
+        while pending:
+            widget = pending.pop()
+            count += 1
+            pending.extend(widget.winfo_children())
+        return count
+    
+    def counts(self, root) -> Dict[str, int]:
+        """Live widget and tracked object counts, after a full garbage collection."""
+        gc.collect()
+        with self._lock:
+            counts = {kind: len(objects) for kind, objects in sorted(self._tracked.items())}
+        counts['widgets'] = self.count_widgets(root)
+        return counts
+    
+    def snapshot(self, screen: str, root) -> Optional[Dict[str, int]]:
+        """
+        Record the counts for a visit to a screen and warn about steady growth.
+        
+        Args:
+            screen: Name of the screen just shown
+            root: The Tk root window
+        
+        Returns:
+            The counts, or None when diagnostics are disabled
+        """
+        if not self.enabled:
+            return None
+        counts = self.counts(root)
+        history = self._history[screen]
+        history.append(counts)
+        del history[:-(self.GROWTH_VISITS + 1)]
+        logger.info(f"Diagnostics [{screen}]: " + ", ".join(f"{kind}={count}" for kind, count in counts.items()))
+        grown = self.growth(history)
+        if grown:
+            logger.warning(f"Possible leak on the {screen} screen; grew on each of the last "
+                           f"{self.GROWTH_VISITS} visits: " + ", ".join(
+                               f"{kind} {first}->{last}" for kind, (first, last) in grown.items()))
+        return counts
+    
+    def schedule_snapshot(self, screen: str, widget) -> None:
+        """Take a snapshot once Tk is idle, after the navigation has finished tearing down."""
+        if self.enabled:
+            root = widget.winfo_toplevel()
+            root.after_idle(self.snapshot, screen, root)
+    
+    def growth(self, history: List[Dict[str, int]]) -> Dict[str, tuple]:
+        """Counts that increased between every pair of consecutive visits in the history."""
+        if len(history) <= self.GROWTH_VISITS:
+            return {}
+        grown = {}
+        for kind in history[-1]:
+            values = [counts.get(kind, 0) for counts in history]
+            if all(later > earlier for earlier, later in zip(values, values[1:])):
+                grown[kind] = (values[0], values[-1])
+        return grown
+
+# Create a global instance
+diagnostics = Diagnostics(get_config().diagnostics)
\ No newline at end of file
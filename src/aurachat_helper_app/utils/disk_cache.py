@@ -0,0 +1,158 @@
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Iterable, Optional
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+class DiskCache:
+    """
+    Content-addressed file cache with a total size bound.
+    
+    Content is stored once under blobs/<sha256>, and each cache key has a small
+    ref file pointing at its blob, so identical images fetched from different
+    (e.g. re-signed) URLs share storage. When the cache grows past its budget the
+    least recently used blobs are deleted; refs to deleted blobs are dropped lazily.
+    """
+    
+    def __init__(self, directory: str, max_bytes: int):
+        """
+        Initialize the cache.
+        
+        Args:
+            directory: Directory to store the cache in; created if missing
+            max_bytes: Total size of stored blobs to keep
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._blobs_dir = os.path.join(directory, 'blobs')
+        self._refs_dir = os.path.join(directory, 'refs')
+        os.makedirs(self._blobs_dir, exist_ok=True)
+        os.makedirs(self._refs_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+    
+    def _ref_path(self, key: str) -> str:
+        return os.path.join(self._refs_dir, hashlib.sha1(key.encode('utf-8')).hexdigest())
+    
+    def get_path(self, key: str) -> Optional[str]:
+        """
+        Get the path of the cached file for a key, marking it recently used.
+        
+        Returns:
+            The blob path, or None on a miss
+        """
+        ref_path = self._ref_path(key)
+        try:
+            with open(ref_path, 'r') as ref:
+                digest = ref.read().strip()
+        except OSError:
+            return None
+        blob_path = os.path.join(self._blobs_dir, digest)
+        try:
+            os.utime(blob_path)
+        except OSError:
+            # The blob was evicted
+            self._remove_file(ref_path)
+            return None
+        return blob_path
+    
+    def get(self, key: str) -> Optional[bytes]:
+        """Get the cached bytes for a key, or None on a miss."""
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as blob:
+                return blob.read()
+        except OSError:
+            return None
+    
+    def put(self, key: str, data: bytes, suffix: str = '') -> str:
+        """Store bytes under a key and return the blob path."""
+        return self.put_stream(key, [data], suffix)
+    
+    def put_stream(self, key: str, chunks: Iterable[bytes], suffix: str = '') -> str:
+        """
+        Store streamed content under a key without holding it in memory.
+        
+        Args:
+            key: The cache key
+            chunks: Content chunks, e.g. from a streamed HTTP response
+            suffix: File extension for the blob, so other programs can open it
+        
+        Returns:
+            The blob path
+        """
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=self._blobs_dir, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as temp:
+                for chunk in chunks:
+                    if chunk:
+                        digest.update(chunk)
+                        temp.write(chunk)
+                        size += len(chunk)
+            blob_name = digest.hexdigest() + suffix
+            blob_path = os.path.join(self._blobs_dir, blob_name)
+            if os.path.exists(blob_path):
+                os.remove(temp_path)
+                os.utime(blob_path)
+                size = 0
+            else:
+                os.replace(temp_path, blob_path)
+        except BaseException:
+            self._remove_file(temp_path)
+            raise
+        
+        ref_path = self._ref_path(key)
+        temp_ref = ref_path + '.part'
+        with open(temp_ref, 'w') as ref:
+            ref.write(blob_name)
+        os.replace(temp_ref, ref_path)
+        
+        with self._lock:
+            self._total_bytes = self._scan_size() if self._total_bytes is None else self._total_bytes + size
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            self.prune()
+        return blob_path
+    
+    def remove(self, key: str) -> None:
+        """Forget a key; its blob is left for eviction since other keys may share it."""
+        self._remove_file(self._ref_path(key))
+    
+    def prune(self, target_bytes: Optional[int] = None) -> None:
+        """
+        Delete least recently used blobs until the cache is under a target size.
+        
+        Args:
+            target_bytes: Size to prune down to, by default 90% of the budget
+        """
+        target = int(self.max_bytes * 0.9) if target_bytes is None else target_bytes
+        with self._lock:
+            blobs = []
+            for entry in os.scandir(self._blobs_dir):
+                if entry.is_file() and not entry.name.endswith('.part'):
+                    stat = entry.stat()
+                    blobs.append((stat.st_mtime, stat.st_size, entry.path))
+            total = sum(size for _, size, _ in blobs)
+            for _, size, path in sorted(blobs):
+                if total <= target:
+                    break
+                self._remove_file(path)
+                total -= size
+            self._total_bytes = total
+        logger.debug(f"Pruned disk cache {self.directory} to {total} bytes")
+    
+    def _scan_size(self) -> int:
+        return sum(entry.stat().st_size for entry in os.scandir(self._blobs_dir) if entry.is_file())
+    
+    def _remove_file(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
\ No newline at end of file
@@ -0,0 +1,73 @@
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+
+class TokenBucket:
+    """Token bucket allowing `rate` acquisitions per second with bursts of up to `burst`."""
+    
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """
+        Take a token, sleeping until one is available.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+class HostRateLimiter:
+    """Per-host token buckets; hosts without a configured rate are not limited."""
+    
+    def __init__(self, rates: Optional[Dict[str, float]] = None, default_rate: Optional[float] = None):
+        """
+        Initialize the limiter.
+        
+        Args:
+            rates: Requests per second keyed by host (netloc, e.g. 'example.com:443')
+            default_rate: Requests per second for any other host; None leaves them unlimited
+        """
+        self.rates = dict(rates or {})
+        self.default_rate = default_rate
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+    
+    def acquire(self, host: str) -> float:
+        """Wait for a request slot for a host; returns the seconds spent waiting."""
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate = self.rates.get(host, self.default_rate)
+                if not rate:
+                    return 0.0
+                bucket = self._buckets[host] = TokenBucket(rate)
+        return bucket.acquire()
+
+class RateLimitedAdapter(HTTPAdapter):
+    """Transport adapter that holds each request until its host's rate limit allows it."""
+    
+    def __init__(self, limiter: HostRateLimiter, **kwargs):
+        self.limiter = limiter
+        super().__init__(**kwargs)
+    
+    def send(self, request, **kwargs):
+        self.limiter.acquire(urlsplit(request.url).netloc)
+        return super().send(request, **kwargs)
\ No newline at end of file
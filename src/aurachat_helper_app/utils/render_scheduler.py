@@ -0,0 +1,144 @@
+import time
+from collections import deque
+from typing import Any, Callable, Iterable, Optional
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+class RenderTask:
+    """Items waiting to be rendered into one container; more can be added while it runs."""
+    
+    def __init__(self, scheduler: 'RenderScheduler', render: Callable[[Any], None], first_chunk: int,
+                 on_done: Optional[Callable[[], None]]):
+        self.scheduler = scheduler
+        self.render = render
+        self.first_chunk = first_chunk
+        self.on_done = on_done
+        self.pending = deque()
+        self.rendered = 0
+        self.complete = False
+        self.cancelled = False
+    
+    @property
+    def active(self) -> bool:
+        return not self.cancelled and not (self.complete and not self.pending)
+    
+    def extend(self, items: Iterable[Any], last: bool = False) -> None:
+        """
+        Queue items for rendering (Tk thread).
+        
+        Args:
+            items: Items passed to the render function in order
+            last: No more items will follow; the done callback runs once these are rendered
+        """
+        if self.cancelled:
+            return
+        self.pending.extend(items)
+        self.complete = self.complete or last
+        self.scheduler._wake(self)
+    
+    def finish(self) -> None:
+        """Mark that no more items will follow."""
+        self.extend((), last=True)
+    
+    def cancel(self) -> None:
+        """Drop the items not rendered yet."""
+        self.cancelled = True
+        self.pending.clear()
+
+class RenderScheduler:
+    """
+    Renders items into a Tk container in chunks that fit a per-frame time budget.
+    
+    Creating thousands of widgets in one call blocks Tk until the last one exists,
+    so nothing is laid out or painted in the meantime. The scheduler instead renders
+    as many items as fit in the frame budget, returns to the event loop so Tk can lay
+    out and paint the chunk in one pass and handle input, and continues on the next
+    frame. The first chunk always covers the first screenful, whatever the budget.
+    Starting a new task or cancelling stops the previous one.
+    """
+    
+    FRAME_INTERVAL_MS = 16
+    FRAME_BUDGET_MS = 8
+    
+    def __init__(self, widget, frame_budget_ms: Optional[float] = None):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            widget: Any widget; used to schedule the chunks
+            frame_budget_ms: Rendering time allowed per frame
+        """
+        self.widget = widget
+        self.frame_budget_ms = frame_budget_ms or self.FRAME_BUDGET_MS
+        self.task: Optional[RenderTask] = None
+        self._after_id = None
+    
+    def start(self, render: Callable[[Any], None], first_chunk: int = 0,
+              on_done: Optional[Callable[[], None]] = None) -> RenderTask:
+        """
+        Start a render task, cancelling the current one (Tk thread).
+        
+        Args:
+            render: Renders one item
+            first_chunk: Number of items rendered together as soon as they are available
+                (the first screenful), regardless of the budget
+            on_done: Called after the last item has been rendered
+        
+        Returns:
+            The task to queue items on
+        """
+        self.cancel()
+        self.task = RenderTask(self, render, first_chunk, on_done)
+        return self.task
+    
+    def cancel(self) -> None:
+        """Cancel the current task, e.g. when the list is cleared or the view is left."""
+        if self.task:
+            self.task.cancel()
+            self.task = None
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                # The widget has been destroyed
+                pass
+            self._after_id = None
+    
+    def _wake(self, task: RenderTask) -> None:
+        """Render newly queued items: the first screenful at once, the rest on the next frame."""
+        if task is not self.task or self._after_id is not None:
+            return
+        if task.rendered < task.first_chunk:
+            self._run(task)
+        else:
+            self._after_id = self.widget.after(1, self._tick)
+    
+    def _tick(self) -> None:
+        self._after_id = None
+        if self.task:
+            self._run(self.task)
+    
+    def _run(self, task: RenderTask) -> None:
+        """Render one chunk, then yield to the event loop until the next frame."""
+        started = time.perf_counter()
+        deadline = started + self.frame_budget_ms / 1000.0
+        while task.pending and not task.cancelled:
+            if task.rendered >= task.first_chunk and time.perf_counter() >= deadline:
+                break
+            item = task.pending.popleft()
+            try:
+                task.render(item)
+            except Exception:
+                logger.exception("Error rendering item")
+            task.rendered += 1
+        
+        if task is not self.task or task.cancelled:
+            return
+        if task.pending:
+            used_ms = (time.perf_counter() - started) * 1000
+            self._after_id = self.widget.after(max(1, int(self.FRAME_INTERVAL_MS - used_ms)), self._tick)
+        elif task.complete:
+            self.task = None
+            if task.on_done:
+                task.on_done()
\ No newline at end of file
@@ -0,0 +1,176 @@
+import bisect
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Dict, List, Optional
+import sentry_sdk
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+APP_PACKAGE = 'aurachat_helper_app'
+
+class LagHistogram:
+    """Rolling histogram of event-loop lag over the most recent heartbeats."""
+    
+    BUCKETS_MS = [8, 16, 33, 50, 100, 250, 500, 1000, 2500]
+    
+    def __init__(self, max_samples: int = 6000):
+        self._samples = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+    
+    def add(self, lag_ms: float) -> None:
+        with self._lock:
+            self._samples.append(lag_ms)
+    
+    def counts(self) -> Dict[str, int]:
+        """Number of samples per bucket, labelled by upper bound ('<8ms' ... '>=2500ms')."""
+        with self._lock:
+            samples = list(self._samples)
+        counts = [0] * (len(self.BUCKETS_MS) + 1)
+        for lag_ms in samples:
+            counts[bisect.bisect_right(self.BUCKETS_MS, lag_ms)] += 1
+        labels = [f"<{bound}ms" for bound in self.BUCKETS_MS] + [f">={self.BUCKETS_MS[-1]}ms"]
+        return dict(zip(labels, counts))
+    
+    def percentile(self, pct: float) -> float:
+        """Nearest-rank percentile of the recent lag samples, in milliseconds."""
+        with self._lock:
+            ordered = sorted(self._samples)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))]
+    
+    def summary(self) -> str:
+        buckets = ", ".join(f"{label}: {count}" for label, count in self.counts().items() if count)
+        return f"p50={self.percentile(50):.0f}ms p99={self.percentile(99):.0f}ms max={self.percentile(100):.0f}ms ({buckets})"
+
+class StallWatchdog:
+    """
+    Detects UI freezes by watching a heartbeat scheduled on the Tk event loop.
+    
+    The heartbeat runs every INTERVAL_MS through after(); how late it fires is the
+    event-loop lag, kept in a rolling histogram. A watchdog thread checks the time
+    since the last beat, and once the main thread has been blocked for longer than
+    the threshold it captures the main thread's stack, names the Tk handler that is
+    running, and reports the stall to the log and Sentry, once per stall.
+    """
+    
+    INTERVAL_MS = 100
+    SUMMARY_INTERVAL_S = 300
+    
+    def __init__(self, root, threshold_ms: int = 500):
+        """
+        Initialize the watchdog.
+        
+        Args:
+            root: The Tk root window, whose event loop runs on the main thread
+            threshold_ms: Block time after which a stall is reported
+        """
+        self.root = root
+        self.threshold_ms = threshold_ms
+        self.histogram = LagHistogram()
+        self._main_thread_id = threading.main_thread().ident
+        self._last_beat = time.monotonic()
+        self._stall: Optional[Dict[str, object]] = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._last_summary = time.monotonic()
+    
+    def start(self) -> None:
+        """Start the heartbeat and the watchdog thread; must be called on the Tk thread."""
+        logger.info(f"Stall watchdog started (threshold {self.threshold_ms}ms)")
+        self._last_beat = time.monotonic()
+        self.root.after(self.INTERVAL_MS, self._beat)
+        threading.Thread(target=self._watch, daemon=True, name="stall-watchdog").start()
+    
+    def stop(self) -> None:
+        self._stopped.set()
+    
+    def _beat(self) -> None:
+        """Record the event-loop lag and schedule the next beat (Tk thread)."""
+        if self._stopped.is_set():
+            return
+        now = time.monotonic()
+        with self._lock:
+            lag_ms = max(0.0, (now - self._last_beat) * 1000 - self.INTERVAL_MS)
+            self._last_beat = now
+            stall, self._stall = self._stall, None
+        self.histogram.add(lag_ms)
+        if stall:
+            logger.warning(f"UI stall in {stall['handler']} ended after {lag_ms + self.INTERVAL_MS:.0f}ms")
+        if now - self._last_summary >= self.SUMMARY_INTERVAL_S:
+            self._last_summary = now
+            logger.info(f"Event loop lag: {self.histogram.summary()}")
+        try:
+            self.root.after(self.INTERVAL_MS, self._beat)
+        except Exception:
+            # The window has been destroyed
+            self._stopped.set()
+    
+    def _watch(self) -> None:
+        """Report the main thread's stack when the heartbeat is overdue (watchdog thread)."""
+        poll_s = max(0.01, min(self.threshold_ms, self.INTERVAL_MS) / 2000.0)
+        while not self._stopped.wait(poll_s):
+            with self._lock:
+                blocked_ms = (time.monotonic() - self._last_beat) * 1000 - self.INTERVAL_MS
+                if blocked_ms < self.threshold_ms or self._stall is not None:
+                    continue
+                frame = sys._current_frames().get(self._main_thread_id)
+                if frame is None:
+                    continue
+                stack = traceback.extract_stack(frame)
+                self._stall = {'handler': self.handler_name(frame), 'blocked_ms': blocked_ms}
+                stall = self._stall
+            self.report(stall['handler'], blocked_ms, stack)
+    
+    def handler_name(self, frame) -> str:
+        """
+        Name the app code a Tk callback is running, e.g. 'chats_controller.ChatsController.handle_generate'.
+        
+        Prefers the first controller frame entered from Tk, then the first named app frame.
+        
+        Args:
+            frame: The innermost frame of the main thread
+        """
+        frames = []
+        while frame is not None:
+            frames.append(frame)
+            frame = frame.f_back
+        frames.reverse()
+        
+        start = 0
+        for index, outer in enumerate(frames):
+            if 'tkinter' in outer.f_code.co_filename:
+                start = index + 1
+        app_frames = [outer for outer in frames[start:]
+                      if APP_PACKAGE in outer.f_code.co_filename and outer.f_code.co_name != '<lambda>']
+        if not app_frames:
+            app_frames = [outer for outer in frames if APP_PACKAGE in outer.f_code.co_filename]
+        if not app_frames:
+            return frames[-1].f_code.co_name if frames else 'unknown'
+        chosen = next((outer for outer in app_frames if 'controllers' in outer.f_code.co_filename), app_frames[0])
+        code = chosen.f_code
+        module = code.co_filename.replace('\\', '/').rsplit('/', 1)[-1].rsplit('.', 1)[0]
+        return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+    
+    def report(self, handler: str, blocked_ms: float, stack: List[traceback.FrameSummary]) -> None:
+        """Log a stall with the main thread's stack and send it to Sentry."""
+        formatted = ''.join(traceback.format_list(stack))
+        logger.warning(f"UI thread blocked for {blocked_ms:.0f}ms in {handler}\n{formatted}")
+        try:
+            with sentry_sdk.new_scope() as scope:
+                scope.set_tag('stall_handler', handler)
+                scope.set_context('stall', {
+                    'handler': handler,
+                    'blocked_ms': round(blocked_ms),
+                    'threshold_ms': self.threshold_ms,
+                    'stack': formatted,
+                    'event_loop_lag': self.histogram.summary()
+                })
+                scope.fingerprint = ['ui-stall', handler]
+                sentry_sdk.capture_message(f"UI stall in {handler}", level='warning')
+        except Exception as e:
+            logger.debug(f"Could not report stall to Sentry: {e}")
\ No newline at end of file
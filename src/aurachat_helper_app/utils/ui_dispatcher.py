@@ -0,0 +1,66 @@
+import queue
+from typing import Any, Callable, Dict
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+class UIDispatcher:
+    """
+    Hands callbacks from worker threads to the Tk main loop.
+    
+    Tk widgets must only be touched from the thread running mainloop, so workers
+    queue callbacks here and the dispatcher drains the queue from an after() poll.
+    """
+    
+    POLL_MS = 16
+    MAX_CALLBACKS_PER_POLL = 50
+    
+    def __init__(self, root):
+        """
+        Initialize the dispatcher and start polling.
+        
+        Args:
+            root: The Tk root window whose main loop runs the callbacks
+        """
+        self.root = root
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.root.after(self.POLL_MS, self._poll)
+    
+    def call_soon(self, callback: Callable[..., Any], *args: Any) -> None:
+        """Queue a callback to run on the main loop; safe to call from any thread."""
+        self._queue.put((callback, args))
+    
+    def _poll(self) -> None:
+        """Run queued callbacks, bounded per poll so a burst cannot freeze the window."""
+        for _ in range(self.MAX_CALLBACKS_PER_POLL):
+            try:
+                callback, args = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception:
+                logger.exception(f"Error in UI callback {getattr(callback, '__name__', callback)}")
+        try:
+            self.root.after(self.POLL_MS, self._poll)
+        except Exception:
+            # The window has been destroyed
+            pass
+
+_dispatchers: Dict[str, UIDispatcher] = {}
+
+def get_ui_dispatcher(widget) -> UIDispatcher:
+    """
+    Get the dispatcher for a widget's top-level window, creating it on first use.
+    
+    Args:
+        widget: Any widget; must be called from the main thread
+    
+    Returns:
+        The shared UIDispatcher for the widget's window
+    """
+    root = widget.winfo_toplevel()
+    key = str(root)
+    if key not in _dispatchers:
+        _dispatchers[key] = UIDispatcher(root)
+    return _dispatchers[key]
\ No newline at end of file
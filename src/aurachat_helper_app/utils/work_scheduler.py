@@ -0,0 +1,287 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Work classes, highest priority first
+WORK_INTERACTIVE = 'interactive'  # The operator is waiting on it
+WORK_PREFETCH = 'prefetch'  # Likely needed soon, e.g. the next chats in triage mode
+WORK_BACKGROUND = 'background'  # Account syncs, revalidation and other housekeeping
+WORK_CLASSES = (WORK_INTERACTIVE, WORK_PREFETCH, WORK_BACKGROUND)
+
+@dataclass
+class _Task:
+    work_class: str
+    account_id: Optional[str]
+    fn: Callable
+    args: tuple
+    kwargs: dict
+    key: Optional[Hashable] = None
+    group: Optional[str] = None
+    future: Future = field(default_factory=Future)
+    queued_at: float = field(default_factory=time.monotonic)
+    started: bool = False
+
+class _ClassStats:
+    """Counters and recent wait times of one work class."""
+    
+    MAX_SAMPLES = 1000
+    
+    def __init__(self):
+        self.queued = 0
+        self.max_queued = 0
+        self.running = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.promoted = 0
+        self.wait_ms: Deque[float] = deque(maxlen=self.MAX_SAMPLES)
+    
+    def percentile(self, pct: float) -> float:
+        """Nearest-rank percentile of the recent wait times, in milliseconds."""
+        ordered = sorted(self.wait_ms)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'queued': self.queued,
+            'max_queued': self.max_queued,
+            'running': self.running,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'cancelled': self.cancelled,
+            'promoted': self.promoted,
+            'wait_ms_p50': self.percentile(50),
+            'wait_ms_p95': self.percentile(95),
+            'wait_ms_max': max(self.wait_ms, default=0.0)
+        }
+
+class WorkScheduler:
+    """
+    Runs the app's database and API work in priority order on one bounded worker pool.
+    
+    Queued work always starts highest class first, so prefetch and background work
+    never runs ahead of something the operator is waiting on, and RESERVED_INTERACTIVE
+    workers are kept free of it. Each class has a concurrency cap, and within a class
+    accounts take turns, so one account's thousand-chat sync does not hold up another's.
+    Work submitted with a key is deduplicated, and resubmitting it at a higher class
+    promotes the queued task. The Tk thread submits its loads as interactive work
+    and gets the results back through the UI dispatcher, so it never blocks on them.
+    """
+    
+    MAX_WORKERS = 6
+    RESERVED_INTERACTIVE = 2
+    CLASS_CAPS = {WORK_INTERACTIVE: 6, WORK_PREFETCH: 2, WORK_BACKGROUND: 3}
+    SUMMARY_INTERVAL_S = 300
+    
+    def __init__(self, max_workers: Optional[int] = None, caps: Optional[Dict[str, int]] = None):
+        """
+        Initialize the scheduler; worker threads start on the first submit.
+        
+        Args:
+            max_workers: Number of worker threads
+            caps: Concurrency cap per work class, overriding CLASS_CAPS
+        """
+        self.max_workers = max_workers or self.MAX_WORKERS
+        self.caps = dict(self.CLASS_CAPS, **(caps or {}))
+        self._queues: Dict[str, 'OrderedDict[Optional[str], Deque[_Task]]'] = {
+            work_class: OrderedDict() for work_class in WORK_CLASSES}
+        self._keyed: Dict[Hashable, _Task] = {}
+        self._stats = {work_class: _ClassStats() for work_class in WORK_CLASSES}
+        self._condition = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._stopped = False
+        self._last_summary = time.monotonic()
+    
+    def submit(self, work_class: str, fn: Callable, *args, account_id: Optional[str] = None,
+               key: Optional[Hashable] = None, group: Optional[str] = None, **kwargs) -> Future:
+        """
+        Queue work for the worker pool.
+        
+        Args:
+            work_class: WORK_INTERACTIVE, WORK_PREFETCH or WORK_BACKGROUND
+            fn: The work; called with args and kwargs on a worker thread
+            account_id: The OnlyFans account the work is for; accounts take turns
+            key: Identifies the work; while a task with the same key is queued or running
+                its future is returned instead, and a queued one is promoted if this
+                class is higher
+            group: Label for cancelling related work together, e.g. a service's name
+        
+        Returns:
+            Future of the work's result; cancelling it before it starts drops the work
+        """
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("Work scheduler has been shut down")
+            task = self._keyed.get(key) if key is not None else None
+            if task is not None:
+                if not task.started and WORK_CLASSES.index(work_class) < WORK_CLASSES.index(task.work_class):
+                    self._remove_queued(task)
+                    self._stats[task.work_class].promoted += 1
+                    self._stats[task.work_class].submitted -= 1
+                    self._stats[work_class].submitted += 1
+                    task.work_class = work_class
+                    self._enqueue(task)
+                return task.future
+            task = _Task(work_class, account_id, fn, args, kwargs, key, group)
+            if key is not None:
+                self._keyed[key] = task
+            self._stats[work_class].submitted += 1
+            self._enqueue(task)
+            if not self._threads:
+                self._start_workers()
+        return task.future
+    
+    def cancel(self, key: Optional[Hashable] = None, group: Optional[str] = None,
+               account_id: Optional[str] = None) -> int:
+        """
+        Drop queued work matching all the given criteria; running work is not interrupted.
+        
+        Returns:
+            Number of tasks cancelled
+        """
+        with self._condition:
+            matches = [task for accounts in self._queues.values() for tasks in accounts.values() for task in tasks
+                       if (key is None or task.key == key) and (group is None or task.group == group)
+                       and (account_id is None or task.account_id == account_id)]
+            for task in matches:
+                self._remove_queued(task)
+                self._forget(task)
+                self._stats[task.work_class].cancelled += 1
+                task.future.cancel()
+        return len(matches)
+    
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth, running count, outcome counters and wait-time percentiles per work class."""
+        with self._condition:
+            return {work_class: stats.to_dict() for work_class, stats in self._stats.items()}
+    
+    def summary(self) -> str:
+        parts = []
+        for work_class, metrics in self.metrics().items():
+            parts.append(f"{work_class}: {metrics['completed']} done, {metrics['queued']} queued "
+                         f"(max {metrics['max_queued']}), wait p50={metrics['wait_ms_p50']:.0f}ms "
+                         f"p95={metrics['wait_ms_p95']:.0f}ms")
+        return "; ".join(parts)
+    
+    def shutdown(self) -> None:
+        """Cancel queued work and stop the workers once their current task is done, e.g. on sign-out."""
+        with self._condition:
+            if self._stopped:
+                return
+            self._stopped = True
+            self._condition.notify_all()
+        self.cancel()
+        logger.info(f"Work scheduler stopped: {self.summary()}")
+    
+    def _start_workers(self) -> None:
+        """Start the worker threads; the caller holds the lock."""
+        for index in range(self.max_workers):
+            thread = threading.Thread(target=self._work, daemon=True, name=f"work-{index}")
+            self._threads.append(thread)
+            thread.start()
+    
+    def _enqueue(self, task: _Task) -> None:
+        """Add a task to its class and account queue; the caller holds the lock."""
+        self._queues[task.work_class].setdefault(task.account_id, deque()).append(task)
+        stats = self._stats[task.work_class]
+        stats.queued += 1
+        stats.max_queued = max(stats.max_queued, stats.queued)
+        self._condition.notify()
+    
+    def _remove_queued(self, task: _Task) -> None:
+        """Take a queued task out of its queue; the caller holds the lock."""
+        accounts = self._queues[task.work_class]
+        tasks = accounts[task.account_id]
+        tasks.remove(task)
+        if not tasks:
+            del accounts[task.account_id]
+        self._stats[task.work_class].queued -= 1
+    
+    def _forget(self, task: _Task) -> None:
+        """Drop a finished or cancelled task from the key index; the caller holds the lock."""
+        if task.key is not None and self._keyed.get(task.key) is task:
+            del self._keyed[task.key]
+    
+    def _next_task(self) -> Optional[_Task]:
+        """The next task allowed to start, taken off its queue; the caller holds the lock."""
+        running = sum(stats.running for stats in self._stats.values())
+        for work_class in WORK_CLASSES:
+            accounts = self._queues[work_class]
+            stats = self._stats[work_class]
+            if not accounts or stats.running >= self.caps[work_class]:
+                continue
+            if work_class != WORK_INTERACTIVE and running >= self.max_workers - self.RESERVED_INTERACTIVE:
+                # Everything below interactive waits; the rest of the pool is kept for the operator
+                return None
+            # Accounts take turns within a class
+            account_id, tasks = next(iter(accounts.items()))
+            task = tasks.popleft()
+            if tasks:
+                accounts.move_to_end(account_id)
+            else:
+                del accounts[account_id]
+            task.started = True
+            stats.queued -= 1
+            stats.running += 1
+            stats.wait_ms.append((time.monotonic() - task.queued_at) * 1000)
+            return task
+        return None
+    
+    def _work(self) -> None:
+        """Worker loop: run the highest-priority task allowed to start."""
+        while True:
+            with self._condition:
+                task = self._next_task()
+                while task is None and not self._stopped:
+                    self._condition.wait()
+                    task = self._next_task()
+                if task is None:
+                    return
+            if not task.future.set_running_or_notify_cancel():
+                # Cancelled through its future while queued
+                with self._condition:
+                    self._forget(task)
+                    self._stats[task.work_class].cancelled += 1
+                    self._stats[task.work_class].running -= 1
+                    self._condition.notify_all()
+                continue
+            failed = False
+            try:
+                result = task.fn(*task.args, **task.kwargs)
+            except BaseException as e:
+                failed, result = True, e
+            # Resubmitting the key from here on queues the work again
+            with self._condition:
+                self._forget(task)
+            if failed:
+                task.future.set_exception(result)
+            else:
+                task.future.set_result(result)
+            self._finish(task.work_class, failed)
+    
+    def _finish(self, work_class: str, failed: bool) -> None:
+        """Record a finished task and let waiting work start."""
+        with self._condition:
+            stats = self._stats[work_class]
+            stats.running -= 1
+            if failed:
+                stats.failed += 1
+            else:
+                stats.completed += 1
+            self._condition.notify_all()
+            now = time.monotonic()
+            log_summary = now - self._last_summary >= self.SUMMARY_INTERVAL_S
+            if log_summary:
+                self._last_summary = now
+        if log_summary:
+            logger.info(f"Work scheduler: {self.summary()}")
\ No newline at end of file
@@ -6,6 +6,20 @@ from .components.selected_chat_cell_view import SelectedChatCellView
 class ChatsView:
     """View class for displaying and managing chats."""
     
+    # (label, sort key, descending) and (label, filter) choices for the chat list
+    SORT_OPTIONS = [
+        ("Most recent", 'last_message_time', True),
+        ("Most unread", 'unread_count', True),
+        ("Unread tips first", 'has_unread_tips', True),
+        ("Name", 'display_name', False),
+    ]
+    FILTER_OPTIONS = [
+        ("All chats", None),
+        ("Unread only", 'unread'),
+        ("Has unread tips", 'unread_tips'),
+        ("Can message", 'can_send'),
+    ]
+    
     def __init__(self, parent):
         """Initialize the chats view."""
         self.frame = tk.Frame(parent, bg='#2b2b2b')
@@ -34,24 +48,232 @@ class ChatsView:
                 bg='#2b2b2b',
                 fg='white').pack(side=tk.LEFT, padx=5)
         
+        # Triage mode: walk the chats that need a reply with Alt+Down / Alt+Up
+        self.triage_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(header_frame,
+                      text="Triage",
+                      variable=self.triage_var,
+                      command=self._on_triage_toggle,
+                      bg='#2b2b2b',
+                      fg='#a0a0a0',
+                      selectcolor='#3b3b3b',
+                      activebackground='#2b2b2b',
+                      highlightthickness=0,
+                      font=('Helvetica', 9)).pack(side=tk.LEFT, padx=(15, 5))
+        self.triage_controls = []
+        for text, step in (("▲ Prev", -1), ("Next ▼", 1)):
+            step_frame = tk.Frame(header_frame, bg='#808080')
+            step_label = tk.Label(step_frame,
+                                text=text,
+                                bg='#808080',
+                                fg='white',
+                                font=('Helvetica', 9),
+                                padx=8,
+                                pady=3)
+            step_label.pack()
+            step_frame.bind('<Button-1>', lambda e, step=step: self._on_triage_step(step))
+            step_label.bind('<Button-1>', lambda e, step=step: self._on_triage_step(step))
+            self.triage_controls.append(step_frame)
+        self.triage_status = tk.Label(header_frame,
+                                    text="",
+                                    bg='#2b2b2b',
+                                    fg='#a0a0a0',
+                                    font=('Helvetica', 9))
+        self.triage_controls.append(self.triage_status)
+        self._shortcuts = []
+        self._bind_shortcut('<Alt-Down>', lambda e: self._on_triage_step(1))
+        self._bind_shortcut('<Alt-Up>', lambda e: self._on_triage_step(-1))
+        
+        # Search field: Return searches, Escape clears back to the full list
+        self.search_var = tk.StringVar()
+        self.search_entry = tk.Entry(header_frame,
+                                   textvariable=self.search_var,
+                                   bg='#3b3b3b',
+                                   fg='white',
+                                   insertbackground='white',
+                                   font=('Helvetica', 10))
+        self.search_entry.pack(side=tk.RIGHT, padx=10)
+        self.search_entry.bind('<Return>', lambda e: self._on_search())
+        self.search_entry.bind('<Escape>', lambda e: self._on_clear_search())
+        tk.Label(header_frame,
+                text="Search",
+                bg='#2b2b2b',
+                fg='#a0a0a0',
+                font=('Helvetica', 9)).pack(side=tk.RIGHT)
+        
+        # Sort and filter controls for the chat list
+        toolbar_frame = tk.Frame(self.frame, bg='#2b2b2b')
+        toolbar_frame.pack(fill=tk.X, padx=10)
+        
+        self.sort_var = tk.StringVar(value=self.SORT_OPTIONS[0][0])
+        self.filter_var = tk.StringVar(value=self.FILTER_OPTIONS[0][0])
+        for label_text, variable, options in (("Sort", self.sort_var, self.SORT_OPTIONS),
+                                              ("Show", self.filter_var, self.FILTER_OPTIONS)):
+            tk.Label(toolbar_frame,
+                    text=label_text,
+                    bg='#2b2b2b',
+                    fg='#a0a0a0',
+                    font=('Helvetica', 9)).pack(side=tk.LEFT, padx=(0, 5))
+            menu = tk.OptionMenu(toolbar_frame, variable, *[option[0] for option in options],
+                                 command=lambda _: self._on_sort_filter_change())
+            menu.config(bg='#3b3b3b', fg='white', highlightthickness=0, font=('Helvetica', 9))
+            menu.pack(side=tk.LEFT, padx=(0, 15))
+        
+        # Account sync: the action turns into a cancel while a sync runs
+        self.account_sync_running = False
+        self.account_sync_frame = tk.Frame(toolbar_frame, bg='#808080')
+        self.account_sync_frame.pack(side=tk.RIGHT)
+        self.account_sync_label = tk.Label(self.account_sync_frame,
+                                         text="Sync account",
+                                         bg='#808080',
+                                         fg='white',
+                                         font=('Helvetica', 9),
+                                         padx=8,
+                                         pady=3)
+        self.account_sync_label.pack()
+        self.account_sync_frame.bind('<Button-1>', lambda e: self._on_account_sync_click())
+        self.account_sync_label.bind('<Button-1>', lambda e: self._on_account_sync_click())
+        self.stale_only_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(toolbar_frame,
+                      text="Stale only",
+                      variable=self.stale_only_var,
+                      bg='#2b2b2b',
+                      fg='#a0a0a0',
+                      selectcolor='#3b3b3b',
+                      activebackground='#2b2b2b',
+                      highlightthickness=0,
+                      font=('Helvetica', 9)).pack(side=tk.RIGHT, padx=5)
+        self.account_sync_status = tk.Label(toolbar_frame,
+                                           text="",
+                                           bg='#2b2b2b',
+                                           fg='#a0a0a0',
+                                           font=('Helvetica', 9))
+        self.account_sync_status.pack(side=tk.RIGHT, padx=5)
+        self.account_sync_progress = ttk.Progressbar(toolbar_frame, length=120, mode='determinate')
+        
         # Selected chat area
         self.selected_chat_frame = tk.Frame(self.frame, bg='#2b2b2b')
         self.selected_chat_frame.pack(fill=tk.X, pady=(0, 10))
         
-        # Chats list
+        # Chats list; its size comes from the window, so cells added in bulk do not
+        # propagate size requests up through the view on every chunk
         self.chats_frame = tk.Frame(self.frame, bg='#2b2b2b')
+        self.chats_frame.pack_propagate(False)
         self.chats_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.chat_cells = {}  # Displayed cells by chat ID, for status updates
         
     def _on_back_click(self):
         """Handle back click."""
         if hasattr(self, 'back_command'):
             self.back_command()
         
+    def _on_search(self):
+        """Handle search submit."""
+        if hasattr(self, 'search_command'):
+            self.search_command(self.search_var.get())
+            
+    def _on_clear_search(self):
+        """Clear the search field and show all chats again."""
+        self.search_var.set('')
+        self._on_search()
+        
+    def _on_sort_filter_change(self):
+        """Handle a change of the sort or filter selection."""
+        if hasattr(self, 'sort_filter_command'):
+            self.sort_filter_command(*self.get_sort_filter())
+            
+    def get_sort_filter(self):
+        """
+        Get the selected ordering of the chat list.
+        
+        Returns:
+            Tuple of (sort key, descending, filter name)
+        """
+        _, sort_key, descending = next(option for option in self.SORT_OPTIONS if option[0] == self.sort_var.get())
+        filter_name = next(option[1] for option in self.FILTER_OPTIONS if option[0] == self.filter_var.get())
+        return sort_key, descending, filter_name
+        
+    def _bind_shortcut(self, sequence: str, handler):
+        """Bind a key on the whole window, in addition to any other view's bindings."""
+        toplevel = self.frame.winfo_toplevel()
+        self._shortcuts.append((sequence, toplevel.bind(sequence, handler, add='+')))
+        
+    def _unbind_shortcuts(self):
+        """Remove this view's window key bindings, leaving other views' in place."""
+        toplevel = self.frame.winfo_toplevel()
+        for sequence, funcid in self._shortcuts:
+            # Misc.unbind(sequence, funcid) drops every binding of the sequence on older Pythons
+            script = '\n'.join(line for line in toplevel.bind(sequence).split('\n') if funcid not in line)
+            toplevel.tk.call('bind', toplevel._w, sequence, script)
+            toplevel.deletecommand(funcid)
+        self._shortcuts = []
+        
+    def _on_triage_toggle(self):
+        """Show or hide the triage controls and tell the controller."""
+        enabled = self.triage_var.get()
+        for widget in self.triage_controls:
+            if enabled:
+                widget.pack(side=tk.LEFT, padx=(0, 5))
+            else:
+                widget.pack_forget()
+        if hasattr(self, 'triage_command'):
+            self.triage_command(enabled)
+            
+    def _on_triage_step(self, step: int):
+        """Move to the next (1) or previous (-1) chat in triage mode."""
+        # Other accounts' views bind the same keys but are not on screen
+        if not self.triage_var.get() or not self.frame.winfo_ismapped():
+            return
+        if hasattr(self, 'triage_step_command'):
+            self.triage_step_command(step)
+        return 'break'
+        
+    def set_triage_status(self, text: str):
+        """Show the triage queue position."""
+        self.triage_status.config(text=text)
+        
+    def _on_account_sync_click(self):
+        """Start an account sync, or cancel the running one."""
+        if self.account_sync_running:
+            if hasattr(self, 'account_sync_cancel_command'):
+                self.account_sync_cancel_command()
+        elif hasattr(self, 'account_sync_command'):
+            self.account_sync_command(self.stale_only_var.get())
+            
+    def show_account_sync_progress(self, done: int, total: int, failed: int = 0):
+        """Show a running account sync's progress."""
+        if not self.account_sync_running:
+            self.account_sync_running = True
+            self.account_sync_label.config(text="Cancel sync")
+            self.account_sync_progress.pack(side=tk.RIGHT, padx=5, before=self.account_sync_status)
+        self.account_sync_progress.config(maximum=max(total, 1), value=done)
+        status = f"Synced {done}/{total}"
+        if failed:
+            status += f", {failed} failed"
+        self.account_sync_status.config(text=status)
+        
+    def finish_account_sync(self, message: str):
+        """Return the account sync controls to idle with a summary message."""
+        self.account_sync_running = False
+        self.account_sync_label.config(text="Sync account")
+        self.account_sync_progress.pack_forget()
+        self.account_sync_status.config(text=message)
+        
     def on_generate(self):
         """Handle generate button click."""
         if hasattr(self, 'generate_command'):
             self.generate_command()
         
+    def on_regenerate(self):
+        """Handle regenerate button click."""
+        if hasattr(self, 'regenerate_command'):
+            self.regenerate_command()
+        
+    def on_draft_history(self):
+        """Handle draft history click."""
+        if hasattr(self, 'draft_history_command'):
+            self.draft_history_command()
+        
     def on_sync(self):
         """Handle sync button click."""
         if hasattr(self, 'sync_command'):
@@ -61,6 +283,13 @@ class ChatsView:
         """Pack the view into its parent."""
         self.frame.pack(**kwargs)
         
+    def destroy(self):
+        """Destroy the view and all its widgets."""
+        self.selected_chat_cell = None
+        self.chat_cells = {}
+        self._unbind_shortcuts()
+        self.frame.destroy()
+        
     def set_selected_chat(self, chat_info: dict):
         """Set the selected chat information."""
         # Clear any existing selected chat
@@ -70,17 +299,41 @@ class ChatsView:
         # Create and show the new selected chat cell
         self.selected_chat_cell = SelectedChatCellView(self.selected_chat_frame, chat_info)
         self.selected_chat_cell.set_generate_command(self.on_generate)
+        self.selected_chat_cell.set_regenerate_command(self.on_regenerate)
+        self.selected_chat_cell.set_draft_history_command(self.on_draft_history)
         self.selected_chat_cell.set_sync_command(self.on_sync)
+        if hasattr(self, 'avatar_loader'):
+            self.selected_chat_cell.set_avatar_loader(self.avatar_loader)
         self.selected_chat_cell.pack()
         
     def add_chat(self, chat_info, click_command):
         """Add a chat to the display."""
         cell = ChatCellView(self.chats_frame, chat_info)
         cell.set_click_command(click_command)
+        if chat_info.get('chat_id'):
+            self.chat_cells[chat_info['chat_id']] = cell
+        if hasattr(self, 'avatar_loader'):
+            cell.set_avatar_loader(self.avatar_loader)
         cell.pack(pady=2)
         
+    def visible_rows(self) -> int:
+        """Number of chat cells that fit in the list, estimated from the window before it is mapped."""
+        height = self.chats_frame.winfo_height()
+        if height <= 1:
+            height = self.frame.winfo_toplevel().winfo_height()
+        if height <= 1:
+            height = self.frame.winfo_screenheight()
+        return height // ChatCellView.ROW_HEIGHT + 1
+        
+    def set_chat_status(self, chat_id: str, text: str):
+        """Show a queued request's status in a chat's cell, if it is displayed."""
+        cell = self.chat_cells.get(chat_id)
+        if cell and cell.frame.winfo_exists():
+            cell.set_status(text)
+            
     def clear_chats(self):
         """Clear all displayed chats."""
+        self.chat_cells = {}
         for widget in self.chats_frame.winfo_children():
             widget.destroy()
             
@@ -88,15 +341,61 @@ class ChatsView:
         """Set the command for the back action."""
         self.back_command = command
         
+    def set_search_command(self, command):
+        """Set the command for the search action; it receives the query text."""
+        self.search_command = command
+        
+    def set_sort_filter_command(self, command):
+        """Set the command for sort/filter changes; it receives (sort key, descending, filter name)."""
+        self.sort_filter_command = command
+        
+    def set_avatar_loader(self, loader):
+        """Set the loader cells use for avatars; it receives (url, size, callback)."""
+        self.avatar_loader = loader
+        
     def set_generate_command(self, command):
         """Set the command for the generate action."""
         self.generate_command = command
         
+    def set_regenerate_command(self, command):
+        """Set the command for the regenerate action."""
+        self.regenerate_command = command
+        
+    def set_draft_history_command(self, command):
+        """Set the command for stepping back through the selected chat's drafts."""
+        self.draft_history_command = command
+        
     def set_sync_command(self, command):
         """Set the command for the sync action."""
         self.sync_command = command
         
+    def set_triage_command(self, command):
+        """Set the command for turning triage mode on or off; it receives whether it is on."""
+        self.triage_command = command
+        
+    def set_triage_step_command(self, command):
+        """Set the command for stepping through the triage queue; it receives 1 or -1."""
+        self.triage_step_command = command
+        
+    def set_account_sync_command(self, command):
+        """Set the command for the account sync action; it receives whether to sync stale chats only."""
+        self.account_sync_command = command
+        
+    def set_account_sync_cancel_command(self, command):
+        """Set the command for cancelling a running account sync."""
+        self.account_sync_cancel_command = command
+        
+    def set_selected_media(self, media_info, loader, open_command):
+        """Show media thumbnails in the selected chat cell; see SelectedChatCellView.set_media."""
+        if self.selected_chat_cell:
+            self.selected_chat_cell.set_media(media_info, loader, open_command)
+            
     def set_response_text(self, text: str):
         """Set the response text in the selected chat cell."""
         if self.selected_chat_cell:
-            self.selected_chat_cell.set_response_text(text) 
\ No newline at end of file
+            self.selected_chat_cell.set_response_text(text)
+            
+    def set_draft_position(self, index: int, count: int):
+        """Show which of the selected chat's drafts is displayed."""
+        if self.selected_chat_cell:
+            self.selected_chat_cell.set_draft_position(index, count) 
\ No newline at end of file
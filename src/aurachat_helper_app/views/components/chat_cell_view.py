@@ -4,10 +4,26 @@ from tkinter import ttk
 class ChatCellView:
     """Component view for displaying a single chat cell."""
     
+    AVATAR_SIZE = 32
+    ROW_HEIGHT = 40  # Approximate height of a packed cell, used to size the first screenful
+    
     def __init__(self, parent, chat_info):
         """Initialize the chat cell view."""
         self.frame = tk.Frame(parent, bg='#2b2b2b')
         self.chat_info = chat_info
+        self.avatar_image = None
+        self._avatar_requested = False
+        
+        # Avatar: the fan's initial until the image has loaded
+        avatar_frame = tk.Frame(self.frame, width=self.AVATAR_SIZE, height=self.AVATAR_SIZE, bg='#4b4b4b')
+        avatar_frame.pack_propagate(False)
+        avatar_frame.pack(side=tk.LEFT, padx=(5, 0))
+        self.avatar_label = tk.Label(avatar_frame,
+                                   text=(chat_info['display_name'][:1] or '?').upper(),
+                                   bg='#4b4b4b',
+                                   fg='white',
+                                   font=('Helvetica', 10, 'bold'))
+        self.avatar_label.pack(expand=True, fill=tk.BOTH)
         
         # Left container for fan name and last message
         left_container = tk.Frame(self.frame, bg='#2b2b2b')
@@ -41,6 +57,14 @@ class ChatCellView:
                                               font=('Helvetica', 9))
         self.last_message_time_label.pack(side=tk.RIGHT, padx=(10, 0))
         
+        # Queued portal request (sync/generate), if any
+        self.status_label = tk.Label(message_container,
+                                   text=chat_info.get('status', ''),
+                                   bg='#2b2b2b',
+                                   fg='#FFA500',
+                                   font=('Helvetica', 8))
+        self.status_label.pack(side=tk.RIGHT, padx=(10, 0))
+        
         # Unread count if any
         if chat_info.get('unread_count', 0) > 0:
             unread_frame = tk.Frame(self.frame, bg='#4CAF50')
@@ -56,6 +80,7 @@ class ChatCellView:
         
         # Make all elements clickable
         self.frame.bind('<Button-1>', self._on_click)
+        self.avatar_label.bind('<Button-1>', self._on_click)
         self.fan_name_label.bind('<Button-1>', self._on_click)
         self.last_message_label.bind('<Button-1>', self._on_click)
         self.last_message_time_label.bind('<Button-1>', self._on_click)
@@ -65,6 +90,29 @@ class ChatCellView:
         if hasattr(self, 'click_command'):
             self.click_command()
             
+    def _on_map(self, event):
+        """Request the avatar the first time the cell is actually shown."""
+        url = self.chat_info.get('avatar_url')
+        if url and not self._avatar_requested and hasattr(self, 'avatar_loader'):
+            self._avatar_requested = True
+            self.avatar_loader(url, self.AVATAR_SIZE, self.set_avatar)
+            
+    def set_avatar_loader(self, loader):
+        """Set the avatar loader; it receives (url, size, callback) once the cell is mapped."""
+        self.avatar_loader = loader
+        self.frame.bind('<Map>', self._on_map, add='+')
+        
+    def set_avatar(self, image):
+        """Show a loaded avatar image."""
+        if not self.frame.winfo_exists():
+            return
+        self.avatar_image = image  # Keep a reference so Tk does not drop the image
+        self.avatar_label.config(image=image, text='')
+        
+    def set_status(self, text: str):
+        """Show the status of the chat's queued portal request; empty hides it."""
+        self.status_label.config(text=text)
+        
     def set_click_command(self, command):
         """Set the command to execute when clicked."""
         self.click_command = command
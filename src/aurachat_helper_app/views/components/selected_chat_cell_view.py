@@ -4,16 +4,34 @@ from tkinter import ttk
 class SelectedChatCellView:
     """Component view for displaying the selected chat cell."""
     
+    AVATAR_SIZE = 48
+    MEDIA_THUMB_SIZE = 72
+    MAX_MEDIA_SHOWN = 6
+    
     def __init__(self, parent, chat_info):
         """Initialize the selected chat cell view."""
         self.frame = tk.Frame(parent, bg='#2b2b2b')
         self.chat_info = chat_info
         self.parent = parent  # Store parent for clipboard access
+        self.avatar_image = None
+        self.media_labels = []
+        self.media_images = {}
         
         # Main container with padding
         container = tk.Frame(self.frame, bg='#2b2b2b')
         container.pack(fill=tk.X, padx=10, pady=10)
         
+        # Avatar: the fan's initial until the image has loaded
+        avatar_frame = tk.Frame(container, width=self.AVATAR_SIZE, height=self.AVATAR_SIZE, bg='#4b4b4b')
+        avatar_frame.pack_propagate(False)
+        avatar_frame.pack(side=tk.LEFT, padx=5)
+        self.avatar_label = tk.Label(avatar_frame,
+                                   text=(chat_info['display_name'][:1] or '?').upper(),
+                                   bg='#4b4b4b',
+                                   fg='white',
+                                   font=('Helvetica', 14, 'bold'))
+        self.avatar_label.pack(expand=True, fill=tk.BOTH)
+        
         # Username with larger font
         tk.Label(container, 
                 text=chat_info['display_name'], 
@@ -73,6 +91,20 @@ class SelectedChatCellView:
         self.generate_frame.bind('<Button-1>', lambda e: self._on_generate_click())
         self.generate_label.bind('<Button-1>', lambda e: self._on_generate_click())
         
+        # Regenerate action (orange): ask for a new draft even if one is cached
+        self.regenerate_frame = tk.Frame(action_frame, bg='#FF9800')
+        self.regenerate_frame.pack(side=tk.LEFT, padx=5)
+        self.regenerate_label = tk.Label(self.regenerate_frame,
+                                       text="Regenerate",
+                                       bg='#FF9800',
+                                       fg='white',
+                                       font=('Helvetica', 10),
+                                       padx=10,
+                                       pady=5)
+        self.regenerate_label.pack()
+        self.regenerate_frame.bind('<Button-1>', lambda e: self._on_regenerate_click())
+        self.regenerate_label.bind('<Button-1>', lambda e: self._on_regenerate_click())
+        
         # Issue action (red)
         # self.issue_frame = tk.Frame(action_frame, bg='#F44336')
         # self.issue_frame.pack(side=tk.LEFT, padx=5)
@@ -101,6 +133,16 @@ class SelectedChatCellView:
         self.copy_frame.bind('<Button-1>', lambda e: self._on_copy_click())
         self.copy_label.bind('<Button-1>', lambda e: self._on_copy_click())
         
+        # Position in the chat's draft history; clicking shows the previous draft
+        self.draft_history_label = tk.Label(action_frame,
+                                          text='',
+                                          bg='#2b2b2b',
+                                          fg='#a0a0a0',
+                                          font=('Helvetica', 9),
+                                          cursor='hand2')
+        self.draft_history_label.pack(side=tk.RIGHT, padx=5)
+        self.draft_history_label.bind('<Button-1>', lambda e: self._on_draft_history_click())
+        
     def _on_sync_click(self):
         """Handle sync click."""
         if hasattr(self, 'sync_command'):
@@ -111,6 +153,16 @@ class SelectedChatCellView:
         if hasattr(self, 'generate_command'):
             self.generate_command()
             
+    def _on_regenerate_click(self):
+        """Handle regenerate click."""
+        if hasattr(self, 'regenerate_command'):
+            self.regenerate_command()
+            
+    def _on_draft_history_click(self):
+        """Handle draft history click."""
+        if hasattr(self, 'draft_history_command'):
+            self.draft_history_command()
+            
     # def _on_issue_click(self):
     #     """Handle issue click."""
     #     if hasattr(self, 'issue_command'):
@@ -131,6 +183,66 @@ class SelectedChatCellView:
         if hasattr(self, 'copy_command'):
             self.copy_command()
         
+    def set_avatar_loader(self, loader):
+        """Set the avatar loader and request this chat's avatar; the loader receives (url, size, callback)."""
+        url = self.chat_info.get('avatar_url')
+        if url:
+            loader(url, self.AVATAR_SIZE, self.set_avatar)
+            
+    def set_avatar(self, image):
+        """Show a loaded avatar image."""
+        if not self.frame.winfo_exists():
+            return
+        self.avatar_image = image  # Keep a reference so Tk does not drop the image
+        self.avatar_label.config(image=image, text='')
+        
+    def set_media(self, media_info, loader, open_command):
+        """
+        Show the message's media: labels right away, thumbnails once the strip is displayed.
+        
+        Args:
+            media_info: List of dicts with a 'label' describing each item (e.g. "Video 0:42")
+            loader: Called with (index, size, callback) to load an item's thumbnail
+            open_command: Called with the index of a clicked item
+        """
+        strip = tk.Frame(self.frame, bg='#2b2b2b')
+        strip.pack(fill=tk.X, padx=10, pady=(0, 10), before=self.response_text)
+        size = self.MEDIA_THUMB_SIZE
+        for index, info in enumerate(media_info[:self.MAX_MEDIA_SHOWN]):
+            tile = tk.Frame(strip, width=size, height=size, bg='#4b4b4b')
+            tile.pack_propagate(False)
+            tile.pack(side=tk.LEFT, padx=(0, 5))
+            label = tk.Label(tile,
+                           text=info['label'],
+                           bg='#4b4b4b',
+                           fg='white',
+                           font=('Helvetica', 8),
+                           wraplength=size - 4)
+            label.pack(expand=True, fill=tk.BOTH)
+            label.bind('<Button-1>', lambda e, index=index: open_command(index))
+            self.media_labels.append(label)
+            
+        hidden = len(media_info) - self.MAX_MEDIA_SHOWN
+        if hidden > 0:
+            tk.Label(strip,
+                    text=f"+{hidden}",
+                    bg='#2b2b2b',
+                    fg='#a0a0a0',
+                    font=('Helvetica', 10)).pack(side=tk.LEFT, padx=5)
+            
+        def load_thumbnails(event):
+            strip.unbind('<Map>')
+            for index in range(len(self.media_labels)):
+                loader(index, size, lambda image, index=index: self._set_media_thumbnail(index, image))
+        strip.bind('<Map>', load_thumbnails)
+        
+    def _set_media_thumbnail(self, index, image):
+        """Show a loaded media thumbnail."""
+        if not self.frame.winfo_exists():
+            return
+        self.media_images[index] = image  # Keep a reference so Tk does not drop the image
+        self.media_labels[index].config(image=image, text='')
+        
     def pack(self, **kwargs):
         """Pack the cell into its parent."""
         self.frame.pack(fill=tk.X, **kwargs)
@@ -146,6 +258,18 @@ class SelectedChatCellView:
         """Set the command for the generate action."""
         self.generate_command = command
         
+    def set_regenerate_command(self, command):
+        """Set the command for the regenerate action."""
+        self.regenerate_command = command
+        
+    def set_draft_history_command(self, command):
+        """Set the command for stepping back through the draft history."""
+        self.draft_history_command = command
+        
+    def set_draft_position(self, index: int, count: int):
+        """Show which of the chat's drafts is displayed; hidden when there is at most one."""
+        self.draft_history_label.config(text=f"Draft {index + 1}/{count}" if count > 1 else '')
+        
     # def set_issue_command(self, command):
     #     """Set the command for the issue action."""
     #     self.issue_command = command
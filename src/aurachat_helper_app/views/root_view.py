@@ -22,10 +22,31 @@ class RootView:
         self.file_menu = tk.Menu(self.menu_bar, tearoff=0)
         self.menu_bar.add_cascade(label="File", menu=self.file_menu)
         
+        # Status bar, packed first so screens fill the space above it
+        self.status_bar = tk.Frame(self.root, bg='#232323')
+        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.db_status_label = tk.Label(self.status_bar,
+                                      text="Database: connecting…",
+                                      bg='#232323',
+                                      fg='#a0a0a0',
+                                      font=('Helvetica', 9))
+        self.db_status_label.pack(side=tk.RIGHT, padx=10)
+        
     def start(self):
         """Start the main event loop."""
         self.root.mainloop()
         
+    def clear_content(self):
+        """Destroy the current screen, keeping the menu and status bar."""
+        for widget in self.root.winfo_children():
+            if isinstance(widget, tk.Menu) or widget is self.status_bar:
+                continue
+            widget.destroy()
+            
+    def set_db_status(self, text: str, color: str = '#a0a0a0'):
+        """Show the database connection status in the status bar."""
+        self.db_status_label.config(text=text, fg=color)
+        
     def set_signout_command(self, command):
         """Set the command for the sign-out menu item."""
         self.file_menu.add_command(label="Sign Out", command=command) 
\ No newline at end of file